@@ -0,0 +1,256 @@
+"""
+Animações por tiras de quadros ("frame strips"), pré-escaladas no load.
+
+Uma animação é uma tupla de Surfaces já no tamanho final + quadros por
+segundo; o Animator só escolhe o índice a partir do tempo acumulado, então
+desenhar um quadro não escala nem aloca nada. O tempo vem de update(dt),
+chamado pelo sprite no passo da simulação — a mesma rodada (ou replay)
+mostra os mesmos quadros.
+
+Tiras desenhadas à mão ficam em assets/sprites/anim/<imagem>.<animação>.png
+(quadros lado a lado, cada um quadrado na altura da tira), por exemplo
+alegria.run.png ou obstaculo.bola.spin.png. Sem tira, os quadros são
+derivados da imagem base uma única vez (balanço da corrida, esticada do
+pulo, achatada do deslize, piscar vermelho da batida, giro/pulso dos
+obstáculos). Cada quadro ganha junto sua pygame.mask.Mask (colisão por pixel
+em ObstacleManager.check_collision); quadros e máscaras ficam em cache por
+(arquivo, tamanho, animação) — nenhuma máscara é gerada durante o jogo.
+"""
+
+import os
+import math
+import pygame
+
+from game.assets_loader import ASSETS_PATH, load_image, scale_image, _convert
+
+STRIP_PATH = os.path.join(ASSETS_PATH, "sprites", "anim")
+
+# nome -> (quadros por segundo, repete?)
+PLAYER_ANIMATIONS = {
+    "run": (10, True),
+    "jump": (8, False),
+    "slide": (12, True),
+    "hit": (12, True),
+}
+OBSTACLE_ANIMATIONS = {
+    "need_jump": ("pulse", 6),
+    "must_avoid": ("spin", 12),
+}
+
+# (caminho absoluto ou None p/ o quadrado de fallback, tamanho, animação)
+# -> (tupla de Surfaces, tupla de Masks)
+_STRIP_CACHE = {}
+
+
+class Animation:
+    __slots__ = ("frames", "masks", "fps", "loop")
+
+    def __init__(self, frames, masks, fps=10, loop=True):
+        self.frames = tuple(frames)
+        self.masks = tuple(masks)
+        self.fps = fps
+        self.loop = loop
+
+
+class Animator:
+    def __init__(self, animations, state="run"):
+        """animations: {nome: Animation}; state: animação inicial."""
+        self.animations = animations
+        self.state = state
+        self._anim = animations[state]
+        self._time = 0.0
+
+    def play(self, name, restart=False):
+        """Troca de animação (mesmo nome continua de onde estava)."""
+        if name == self.state and not restart:
+            return
+        anim = self.animations.get(name)
+        if anim is None:
+            return
+        self.state = name
+        self._anim = anim
+        self._time = 0.0
+
+    def update(self, dt):
+        self._time += dt
+
+    @property
+    def done(self):
+        """Animação sem repetição chegou ao último quadro."""
+        anim = self._anim
+        return not anim.loop and self._time * anim.fps >= len(anim.frames) - 1
+
+    @property
+    def index(self):
+        anim = self._anim
+        i = int(self._time * anim.fps)
+        n = len(anim.frames)
+        return i % n if anim.loop else min(i, n - 1)
+
+    @property
+    def image(self):
+        return self._anim.frames[self.index]
+
+    @property
+    def mask(self):
+        """Máscara do quadro atual (pronta, do cache)."""
+        return self._anim.masks[self.index]
+
+
+def strip_file(image_path, anim):
+    """Tira desenhada para 'image_path' + 'anim', se existir."""
+    if not image_path:
+        return None
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    path = os.path.join(STRIP_PATH, f"{stem}.{anim}.png")
+    return path if os.path.isfile(path) else None
+
+
+def load_strip(path, size):
+    """Corta a tira em quadros (altura x altura) e escala cada um para 'size'."""
+    sheet = load_image(path, use_alpha=True)
+    if sheet is None:
+        return None
+    sw, sh = sheet.get_size()
+    cell = max(1, sh)
+    frames = []
+    for x in range(0, sw - cell + 1, cell):
+        frame = sheet.subsurface((x, 0, cell, sh))
+        frames.append(_convert(scale_image(frame, size)))
+    return frames or None
+
+
+def _blank(size):
+    return pygame.Surface(size, pygame.SRCALPHA)
+
+
+def _scaled(base, size):
+    if base.get_size() == tuple(size):
+        return base
+    return scale_image(base, size)
+
+
+def _run_frames(base, size):
+    # balanço: a altura oscila alguns pixels, pés sempre no chão
+    w, h = size
+    frames = []
+    for dy in (0, -2, -3, -2, 0, 1):
+        img = _scaled(base, (w, max(1, h + dy)))
+        frame = _blank(size)
+        frame.blit(img, (0, h - img.get_height()))
+        frames.append(frame)
+    return frames
+
+
+def _jump_frames(base, size):
+    # esticada no impulso, normal no ar
+    w, h = size
+    stretch = _scaled(base, (max(1, w - 6), h))
+    frame = _blank(size)
+    frame.blit(stretch, (3, 0))
+    return [frame, _scaled(base, size)]
+
+
+def _slide_frames(base, size):
+    # 'size' já é o tamanho achatado; leve tremida horizontal
+    w, h = size
+    img = _scaled(base, (max(1, w - 2), h))
+    frames = []
+    for dx in (0, 1, 2, 1):
+        frame = _blank(size)
+        frame.blit(img, (dx, 0))
+        frames.append(frame)
+    return frames
+
+
+def _hit_frames(base, size):
+    # pisca: tingido de vermelho / clarão (o alfa não muda: mesma máscara)
+    tinted = _scaled(base, size).copy()
+    tinted.fill((120, 0, 0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+    flash = _scaled(base, size).copy()
+    flash.fill((140, 140, 140, 0), special_flags=pygame.BLEND_RGBA_ADD)
+    return [tinted, flash]
+
+
+def _spin_frames(base, size, steps=8):
+    # giro completo recortado no tamanho original (o rect não muda)
+    w, h = size
+    frames = []
+    for i in range(steps):
+        rot = pygame.transform.rotate(_scaled(base, size), -360.0 * i / steps)
+        frame = _blank(size)
+        frame.blit(rot, ((w - rot.get_width()) // 2, (h - rot.get_height()) // 2))
+        frames.append(frame)
+    return frames
+
+
+def _pulse_frames(base, size, steps=6):
+    frames = []
+    for i in range(steps):
+        add = int(40 * (1 - math.cos(2 * math.pi * i / steps)) / 2)
+        frame = _scaled(base, size).copy()
+        frame.fill((add, add, add, 0), special_flags=pygame.BLEND_RGBA_ADD)
+        frames.append(frame)
+    return frames
+
+
+_GENERATORS = {
+    "run": _run_frames,
+    "jump": _jump_frames,
+    "slide": _slide_frames,
+    "hit": _hit_frames,
+    "spin": _spin_frames,
+    "pulse": _pulse_frames,
+}
+
+
+def frames_for(image_path, base, size, anim):
+    """
+    (quadros, máscaras) de 'anim' para a imagem, no tamanho 'size': tira de
+    assets/sprites/anim se houver, senão gerados de 'base'. Em cache.
+    """
+    key = (os.path.abspath(image_path) if image_path else None, tuple(size), anim)
+    entry = _STRIP_CACHE.get(key)
+    if entry is None:
+        path = strip_file(image_path, anim)
+        frames = load_strip(path, size) if path else None
+        if frames is None:
+            frames = [_convert(f) for f in _GENERATORS[anim](base, size)]
+        masks = [pygame.mask.from_surface(f) for f in frames]
+        entry = _STRIP_CACHE[key] = (tuple(frames), tuple(masks))
+    return entry
+
+
+def player_animator(image_path, base, size, slide_size):
+    """Animator do jogador (run/jump/slide/hit) a partir da imagem base."""
+    animations = {}
+    for name, (fps, loop) in PLAYER_ANIMATIONS.items():
+        frame_size = slide_size if name == "slide" else size
+        frames, masks = frames_for(image_path, base, frame_size, name)
+        animations[name] = Animation(frames, masks, fps, loop)
+    return Animator(animations, "run")
+
+
+def obstacle_animator(image_path, base, kind):
+    """Animator de um obstáculo pelo tipo (giro para desviar, pulso para pular)."""
+    anim, fps = OBSTACLE_ANIMATIONS.get(kind, OBSTACLE_ANIMATIONS["must_avoid"])
+    frames, masks = frames_for(image_path, base, base.get_size(), anim)
+    return Animator({anim: Animation(frames, masks, fps)}, anim)
+
+
+def invalidate(path):
+    """Descarta quadros derivados de 'path' (imagem base ou tira alterada)."""
+    path = os.path.abspath(path)
+    stem = None
+    if os.path.dirname(path) == os.path.abspath(STRIP_PATH):
+        # <imagem>.<animação>.png -> <imagem>
+        stem = os.path.basename(path).rsplit(".", 2)[0]
+    dropped = 0
+    for key in list(_STRIP_CACHE):
+        src = key[0]
+        if src == path or (
+            stem and src and os.path.splitext(os.path.basename(src))[0] == stem
+        ):
+            del _STRIP_CACHE[key]
+            dropped += 1
+    return dropped
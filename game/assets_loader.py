@@ -1,8 +1,21 @@
 import os
+import json
+import mmap
+import hashlib
 import pygame
 import sys
 
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 ASSETS_PATH = os.path.join(os.path.dirname(__file__), "..", "assets")
+# cache gerado em tempo de execução (PCM pré-decodificado, atlas etc.)
+CACHE_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "cache")
+AUDIO_CACHE_PATH = os.path.join(CACHE_PATH, "audio")
+ATLAS_PATH = os.path.join(CACHE_PATH, "atlas")
+ATLAS_INDEX = "atlas.json"
+# variantes pré-renderizadas (python -m game.bake); subir a versão invalida tudo
+BAKE_VERSION = 1
+BAKED_PATH = os.path.join(CACHE_PATH, "baked", f"v{BAKE_VERSION}")
+BAKED_MANIFEST = "manifest.json"
 
 IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".gif")
 SOUND_EXTS = (".mp3", ".wav", ".ogg", ".flac")
@@ -39,12 +52,112 @@ def _resolve_path(path):
     return None
 
 
-def load_image(path, size=None, use_alpha=True):
+# superfícies já carregadas/convertidas (inclusive pelo preloader):
+# {(caminho_resolvido, size, use_alpha): Surface}
+_IMAGE_CACHE = {}
+# variantes prontas (preview/exact/cover/fit) vindas do preloader: {chave: Surface}
+_VARIANT_CACHE = {}
+# sons já carregados: {caminho_resolvido: Sound}
+_SOUND_CACHE = {}
+
+
+def _convert(img, use_alpha=True):
+    """convert_alpha()/convert() conforme o display; mantém original se falhar."""
+    try:
+        if use_alpha:
+            return img.convert_alpha()
+        return img.convert()
+    except Exception:
+        try:
+            return img.convert()
+        except Exception:
+            # manter original se não for possível converter
+            return img
+
+
+# escala em runtime: smoothscale (qualidade) ou scale (rápido), conforme o
+# preset de qualidade (config "smooth_scale", game.quality)
+_SMOOTH_SCALE = True
+
+
+def set_smooth_scale(enabled):
+    global _SMOOTH_SCALE
+    _SMOOTH_SCALE = bool(enabled)
+
+
+def scale_image(img, size):
+    """img reescalada para size: smoothscale, ou scale se desligado/falhar."""
+    if _SMOOTH_SCALE:
+        try:
+            return pygame.transform.smoothscale(img, size)
+        except Exception:
+            pass
+    return pygame.transform.scale(img, size)
+
+
+def _image_cache_key(res, size, use_alpha):
+    return (os.path.abspath(res), tuple(size) if size else None, bool(use_alpha))
+
+
+def cache_image(path, size, use_alpha, surf):
+    """Registra uma Surface já convertida para as próximas chamadas de load_image."""
+    res = _resolve_path(path) or path
+    _IMAGE_CACHE[_image_cache_key(res, size, use_alpha)] = surf
+
+
+def cache_variant(key, surf):
+    """Registra uma variante já convertida para as próximas chamadas de load_variant."""
+    if key:
+        _VARIANT_CACHE[key] = surf
+
+
+def clear_caches():
+    """Esvazia os caches em memória de imagens, variantes e sons."""
+    _IMAGE_CACHE.clear()
+    _VARIANT_CACHE.clear()
+    _SOUND_CACHE.clear()
+
+
+def invalidate_asset(path):
+    """
+    Esquece tudo o que foi derivado de 'path' (imagens, variantes, entradas do
+    atlas e som), para que o próximo load_* leia o arquivo novo do disco.
+    Retorna quantas entradas foram descartadas.
+    """
+    res = os.path.abspath(_resolve_path(path) or path)
+    rel = _project_relpath(res)
+
+    def from_source(key):
+        # "kind:relpath:WxH" -> relpath
+        return key.split(":", 1)[1].rsplit(":", 1)[0] == rel
+
+    dropped = 0
+    for key in [k for k in _IMAGE_CACHE if k[0] == res]:
+        del _IMAGE_CACHE[key]
+        dropped += 1
+    for key in [k for k in _VARIANT_CACHE if from_source(k)]:
+        del _VARIANT_CACHE[key]
+        dropped += 1
+    if _ATLAS is not None:
+        sprites = _ATLAS["sprites"]
+        for key in [k for k in sprites if from_source(k)]:
+            del sprites[key]
+            dropped += 1
+    if _SOUND_CACHE.pop(res, None) is not None:
+        dropped += 1
+    # variantes pré-renderizadas não precisam de limpeza: baked_image compara
+    # o hash da origem (memoizado por mtime) a cada leitura
+    return dropped
+
+
+def load_image(path, size=None, use_alpha=True, convert=True):
     """
     Carrega imagem de forma robusta.
     - path: caminho relativo/absoluto ou diretório (se diretório, busca o primeiro arquivo de imagem)
     - size: tuple (w,h) opcional para escalar preservando proporção (encaixe)
     - use_alpha: tenta convert_alpha(), senão convert()
+    - convert: False pula a conversão dependente do display (uso em threads);
+      o resultado então não entra no cache
     Retorna Surface ou None.
     """
     if not path:
@@ -65,6 +178,16 @@ def load_image(path, size=None, use_alpha=True):
         if res is None:
             return None
 
+    cache_key = _image_cache_key(res, size, use_alpha)
+    if convert and cache_key in _IMAGE_CACHE:
+        return _IMAGE_CACHE[cache_key]
+
+    # variante já empacotada no atlas/bake: sem decode nem smoothscale
+    if size:
+        packed = load_variant("fit", res, size, convert=convert)
+        if packed is not None:
+            return packed
+
     try:
         img = pygame.image.load(res)
     except Exception as e:
@@ -72,17 +195,8 @@ def load_image(path, size=None, use_alpha=True):
         return None
 
     # tentar converter conforme display
-    try:
-        if use_alpha:
-            img = img.convert_alpha()
-        else:
-            img = img.convert()
-    except Exception:
-        try:
-            img = img.convert()
-        except Exception:
-            # manter original se não for possível converter
-            pass
+    if convert:
+        img = _convert(img, use_alpha)
 
     # escalar mantendo proporção se solicitado
     if size:
@@ -91,13 +205,12 @@ def load_image(path, size=None, use_alpha=True):
         scale = min(tw / sw, th / sh)
         nw, nh = max(1, int(sw * scale)), max(1, int(sh * scale))
         try:
-            img = pygame.transform.smoothscale(img, (nw, nh))
+            img = scale_image(img, (nw, nh))
         except Exception:
-            try:
-                img = pygame.transform.scale(img, (nw, nh))
-            except Exception:
-                pass
+            pass
 
+    if convert:
+        _IMAGE_CACHE[cache_key] = img
     return img
 
 
@@ -162,6 +275,55 @@ def find_image_by_name(name):
     return None
 
 
+def fit_size(src_size, size):
+    """Tamanho (w, h) que encaixa src_size em size preservando proporção."""
+    sw, sh = src_size
+    tw, th = size
+    scale = min(tw / sw, th / sh)
+    return max(1, int(sw * scale)), max(1, int(sh * scale))
+
+
+def make_circular_preview(img_surf, size, pad=8):
+    """
+    Retorna Surface size x size com img_surf centralizada e recortada em círculo.
+    pad: espaço interno para borda
+    """
+    if img_surf is None:
+        return None
+    w, h = size
+    target_w = max(1, w - pad * 2)
+    target_h = max(1, h - pad * 2)
+    # escalar preservando proporção para caber no target
+    nw, nh = fit_size(img_surf.get_size(), (target_w, target_h))
+    scaled = scale_image(img_surf, (nw, nh))
+    surf = pygame.Surface((w, h), pygame.SRCALPHA)
+    x = (w - nw) // 2
+    y = (h - nh) // 2
+    surf.blit(scaled, (x, y))
+    # máscara circular
+    mask = pygame.Surface((w, h), pygame.SRCALPHA)
+    radius = min(w, h) // 2
+    pygame.draw.circle(mask, (255, 255, 255, 255), (w // 2, h // 2), radius)
+    # aplica máscara (preserva apenas dentro do círculo)
+    surf.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    return surf
+
+
+def crop_to_cover(img, size):
+    """Escala img para cobrir size (sem bordas) e recorta o centro."""
+    w, h = size
+    sw, sh = img.get_size()
+    scale = max(w / sw, h / sh)
+    nw, nh = int(sw * scale), int(sh * scale)
+    scaled = scale_image(img, (nw, nh))
+    x = (nw - w) // 2
+    y = (nh - h) // 2
+    try:
+        return scaled.subsurface((x, y, w, h)).copy()
+    except Exception:
+        return scale_image(img, (w, h))
+
+
 def load_character_preview(folder, size=(120, 120), use_alpha=True):
     """
     Retorna Surface circular de preview (size) a partir da primeira imagem na pasta do personagem.
@@ -188,6 +350,164 @@ def load_character_preview(folder, size=(120, 120), use_alpha=True):
     return surf
 
 
+def _project_relpath(path):
+    """Caminho relativo à raiz do projeto, com '/' (chave estável entre SOs)."""
+    return os.path.relpath(os.path.abspath(path), PROJECT_ROOT).replace(os.sep, "/")
+
+
+def atlas_key(kind, path, size):
+    """
+    Chave de uma variante no atlas.
+    - kind: 'fit' (load_image com size), 'exact' (esticada para size),
+      'preview' (prévia circular) ou 'cover' (recorte cobrindo size)
+    - path: arquivo de origem; size: (w, h)
+    """
+    if not path or not size:
+        return None
+    return f"{kind}:{_project_relpath(path)}:{int(size[0])}x{int(size[1])}"
+
+
+# atlas carregado: {"sheets": [Surface], "sprites": {chave: Surface}}
+_ATLAS = None
+
+
+def read_atlas(folder=None):
+    """
+    Lê o índice e decodifica as folhas do atlas SEM converter para o display
+    (seguro em thread de trabalho). Retorna (index, [Surface|None]) ou None.
+    """
+    folder = folder or ATLAS_PATH
+    try:
+        with open(os.path.join(folder, ATLAS_INDEX), "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except Exception:
+        return None
+
+    sheets = []
+    for fname in index.get("sheets", []):
+        try:
+            sheet = pygame.image.load(os.path.join(folder, fname))
+        except Exception as e:
+            print(f"[assets_loader] falha ao carregar folha do atlas {fname!r}: {e}")
+            sheet = None
+        sheets.append(sheet)
+    return index, sheets
+
+
+def install_atlas(index, sheets):
+    """
+    Converte as folhas (thread principal) e fatia cada sprite como subsurface.
+    Entradas cujo arquivo de origem mudou desde o build são descartadas
+    (o chamador cai no carregamento normal). Retorna o número de sprites.
+    """
+    global _ATLAS
+    sheets = [_convert(sh) if sh is not None else None for sh in sheets]
+    digests = {}
+    sprites = {}
+    for key, entry in index.get("sprites", {}).items():
+        try:
+            sheet = sheets[entry["sheet"]]
+            if sheet is None:
+                continue
+            src = os.path.join(PROJECT_ROOT, entry["source"])
+            if src not in digests:
+                digests[src] = _file_digest(src) if os.path.isfile(src) else None
+            if digests[src] != entry.get("digest"):
+                continue
+            sprites[key] = sheet.subsurface(pygame.Rect(entry["rect"]))
+        except Exception:
+            continue
+    _ATLAS = {"sheets": sheets, "sprites": sprites}
+    return len(sprites)
+
+
+def load_atlas(folder=None):
+    """
+    Decodifica as folhas do atlas (uma vez) e fatia cada sprite como
+    subsurface. Retorna o número de sprites disponíveis.
+    """
+    global _ATLAS
+    read = read_atlas(folder)
+    if read is None:
+        _ATLAS = None
+        return 0
+    return install_atlas(*read)
+
+
+def atlas_image(key):
+    """Retorna a subsurface do atlas para 'key' ou None se não houver."""
+    if _ATLAS is None or not key:
+        return None
+    return _ATLAS["sprites"].get(key)
+
+
+# manifesto das variantes pré-renderizadas: {chave: entrada} (lido sob demanda)
+_BAKED = None
+
+
+def _load_baked_manifest():
+    global _BAKED
+    if _BAKED is None:
+        try:
+            with open(
+                os.path.join(BAKED_PATH, BAKED_MANIFEST), "r", encoding="utf-8"
+            ) as f:
+                manifest = json.load(f)
+            if manifest.get("version") != BAKE_VERSION:
+                manifest = {}
+            _BAKED = manifest.get("variants", {})
+        except Exception:
+            _BAKED = {}
+    return _BAKED
+
+
+def reset_baked_manifest():
+    """Força reler o manifesto na próxima consulta (após um novo bake)."""
+    global _BAKED
+    _BAKED = None
+
+
+def baked_image(key, convert=True):
+    """
+    Carrega a variante pré-renderizada 'key' (pixels RGBA crus, sem decode
+    nem escala) se o hash da origem ainda bater. Retorna Surface ou None.
+    - convert: False devolve a Surface sem convert_alpha() (uso em threads)
+    """
+    if not key:
+        return None
+    entry = _load_baked_manifest().get(key)
+    if not entry:
+        return None
+    try:
+        src = os.path.join(PROJECT_ROOT, entry["source"])
+        if not os.path.isfile(src) or _file_digest(src) != entry["digest"]:
+            return None
+        with open(os.path.join(BAKED_PATH, entry["file"]), "rb") as f:
+            data = f.read()
+        img = pygame.image.frombytes(data, tuple(entry["size"]), "RGBA")
+        return _convert(img) if convert else img
+    except Exception as e:
+        print(f"[assets_loader] variante pré-renderizada inválida {key!r}: {e}")
+        return None
+
+
+def load_variant(kind, path, size, convert=True):
+    """
+    Procura uma variante pronta (ver atlas_key): primeiro no atlas e no cache
+    do preloader, depois nos arquivos pré-renderizados. Retorna Surface ou
+    None (o chamador então carrega e escala a imagem original).
+    """
+    key = atlas_key(kind, path, size)
+    img = atlas_image(key)
+    if img is None:
+        img = _VARIANT_CACHE.get(key) if key else None
+    if img is None:
+        img = baked_image(key, convert=convert)
+        if img is not None and convert:
+            _VARIANT_CACHE[key] = img
+    return img
+
+
 def find_wallpaper_in_player_folder():
     """
     Procura por 'wallpaper' dentro de assets/sprits/player ou assets/sprites/player.
@@ -236,9 +556,104 @@ def find_first_sound_in_folder(folder):
     return None
 
 
-def load_sound(path):
+# hashes já calculados neste processo: {caminho: (tamanho, mtime_ns, sha1)}
+_DIGESTS = {}
+
+
+def _file_digest(path):
+    """Retorna o sha1 (hex) do conteúdo do arquivo (memoizado por tamanho/mtime)."""
+    st = os.stat(path)
+    memo = _DIGESTS.get(path)
+    if memo and memo[0] == st.st_size and memo[1] == st.st_mtime_ns:
+        return memo[2]
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    _DIGESTS[path] = (st.st_size, st.st_mtime_ns, digest)
+    return digest
+
+
+def _pcm_cache_path(src_path):
+    """
+    Caminho do PCM em cache para 'src_path' no formato atual do mixer.
+    A chave combina o hash do arquivo de origem com (frequência, bits, canais),
+    então trocar o áudio ou a configuração do mixer invalida o cache sozinho.
+    Retorna None se o mixer não estiver inicializado.
+    """
+    init = pygame.mixer.get_init()
+    if not init:
+        return None
+    freq, size, channels = init
+    fmt = f"{abs(size)}{'s' if size < 0 else 'u'}"
+    name = f"{_file_digest(src_path)}-{freq}-{fmt}-{channels}.pcm"
+    return os.path.join(AUDIO_CACHE_PATH, name)
+
+
+def bake_sound(path):
+    """
+    Decodifica 'path' uma única vez e grava o PCM cru (no formato do mixer)
+    em AUDIO_CACHE_PATH. Retorna o caminho do cache ou None.
+    """
+    res = _resolve_path(path) or path
+    if not res or not os.path.isfile(res):
+        return None
+    try:
+        cache = _pcm_cache_path(res)
+        if cache is None:
+            return None
+        if os.path.isfile(cache):
+            return cache
+        raw = pygame.mixer.Sound(res).get_raw()
+        os.makedirs(AUDIO_CACHE_PATH, exist_ok=True)
+        tmp = cache + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(raw)
+        # rename atômico: um cache parcial nunca é visto por load_sound
+        os.replace(tmp, cache)
+        return cache
+    except Exception as e:
+        print(f"[assets_loader] falha ao gerar cache PCM de {res!r}: {e}")
+        return None
+
+
+def bake_sound_cache(folder=None):
+    """
+    Etapa de primeira execução: transcodifica todos os efeitos sonoros de
+    'folder' (padrão assets/sounds) para PCM cru. A música de fundo é ignorada
+    porque é tocada em streaming por pygame.mixer.music.
+    Retorna a lista de caminhos gerados/já existentes.
+    """
+    folder = folder or os.path.join(ASSETS_PATH, "sounds")
+    res = _resolve_path(folder) or folder
+    baked = []
+    if not os.path.isdir(res):
+        return baked
+    for root, _, files in os.walk(res):
+        for fname in files:
+            fn = fname.lower()
+            if not fn.endswith(SOUND_EXTS) or "music" in fn:
+                continue
+            cache = bake_sound(os.path.join(root, fname))
+            if cache:
+                baked.append(cache)
+    return baked
+
+
+def _load_pcm_cache(cache):
+    """Mapeia o PCM em memória e entrega o buffer direto ao mixer."""
+    with open(cache, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return pygame.mixer.Sound(buffer=mm)
+
+
+def load_sound(path, use_cache=True):
     """
     Tenta carregar um pygame.mixer.Sound a partir de path (arquivo ou diretório).
+    - use_cache: usa (e gera, se preciso) o PCM pré-decodificado em data/cache/audio
     Retorna objeto Sound ou None.
     """
     if not path:
@@ -249,6 +664,32 @@ def load_sound(path):
         res = find_first_sound_in_folder(res)
     if not res or not os.path.isfile(res):
         return None
+    cached = _SOUND_CACHE.get(os.path.abspath(res))
+    if cached is not None:
+        return cached
+    snd = _decode_sound(res, use_cache)
+    if snd is not None:
+        _SOUND_CACHE[os.path.abspath(res)] = snd
+    return snd
+
+
+def cache_sound(path, snd):
+    """Registra um Sound já carregado (ex.: pelo preloader)."""
+    res = _resolve_path(path) or path
+    if snd is not None:
+        _SOUND_CACHE[os.path.abspath(res)] = snd
+
+
+def _decode_sound(res, use_cache=True):
+    if use_cache:
+        try:
+            cache = bake_sound(res)
+            if cache:
+                snd = _load_pcm_cache(cache)
+                if snd:
+                    return snd
+        except Exception as e:
+            print(f"[assets_loader] cache PCM inválido para {res!r}: {e}")
     try:
         snd = pygame.mixer.Sound(res)
         return snd
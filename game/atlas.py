@@ -0,0 +1,222 @@
+"""
+Build do atlas de sprites.
+
+Empacota todos os sprites de jogo já no tamanho usado em tela (obstáculos
+64x64, player 48x48, prévias circulares 120/200 px, popup e fundos) em uma ou
+poucas folhas PNG + índice JSON em data/cache/atlas. Em tempo de execução
+game.assets_loader.load_atlas() decodifica as folhas uma única vez e fatia
+subsurfaces.
+
+Uso: python -m game.atlas
+"""
+
+import os
+import json
+import pygame
+
+from game.assets_loader import (
+    ATLAS_PATH,
+    ATLAS_INDEX,
+    PROJECT_ROOT,
+    _file_digest,
+    _project_relpath,
+    atlas_key,
+    crop_to_cover,
+    find_image_by_name,
+    find_wallpaper_in_player_folder,
+    load_image,
+    make_circular_preview,
+    scale_image,
+)
+from game.settings import OBSTACLE_NAMES, WIDTH, HEIGHT
+from game.config import get_config
+
+PREVIEW_SIZES = ((120, 120), (200, 200))
+WINNER_BOX = (420, 220)
+
+MAX_SHEET = 2048
+PADDING = 1
+
+
+def _character_names():
+    try:
+        return list(get_config().get("characters", {}).keys())
+    except Exception:
+        return []
+
+
+def variant_specs():
+    """
+    Lista (kind, caminho_origem, size, use_alpha) de cada variante usada em
+    jogo. Os tamanhos espelham exatamente as chamadas de runtime (Obstacle,
+    Player, start_menu.show_menu, show_game_over_popup e o fundo da rodada).
+    """
+    gameplay = get_config().gameplay()
+    obstacle_size = tuple(gameplay["obstacle_size"])
+    player_size = tuple(gameplay["player_size"])
+    specs = []
+    for nm in OBSTACLE_NAMES:
+        p = find_image_by_name(nm)
+        if p:
+            specs.append(("fit", p, obstacle_size, True))
+
+    for name in _character_names():
+        p = find_image_by_name(name)
+        if not p:
+            continue
+        specs.append(("fit", p, player_size, True))
+        specs.append(("exact", p, player_size, True))
+        for size in PREVIEW_SIZES:
+            specs.append(("fit", p, _preview_inner(size), True))
+            specs.append(("preview", p, size, True))
+
+    p = find_image_by_name("vencedor")
+    if p:
+        specs.append(("fit", p, WINNER_BOX, True))
+
+    p = find_image_by_name("estrada")
+    if p:
+        specs.append(("fit", p, (WIDTH, HEIGHT), False))
+
+    p = find_wallpaper_in_player_folder()
+    if p:
+        specs.append(("cover", p, (WIDTH, HEIGHT), False))
+    return specs
+
+
+def _preview_inner(size):
+    # mesmo encolhimento interno usado por start_menu.show_menu
+    shrink = 16 if size[0] <= 120 else 32
+    return (size[0] - shrink, size[1] - shrink)
+
+
+def render_spec(spec, convert=True):
+    """
+    Renderiza uma variante de variant_specs() a partir do arquivo de origem.
+    convert=False evita operações dependentes do display (uso em threads).
+    Retorna Surface ou None.
+    """
+    kind, path, size, use_alpha = spec
+    if kind == "fit":
+        return load_image(path, size=size, use_alpha=use_alpha, convert=convert)
+    if kind == "exact":
+        img = load_image(path, size=size, use_alpha=use_alpha, convert=convert)
+        if img is None or img.get_size() == tuple(size):
+            return img
+        return scale_image(img, size)
+    if kind == "preview":
+        img = load_image(path, size=_preview_inner(size), convert=convert)
+        return make_circular_preview(img, size) if img is not None else None
+    if kind == "cover":
+        img = load_image(path, size=None, use_alpha=use_alpha, convert=convert)
+        return crop_to_cover(img, size) if img is not None else None
+    return None
+
+
+def render_variants():
+    """Gera (chave, caminho_origem, Surface) para cada variante de variant_specs()."""
+    out = []
+    for spec in variant_specs():
+        img = render_spec(spec)
+        if img is not None:
+            kind, path, size, _ = spec
+            out.append((atlas_key(kind, path, size), path, img))
+    return out
+
+
+def _pack(sizes):
+    """
+    Empacotamento simples em prateleiras (maiores primeiro).
+    sizes: lista de (w, h). Retorna lista de (folha, x, y) na mesma ordem.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    placed = [None] * len(sizes)
+    sheet, x, y, shelf_h = 0, 0, 0, 0
+    for i in order:
+        w, h = sizes[i][0] + PADDING, sizes[i][1] + PADDING
+        if x + w > MAX_SHEET:
+            x, y, shelf_h = 0, y + shelf_h, 0
+        if y + h > MAX_SHEET:
+            sheet, x, y, shelf_h = sheet + 1, 0, 0, 0
+        placed[i] = (sheet, x, y)
+        x += w
+        shelf_h = max(shelf_h, h)
+    return placed
+
+
+def build_atlas(folder=None, variants=None):
+    """
+    Renderiza todas as variantes (ou usa 'variants' já renderizadas por
+    render_variants), empacota e grava folhas + índice em 'folder'
+    (padrão data/cache/atlas). Retorna o caminho do índice ou None.
+    """
+    folder = folder or ATLAS_PATH
+    if variants is None:
+        variants = render_variants()
+    if not variants:
+        return None
+
+    sizes = [surf.get_size() for _, _, surf in variants]
+    placed = _pack(sizes)
+    n_sheets = max(s for s, _, _ in placed) + 1
+    extents = [[1, 1] for _ in range(n_sheets)]
+    for (sheet, x, y), (w, h) in zip(placed, sizes):
+        extents[sheet][0] = max(extents[sheet][0], x + w)
+        extents[sheet][1] = max(extents[sheet][1], y + h)
+    sheets = [pygame.Surface(ext, pygame.SRCALPHA) for ext in extents]
+
+    digests = {}
+    sprites = {}
+    for (key, src, surf), (sheet, x, y) in zip(variants, placed):
+        sheets[sheet].blit(surf, (x, y))
+        if src not in digests:
+            digests[src] = _file_digest(src)
+        w, h = surf.get_size()
+        sprites[key] = {
+            "sheet": sheet,
+            "rect": [x, y, w, h],
+            "source": _project_relpath(src),
+            "digest": digests[src],
+        }
+
+    os.makedirs(folder, exist_ok=True)
+    names = []
+    for i, sheet in enumerate(sheets):
+        fname = f"atlas_{i}.png"
+        pygame.image.save(sheet, os.path.join(folder, fname))
+        names.append(fname)
+
+    index_path = os.path.join(folder, ATLAS_INDEX)
+    tmp = index_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "sheets": names, "sprites": sprites}, f, indent=1)
+    os.replace(tmp, index_path)
+    return index_path
+
+
+def atlas_is_fresh(folder=None):
+    """True se o índice existe e todas as origens ainda têm o mesmo hash."""
+    folder = folder or ATLAS_PATH
+    try:
+        with open(os.path.join(folder, ATLAS_INDEX), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        seen = {}
+        for entry in index.get("sprites", {}).values():
+            src = os.path.join(PROJECT_ROOT, entry["source"])
+            if src not in seen:
+                seen[src] = os.path.isfile(src) and _file_digest(src) == entry["digest"]
+            if not seen[src]:
+                return False
+        return bool(index.get("sprites"))
+    except Exception:
+        return False
+
+
+if __name__ == "__main__":
+    pygame.init()
+    path = build_atlas()
+    print(
+        f"[atlas] índice gravado em {path}"
+        if path
+        else "[atlas] nenhum sprite encontrado"
+    )
@@ -0,0 +1,77 @@
+"""
+Modo atração (demo) do quiosque: com o menu parado e ninguém na frente da
+câmera, o Bot joga rodadas sozinho na tela até alguém chegar.
+
+A demo desenha a 30 quadros/s (dois passos de simulação por quadro) para
+gastar pouco com a sala vazia; a câmera, com ninguém na frente, já não roda
+o Pose.process (game.presence). Volta ao menu na hora em que a câmera vê
+movimento ou com qualquer tecla/clique.
+"""
+
+import math
+import random
+
+import pygame
+
+from game.bot import Bot
+from game.display import present
+from game.round import RoundSim
+from game.settings import BG_COLOR, FPS
+
+DEMO_FPS = 30
+# rodada da demo recomeça depois deste tempo (ou no fim de jogo)
+DEMO_SECONDS = 60
+
+
+def run_attract(screen, clock, camera=None, sprite_path=None, background=None):
+    """
+    Roda a demo até alguém aparecer (camera.check_presence()) ou apertar
+    uma tecla/clicar. background: ScrollingBackground (game.scroll) ou None.
+    -> True (voltar ao menu) ou None (janela fechada).
+    """
+    font = pygame.font.SysFont(None, 44)
+    small = pygame.font.SysFont(None, 28)
+    title = font.render("Chegue perto da câmera para jogar!", True, (255, 255, 255))
+    hint = small.render("ou aperte qualquer tecla", True, (220, 220, 220))
+    steps = max(1, round(FPS / DEMO_FPS))
+    rng = random.Random()
+    sim = bot = None
+    frame = 0
+    try:
+        while True:
+            if sim is None or sim.over or sim.tick >= DEMO_SECONDS * sim.fps:
+                if sim is not None:
+                    sim.close()
+                sim = RoundSim(sprite_path)
+                bot = Bot(reaction=0.2, mistake=0.03, rng=rng)
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return None
+                if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                    return True
+            if camera is not None and camera.check_presence():
+                return True
+
+            for _ in range(steps):
+                sim.step(bot.act(sim))
+                if background is not None:
+                    background.advance(int(sim.obstacles.speed * sim.dt))
+
+            if background is not None:
+                background.draw(screen.blit)
+            else:
+                screen.fill(BG_COLOR)
+            sim.obstacles.draw(screen)
+            sim.player.draw(screen)
+            # texto pulsando no topo
+            w = screen.get_width()
+            title.set_alpha(int(170 + 85 * math.sin(frame / 8.0)))
+            screen.blit(title, title.get_rect(midtop=(w // 2, 24)))
+            screen.blit(hint, hint.get_rect(midtop=(w // 2, 64)))
+            present()
+            frame += 1
+            clock.tick(DEMO_FPS)
+    finally:
+        if sim is not None:
+            sim.close()
@@ -0,0 +1,103 @@
+"""
+Pipeline offline de "bake" dos assets.
+
+Pré-renderiza todas as variantes que o jogo usa (tamanhos de obstáculo e
+player, prévias circulares do menu, wallpaper recortado em WIDTHxHEIGHT,
+estrada de fundo e popup) em data/cache/baked/v<BAKE_VERSION> como pixels
+RGBA crus + manifest.json, reconstrói o atlas a partir delas e gera o cache
+PCM dos efeitos sonoros. Em runtime game.assets_loader.load_variant /
+load_image preferem esses arquivos quando o hash da origem bate, então o cold
+start não faz nenhum smoothscale.
+
+Uso: python -m game.bake
+"""
+
+import os
+import json
+import hashlib
+import pygame
+
+from game.assets_loader import (
+    BAKE_VERSION,
+    BAKED_PATH,
+    BAKED_MANIFEST,
+    PROJECT_ROOT,
+    _file_digest,
+    _project_relpath,
+    atlas_key,
+    bake_sound_cache,
+    reset_baked_manifest,
+)
+from game.atlas import build_atlas, render_variants, atlas_is_fresh, variant_specs
+
+
+def bake(folder=None, with_sounds=True):
+    """
+    Renderiza e grava todas as variantes em 'folder' (padrão BAKED_PATH),
+    reconstrói o atlas e, se o mixer estiver ativo e with_sounds=True,
+    o cache PCM dos efeitos. Retorna o número de variantes gravadas.
+    """
+    folder = folder or BAKED_PATH
+    variants = render_variants()
+    os.makedirs(folder, exist_ok=True)
+
+    entries = {}
+    for key, src, surf in variants:
+        fname = hashlib.sha1(key.encode("utf-8")).hexdigest()[:20] + ".rgba"
+        tmp = os.path.join(folder, fname + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(pygame.image.tobytes(surf, "RGBA"))
+        os.replace(tmp, os.path.join(folder, fname))
+        entries[key] = {
+            "file": fname,
+            "size": list(surf.get_size()),
+            "source": _project_relpath(src),
+            "digest": _file_digest(src),
+        }
+
+    manifest_path = os.path.join(folder, BAKED_MANIFEST)
+    tmp = manifest_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": BAKE_VERSION, "variants": entries}, f, indent=1)
+    os.replace(tmp, manifest_path)
+    reset_baked_manifest()
+
+    # atlas reaproveita as variantes já renderizadas (nenhum smoothscale extra)
+    build_atlas(variants=variants)
+
+    if with_sounds and pygame.mixer.get_init():
+        bake_sound_cache()
+    return len(entries)
+
+
+def baked_is_fresh(folder=None):
+    """True se manifesto e atlas existem e todas as origens mantêm o hash."""
+    folder = folder or BAKED_PATH
+    try:
+        with open(os.path.join(folder, BAKED_MANIFEST), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != BAKE_VERSION or not manifest.get("variants"):
+            return False
+        # tamanhos vindos da config mudaram -> faltam variantes
+        wanted = {atlas_key(kind, p, size) for kind, p, size, _ in variant_specs()}
+        if not wanted.issubset(manifest["variants"]):
+            return False
+        for entry in manifest["variants"].values():
+            src = os.path.join(PROJECT_ROOT, entry["source"])
+            if not os.path.isfile(src) or _file_digest(src) != entry["digest"]:
+                return False
+            if not os.path.isfile(os.path.join(folder, entry["file"])):
+                return False
+    except Exception:
+        return False
+    return atlas_is_fresh()
+
+
+if __name__ == "__main__":
+    pygame.init()
+    try:
+        pygame.mixer.init()
+    except Exception:
+        print("[bake] mixer indisponível; cache de áudio não será gerado")
+    n = bake()
+    print(f"[bake] {n} variantes gravadas em {os.path.abspath(BAKED_PATH)}")
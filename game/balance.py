@@ -0,0 +1,227 @@
+"""
+Balanceamento por Monte-Carlo: milhares de rodadas sem janela jogadas pelo
+Bot, em paralelo, comparando conjuntos de parâmetros.
+
+Cada conjunto é a config atual com alguns valores trocados — regras da
+rodada (max_collisions, points_per_evade) ou chaves de "gameplay" (speed,
+spawn_interval, spawn_mode...) — validados como o data/config.json. Cada
+rodada usa seed própria (seed base + índice), e o mesmo índice usa a mesma
+seed em todos os conjuntos, para a comparação não depender da sorte.
+
+As rodadas são distribuídas num multiprocessing.Pool (um processo por núcleo
+por padrão); cada processo devolve só números, agregados no processo
+principal em pontuação, colisões, duração e taxa de fim de jogo.
+
+Uso:
+  python -m game.balance --rounds 2000 --seconds 120 \\
+      --set base --set rapido:speed=300,spawn_interval=1.0 \\
+      --set curto:max_collisions=5 --report data/balance.json
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import random
+import multiprocessing
+
+from game.settings import FPS
+from game.config import get_config, validate, SCHEMA
+
+# perfis de jogador do Bot (reaction, mistake)
+BOT_PROFILES = {
+    "perfeito": (0.0, 0.0),
+    "bom": (0.15, 0.01),
+    "medio": (0.25, 0.04),
+    "iniciante": (0.35, 0.1),
+}
+
+
+def parse_value(text):
+    """'300' -> 300, '[1,2]' -> [1, 2], 'patterns' -> 'patterns'."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def parse_set(spec, base=None):
+    """
+    'nome:chave=valor,chave=valor' -> (nome, regras, tuning) validados sobre
+    a config 'base' (padrão: a atual). Valor inválido gera ValueError.
+    """
+    name, _, assigns = spec.partition(":")
+    base = base if base is not None else get_config().data
+    raw = copy.deepcopy(base)
+    gameplay = raw.setdefault("gameplay", {})
+    for item in filter(None, (a.strip() for a in assigns.split(","))):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"{spec!r}: esperado chave=valor, recebido {item!r}")
+        if key in SCHEMA:
+            raw[key] = parse_value(value)
+        else:
+            gameplay[key] = parse_value(value)
+    cfg, errors = validate(raw)
+    if errors:
+        raise ValueError(f"{name}: " + "; ".join(errors))
+    rules = {
+        "max_collisions": cfg["max_collisions"],
+        "points_per_evade": cfg["points_per_evade"],
+    }
+    return name or "base", rules, cfg["gameplay"]
+
+
+def play_round(task):
+    """
+    Joga uma rodada (executado nos processos do pool). 'task' é
+    (conjunto, seed, tuning, regras, segundos, perfil do bot).
+    """
+    from game.bot import Bot
+    from game.round import RoundSim
+
+    name, seed, tuning, rules, seconds, (reaction, mistake) = task
+    sim = RoundSim(None, seed=seed, tuning=tuning, **rules)
+    # rng do bot separado do da rodada: os spawns não dependem das decisões
+    bot = Bot(reaction=reaction, mistake=mistake, rng=random.Random(~seed))
+    limit = int(seconds * sim.fps)
+    while not sim.over and sim.tick < limit:
+        sim.step(bot.act(sim))
+    result = {
+        "set": name,
+        "seed": seed,
+        "score": sim.score,
+        "collisions": sim.collisions,
+        "seconds": sim.tick / sim.fps,
+        "over": sim.over,
+        "difficulty": sim.obstacles.difficulty,
+    }
+    sim.close()
+    return result
+
+
+def _init_worker():
+    # sem janela/áudio nos processos do pool
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+
+def _percentile(values, q):
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def summarize(results):
+    """Agrega os resultados por conjunto: média e percentis de cada métrica."""
+    groups = {}
+    for res in results:
+        groups.setdefault(res["set"], []).append(res)
+    summary = {}
+    for name, rows in groups.items():
+        entry = {"rounds": len(rows)}
+        for key in ("score", "collisions", "seconds", "difficulty"):
+            values = sorted(r[key] for r in rows)
+            entry[key] = {
+                "mean": sum(values) / len(values),
+                "p10": _percentile(values, 0.1),
+                "p50": _percentile(values, 0.5),
+                "p90": _percentile(values, 0.9),
+            }
+        entry["game_over_rate"] = sum(r["over"] for r in rows) / len(rows)
+        summary[name] = entry
+    return summary
+
+
+def run(sets, rounds, seconds, seed=0, profile="bom", workers=None):
+    """
+    Joga 'rounds' rodadas de cada conjunto [(nome, regras, tuning)] no pool.
+    Retorna (resultados por rodada, segundos gastos).
+    """
+    bot = BOT_PROFILES[profile]
+    tasks = [
+        (name, seed + i, tuning, rules, seconds, bot)
+        for i in range(rounds)
+        for name, rules, tuning in sets
+    ]
+    workers = workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    if workers == 1:
+        results = [play_round(t) for t in tasks]
+    else:
+        # lotes médios: pouco IPC sem deixar núcleo ocioso no fim
+        chunk = max(1, len(tasks) // (workers * 8))
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            results = list(pool.imap_unordered(play_round, tasks, chunk))
+    order = {name: i for i, (name, _, _) in enumerate(sets)}
+    results.sort(key=lambda r: (order[r["set"]], r["seed"]))
+    return results, time.perf_counter() - t0
+
+
+def format_report(summary):
+    lines = [
+        f"{'conjunto':<16}{'rodadas':>8}{'pontos p50':>12}{'(p10-p90)':>14}"
+        f"{'colisões':>10}{'duração s':>11}{'fim de jogo':>13}"
+    ]
+    for name, e in summary.items():
+        sc, co, se = e["score"], e["collisions"], e["seconds"]
+        spread = f"({sc['p10']}-{sc['p90']})"
+        lines.append(
+            f"{name:<16}{e['rounds']:>8}{sc['p50']:>12}"
+            f"{spread:>14}{co['mean']:>10.2f}"
+            f"{se['mean']:>11.1f}{e['game_over_rate']:>12.0%}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Balanceamento com rodadas do Bot")
+    parser.add_argument("--rounds", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--set",
+        action="append",
+        dest="sets",
+        metavar="NOME:CHAVE=VALOR,...",
+        help="conjunto de parâmetros (repetível; padrão: config atual)",
+    )
+    parser.add_argument("--bot", choices=sorted(BOT_PROFILES), default="bom")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--report", help="grava o resumo em JSON")
+    args = parser.parse_args()
+
+    try:
+        sets = [parse_set(spec) for spec in args.sets or ["base"]]
+    except ValueError as e:
+        print(f"[balance] {e}")
+        sys.exit(2)
+
+    results, elapsed = run(
+        sets, args.rounds, args.seconds, args.seed, args.bot, args.workers
+    )
+    summary = summarize(results)
+    played = sum(r["seconds"] for r in results)
+    print(
+        f"[balance] {len(results)} rodadas (bot {args.bot}) em {elapsed:.1f}s —"
+        f" {played / max(elapsed, 1e-9):.0f}x tempo real,"
+        f" {args.workers or os.cpu_count()} processo(s)"
+    )
+    print(format_report(summary))
+    if args.report:
+        data = {
+            "rounds": args.rounds,
+            "seconds": args.seconds,
+            "seed": args.seed,
+            "bot": args.bot,
+            "fps": FPS,
+            "sets": {name: {"rules": r, "tuning": t} for name, r, t in sets},
+            "summary": summary,
+        }
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        print(f"[balance] relatório gravado em {args.report}")
@@ -0,0 +1,116 @@
+"""
+Jogador automático para rodadas sem janela (game.balance, testes de tuning).
+
+O Bot lê o estado da RoundSim — obstáculos ainda não contados, posição do
+jogador e velocidade atual — e devolve as ações do tick ("LEFT"/"RIGHT"/
+"JUMP"), como o teclado ou a câmera fariam. Para parecer um jogador de
+verdade ele tem:
+- reaction: atraso (segundos) entre ver o obstáculo e a ação acontecer
+- mistake: chance de simplesmente não perceber um obstáculo
+- horizon: quão longe (segundos até o contato) ele presta atenção
+
+Com o mesmo rng (semente) e a mesma rodada, as decisões se repetem.
+"""
+
+import math
+import random
+import weakref
+from collections import deque
+
+from game.settings import FPS
+
+# margem, em ticks, para considerar uma lane livre ao entrar nela
+_ENTER_MARGIN = 2
+# antecedência (ticks até o contato) em que o pulo é disparado
+_JUMP_LEAD = 3
+
+
+class Bot:
+    def __init__(self, reaction=0.15, mistake=0.0, horizon=1.2, rng=None, fps=FPS):
+        """
+        reaction: segundos entre a decisão e a ação
+        mistake: probabilidade (0..1) de ignorar um obstáculo
+        horizon: segundos até o contato a partir dos quais reage
+        rng: random.Random (padrão: um novo, sem semente)
+        """
+        self.rng = rng or random.Random()
+        self.delay = max(0, int(round(reaction * fps)))
+        self.mistake = mistake
+        self.horizon = horizon * fps
+        self._pending = deque()
+        self._tick = 0
+        # obstáculo -> ignorado? (sorteado uma vez, quando ele é notado)
+        self._noticed = weakref.WeakKeyDictionary()
+
+    def _threats(self, sim):
+        """Por lane: [(ticks até o contato, ticks até liberar, tipo)]."""
+        player = sim.player
+        ground_y = player.ground_y
+        top = ground_y - player.rect.height
+        step = max(1, int(sim.obstacles.speed * sim.dt))
+        lanes = [[] for _ in range(len(player.lanes))]
+        for spr in sim.obstacles.obstacle_sprites:
+            if spr.counted:
+                continue
+            clear = (ground_y - spr.rect.top) / step
+            if clear <= 0 or not 0 <= spr.lane < len(lanes):
+                continue
+            contact = (top - spr.rect.bottom) / step
+            if contact > self.horizon:
+                continue
+            ignored = self._noticed.get(spr)
+            if ignored is None:
+                ignored = self.rng.random() < self.mistake
+                self._noticed[spr] = ignored
+            if not ignored:
+                lanes[spr.lane].append((contact, clear, spr.ob_type))
+        return lanes
+
+    def _decide(self, sim):
+        player = sim.player
+        lanes = self._threats(sim)
+        lead = self.delay
+        here = player.current_lane
+        threat = min(lanes[here], default=None)
+        if threat is None or threat[0] - lead > self.horizon / 2:
+            return None
+        contact, _, kind = threat
+        if kind == "need_jump" and not player.is_jumping:
+            if contact - lead <= _JUMP_LEAD:
+                return "JUMP"
+            return None
+
+        # desviar: lane vizinha livre ao entrar e com a ameaça mais distante
+        best, best_free = None, contact
+        for direction in (-1, +1):
+            lane = here + direction
+            if not 0 <= lane < len(lanes):
+                continue
+            free = math.inf
+            blocked = False
+            for c, clear, k in lanes[lane]:
+                if c - lead <= _ENTER_MARGIN and clear - lead > -_ENTER_MARGIN:
+                    blocked = True
+                    break
+                free = min(free, c)
+            if blocked:
+                continue
+            if free > best_free or (free == best_free and self.rng.random() < 0.5):
+                best, best_free = direction, free
+        if best is None:
+            return None
+        return "LEFT" if best < 0 else "RIGHT"
+
+    def act(self, sim):
+        """Ações a aplicar neste tick (lista para RoundSim.step)."""
+        tick = self._tick
+        self._tick += 1
+        # só decide de novo quando a ação anterior já saiu
+        if not self._pending:
+            action = self._decide(sim)
+            if action is not None:
+                self._pending.append((tick + self.delay, action))
+        out = []
+        while self._pending and self._pending[0][0] <= tick:
+            out.append(self._pending.popleft()[1])
+        return out
@@ -0,0 +1,167 @@
+"""
+Vazão do caminho de câmera, etapa por etapa, sem o jogo:
+
+  fonte -> flip -> cvtColor(BGR->RGB) -> Pose.process -> classificação
+
+Para cada combinação de resolução e model_complexity, lê N quadros da fonte
+(sintética, pasta de imagens ou vídeo — o mais rápido possível, arquivos já
+decodificados quando dá) e mede o tempo médio de cada etapa e os quadros por
+segundo do conjunto. Serve para escolher camera_size e
+camera_model_complexity na data/config.json sabendo o custo de cada um.
+
+Uso:
+  python -m game.camera_bench --source synthetic --frames 300 \\
+      --size 640x480 --size 320x240 --complexity 0 --complexity 1
+"""
+
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from game.frame_sources import open_source
+
+STAGES = ("read", "flip", "cvtColor", "pose", "classify")
+
+
+def parse_size(text):
+    """'640x480' -> (640, 480)."""
+    w, sep, h = text.lower().partition("x")
+    if not sep:
+        raise ValueError(f"tamanho inválido: {text!r} (esperado LARGURAxALTURA)")
+    return int(w), int(h)
+
+
+def bench(source="synthetic", size=(640, 480), complexity=0, frames=300, pose=True):
+    """
+    Mede 'frames' quadros de 'source' em 'size'. pose=False pula o
+    Pose.process (e a classificação, que depende dele). Retorna dict com ms
+    médios por etapa, fps total, quadros com pose e ações decididas.
+    """
+    from game.camera_control import landmarks_array
+    from game.gestures import GestureClassifier, config_options
+
+    w, h = size
+    cap = open_source(source, size, realtime=False)
+    model = None
+    if pose:
+        import mediapipe as mp
+
+        model = mp.solutions.pose.Pose(
+            model_complexity=complexity,
+            min_detection_confidence=0.6,
+            min_tracking_confidence=0.6,
+        )
+    # sem janela refratária: conta toda ação reconhecida
+    decider = GestureClassifier(refractory=0.0, **config_options())
+    frame = np.empty((h, w, 3), np.uint8)
+    flipped = np.empty_like(frame)
+    rgb = np.empty_like(frame)
+    totals = dict.fromkeys(STAGES, 0.0)
+    done = detected = actions = 0
+    clock = time.perf_counter
+    try:
+        t_start = clock()
+        while done < frames:
+            t0 = clock()
+            if not cap.read_into(frame):
+                break
+            t1 = clock()
+            cv2.flip(frame, 1, dst=flipped)
+            t2 = clock()
+            cv2.cvtColor(flipped, cv2.COLOR_BGR2RGB, dst=rgb)
+            t3 = clock()
+            lm = landmarks_array(model.process(rgb)) if model is not None else None
+            t4 = clock()
+            if lm is not None:
+                detected += 1
+                actions += decider.decide(lm, w, h, t0) is not None
+            t5 = clock()
+            for stage, dt in zip(STAGES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t5 - t4)):
+                totals[stage] += dt
+            done += 1
+        elapsed = clock() - t_start
+    finally:
+        if model is not None:
+            model.close()
+        cap.release()
+    n = max(done, 1)
+    return {
+        "size": size,
+        "complexity": complexity if pose else None,
+        "frames": done,
+        "fps": done / elapsed if elapsed > 0 else 0.0,
+        "ms": {stage: 1000.0 * totals[stage] / n for stage in STAGES},
+        "detected": detected,
+        "actions": actions,
+    }
+
+
+def format_table(rows):
+    header = f"{'tamanho':<10}{'modelo':>7}{'fps':>9}" + "".join(
+        f"{s + ' ms':>13}" for s in STAGES
+    )
+    lines = [header + f"{'com pose':>10}"]
+    for r in rows:
+        model = "-" if r["complexity"] is None else str(r["complexity"])
+        lines.append(
+            f"{'%dx%d' % r['size']:<10}{model:>7}{r['fps']:>9.1f}"
+            + "".join(f"{r['ms'][s]:>13.2f}" for s in STAGES)
+            + f"{r['detected']:>6}/{r['frames']}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vazão do caminho de câmera")
+    parser.add_argument(
+        "--source",
+        default="synthetic",
+        help='"synthetic", pasta de imagens, arquivo de vídeo ou índice da câmera',
+    )
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument(
+        "--size",
+        action="append",
+        dest="sizes",
+        metavar="LARGURAxALTURA",
+        help="resolução (repetível; padrão 640x480)",
+    )
+    parser.add_argument(
+        "--complexity",
+        action="append",
+        type=int,
+        choices=(0, 1, 2),
+        help="model_complexity do Pose (repetível; padrão 0)",
+    )
+    parser.add_argument(
+        "--no-pose",
+        action="store_true",
+        help="não roda o MediaPipe (mede só fonte, flip e cvtColor)",
+    )
+    args = parser.parse_args()
+
+    try:
+        sizes = [parse_size(s) for s in args.sizes or ["640x480"]]
+    except ValueError as e:
+        parser.error(str(e))
+    complexities = [0] if args.no_pose else args.complexity or [0]
+
+    rows = []
+    for size in sizes:
+        for complexity in complexities:
+            try:
+                rows.append(
+                    bench(args.source, size, complexity, args.frames, not args.no_pose)
+                )
+            except Exception as e:
+                # ex.: fonte inexistente ou modelo do MediaPipe indisponível
+                print(f"[camera_bench] {size[0]}x{size[1]} modelo {complexity}: {e}")
+    if not rows:
+        sys.exit(1)
+    print(f"[camera_bench] fonte {args.source!r}, {os.cpu_count()} CPU(s)")
+    print(format_table(rows))
@@ -1,78 +1,101 @@
+import time
+
 import cv2
 import numpy as np
 import mediapipe as mp
-import time
 
-
-class CameraController:
-    def __init__(self):
-        self.cap = cv2.VideoCapture(0)
-        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+from game.frame_sources import open_source
+from game.gestures import GestureClassifier, config_options
+from game.presence import PresenceDetector, presence_options
+
+# landmarks da pose: 33 pontos (x, y normalizados; z; visibility)
+N_LANDMARKS = 33
+
+
+def landmarks_array(result):
+    """Resultado do Pose.process -> array (33, 4) float32, ou None sem pose."""
+    if not result.pose_landmarks:
+        return None
+    return np.array(
+        [(p.x, p.y, p.z, p.visibility) for p in result.pose_landmarks.landmark],
+        dtype=np.float32,
+    )
+
+
+class CameraController(GestureClassifier):
+    def __init__(self, source=None, size=None, model_complexity=None, infer_fps=None):
+        """
+        source: índice da câmera, "synthetic", pasta de imagens ou vídeo
+        size: (largura, altura) dos quadros; model_complexity: 0, 1 ou 2
+        infer_fps: máximo de Pose.process por segundo (0 = todo quadro)
+        Omitidos, vêm da config (camera_source, camera_size,
+        camera_model_complexity, camera_fps). A detecção de presença
+        (presence_*) evita o Pose.process com ninguém na frente.
+        """
+        super().__init__(**config_options())
+        if None in (source, size, model_complexity, infer_fps):
+            from game.config import get_config
+
+            cfg = get_config()
+            source = cfg.get("camera_source", 0) if source is None else source
+            size = cfg.get("camera_size") if size is None else size
+            if model_complexity is None:
+                model_complexity = cfg.get("camera_model_complexity", 0)
+            if infer_fps is None:
+                infer_fps = cfg.get("camera_fps", 0)
+        self.infer_interval = 1.0 / infer_fps if infer_fps else 0.0
+        self._next_infer = 0.0
+        self.cap = open_source(source, size)
+        presence = presence_options()
+        self.presence = PresenceDetector(**presence) if presence else None
 
         self.pose = mp.solutions.pose.Pose(
-            model_complexity=0,
+            model_complexity=model_complexity,
             min_detection_confidence=0.6,
             min_tracking_confidence=0.6,
         )
 
-        self.last_action_time = 0
-        self.debounce = 0.35  # segundos
-        self.left_right_hist = []
-
     def get_action(self):
         ok, frame = self.cap.read()
         if not ok:
             return None
+        if self.presence is not None and not self.presence.update(frame):
+            # ninguém na frente: sem Pose.process
+            return None
+        if self.infer_interval:
+            # limite camera_fps: quadros entre inferências só passam
+            now = time.monotonic()
+            if now < self._next_infer:
+                return None
+            self._next_infer = max(self._next_infer + self.infer_interval, now)
 
         frame = cv2.flip(frame, 1)
         h, w = frame.shape[:2]
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         res = self.pose.process(rgb)
-        if not res.pose_landmarks:
+        lm = landmarks_array(res)
+        if lm is None:
             return None
-
-        lm = res.pose_landmarks.landmark
-        now = time.time()
-
-        def P(i):
-            return np.array([lm[i].x * w, lm[i].y * h])
-
-        lw, rw, nose = P(15), P(16), P(0)
-        lh, rh = P(23), P(24)
-        ls, rs = P(11), P(12)
-
-        mid_shoulder_x = (ls[0] + rs[0]) / 2
-        mid_hip_y = (lh[1] + rh[1]) / 2
-        head_y = nose[1]
-
-        jump = (lw[1] < head_y) and (rw[1] < head_y)
-        duck = (mid_hip_y - head_y) < h * 0.22
-
-        tilt = (mid_shoulder_x - w / 2) / (w * 0.5)
-        self.left_right_hist.append(tilt)
-        if len(self.left_right_hist) > 5:
-            self.left_right_hist.pop(0)
-        tilt_avg = float(np.mean(self.left_right_hist))
-
-        left = tilt_avg < -0.25
-        right = tilt_avg > 0.25
-
-        if now - self.last_action_time < self.debounce:
-            return None
-
-        action = None
-        if jump:
-            action = "JUMP"
-        elif duck:
-            action = "DUCK"
-        elif left:
-            action = "LEFT"
-        elif right:
-            action = "RIGHT"
-
-        if action:
-            self.last_action_time = now
-        return action
+        if self.presence is not None:
+            self.presence.keep_alive()
+        return self.decide(lm, w, h)
+
+    def set_infer_fps(self, fps):
+        """Muda o máximo de Pose.process por segundo (0 = todo quadro)."""
+        self.infer_interval = 1.0 / fps if fps else 0.0
+
+    @property
+    def present(self):
+        return self.presence.present if self.presence is not None else True
+
+    def check_presence(self):
+        """Lê um quadro só para a presença (menu/demo, sem Pose.process)."""
+        if self.presence is None:
+            return True
+        ok, frame = self.cap.read()
+        if ok:
+            self.presence.update(frame)
+        return self.presence.present
 
     def close(self):
         """Fecha os recursos da câmera e do MediaPipe com segurança."""
@@ -0,0 +1,575 @@
+"""
+Pipeline de câmera em processos separados, ligados por memória compartilhada.
+
+O Pose.process do MediaPipe segura o GIL por dezenas de ms; numa thread ele
+ainda rouba tempo do loop do pygame. Aqui nada disso roda no processo do jogo:
+
+  captura  --(FrameRing: N quadros BGR em shared_memory)-->  inferência
+  inferência --(ResultBlock: 33 landmarks + metadados)-->  jogo
+
+- captura: lê a fonte (game.frame_sources) direto para o próximo slot do
+  anel e publica o número de sequência do slot
+- inferência: pega sempre o quadro mais novo, lê o slot sem copiar (flip já
+  escreve no buffer RGB de trabalho), confere que o slot não foi sobrescrito
+  no meio da leitura e grava os landmarks no bloco de resultado
+- jogo: CameraPipeline.get_action() só lê o resultado mais recente (cópia de
+  33x4 floats) e classifica com o mesmo game.gestures do CameraController
+
+Leitor e escritor não usam lock: cada slot/resultado tem um contador no
+estilo seqlock (ímpar = escrevendo) e o leitor descarta o que mudou durante
+a leitura. close() tem a mesma semântica do CameraController.close(): pode
+ser chamado mais de uma vez, nunca levanta, encerra os processos e libera a
+memória compartilhada.
+
+Teste de carga sem câmera:
+  python -m game.camera_pipeline --stress --seconds 10 [--fps 0] [--size 640x480]
+"""
+
+import os
+import sys
+import time
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+N_LANDMARKS = 33
+DEFAULT_SHAPE = (480, 640)
+DEFAULT_SLOTS = 4
+# campos de ResultBlock.meta
+_SEQ, _FRAME, _CAPTURED, _DONE, _HAS_POSE, _W, _H, _INFER_MS, _PRESENT = range(9)
+_META_BYTES = 128
+
+
+def _attach(name):
+    """Abre um bloco criado pelo processo do jogo (que é quem faz o unlink)."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: o registro vai para o resource_tracker herdado do
+        # processo do jogo, o mesmo do dono — o unlink dele encerra o registro
+        return shared_memory.SharedMemory(name=name)
+
+
+class FrameRing:
+    """
+    Anel de 'slots' quadros (altura, largura, 3) uint8 em shared_memory.
+    seqs[0] é a sequência do último quadro publicado; seqs[1 + i] a do slot
+    i (-1 enquanto está sendo escrito); stamps[i] o instante da captura.
+    """
+
+    def __init__(self, shape=DEFAULT_SHAPE, slots=DEFAULT_SLOTS, name=None):
+        self.shape = (int(shape[0]), int(shape[1]), 3)
+        self.slots = int(slots)
+        frame_bytes = self.shape[0] * self.shape[1] * 3
+        self._hdr = 64 * ((16 * (self.slots + 1) + 63) // 64)
+        size = self._hdr + frame_bytes * self.slots
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = _attach(name)
+        buf = self.shm.buf
+        self.seqs = np.ndarray((self.slots + 1,), np.int64, buf, 0)
+        self.stamps = np.ndarray((self.slots,), np.float64, buf, 8 * (self.slots + 1))
+        self.frames = np.ndarray((self.slots,) + self.shape, np.uint8, buf, self._hdr)
+        if self.owner:
+            self.seqs[:] = -1
+            self.seqs[0] = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def begin_write(self, seq):
+        """Slot para o quadro 'seq' (marcado como em escrita)."""
+        slot = seq % self.slots
+        self.seqs[1 + slot] = -1
+        return self.frames[slot]
+
+    def publish(self, seq, stamp):
+        slot = seq % self.slots
+        self.stamps[slot] = stamp
+        self.seqs[1 + slot] = seq
+        self.seqs[0] = seq
+
+    def latest(self):
+        return int(self.seqs[0])
+
+    def slot_seq(self, seq):
+        return int(self.seqs[1 + seq % self.slots])
+
+    def close(self):
+        # as views numpy seguram o buffer; soltar antes de fechar
+        self.seqs = self.stamps = self.frames = None
+        try:
+            self.shm.close()
+        except Exception:
+            pass
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except Exception:
+                pass
+
+
+class ResultBlock:
+    """Último resultado da inferência: meta (float64 x 9) + landmarks (33, 4)."""
+
+    SIZE = _META_BYTES + N_LANDMARKS * 4 * 4
+
+    def __init__(self, name=None):
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=self.SIZE)
+        else:
+            self.shm = _attach(name)
+        self.meta = np.ndarray((_PRESENT + 1,), np.float64, self.shm.buf, 0)
+        self.landmarks = np.ndarray(
+            (N_LANDMARKS, 4), np.float32, self.shm.buf, _META_BYTES
+        )
+        if self.owner:
+            self.meta[:] = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write(self, frame_seq, captured, landmarks, w, h, infer_ms, present=True):
+        meta = self.meta
+        seq = int(meta[_SEQ])
+        meta[_SEQ] = seq + 1  # ímpar: escrevendo
+        meta[_FRAME] = frame_seq
+        meta[_CAPTURED] = captured
+        meta[_HAS_POSE] = landmarks is not None
+        if landmarks is not None:
+            self.landmarks[:] = landmarks
+        meta[_W], meta[_H] = w, h
+        meta[_INFER_MS] = infer_ms
+        meta[_PRESENT] = present
+        meta[_DONE] = time.monotonic()
+        meta[_SEQ] = seq + 2
+
+    def read(self, out, tries=4):
+        """
+        Copia o resultado para 'out' (array (33, 4)); devolve a cópia de
+        meta ou None se o escritor não saiu do caminho em 'tries' tentativas.
+        """
+        meta = self.meta
+        for _ in range(tries):
+            before = int(meta[_SEQ])
+            if before & 1:
+                continue
+            snap = meta.copy()
+            out[:] = self.landmarks
+            if int(meta[_SEQ]) == before:
+                return snap
+        return None
+
+    def close(self):
+        self.meta = self.landmarks = None
+        try:
+            self.shm.close()
+        except Exception:
+            pass
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except Exception:
+                pass
+
+
+# --- processos ---------------------------------------------------------------
+
+
+def _capture_main(source, ring_name, shape, slots, fps, stop, ready, stats):
+    from game.frame_sources import SyntheticSource, open_source
+
+    ring = FrameRing(shape, slots, name=ring_name)
+    h, w = ring.shape[:2]
+    if source == "synthetic":
+        cap = SyntheticSource((w, h), fps)
+    else:
+        cap = open_source(source, (w, h))
+    seq = ring.latest()
+    try:
+        while not stop.is_set():
+            # a fonte escreve direto no slot (redimensiona se preciso)
+            if not cap.read_into(ring.begin_write(seq + 1)):
+                time.sleep(0.01)
+                continue
+            seq += 1
+            ring.publish(seq, time.monotonic())
+            stats[0] = seq
+            ready.set()
+    finally:
+        cap.release()
+        ring.close()
+
+
+def _inference_main(
+    ring_name,
+    result_name,
+    shape,
+    slots,
+    pose_kwargs,
+    presence_kwargs,
+    idle_fps,
+    infer_fps,
+    stop,
+    ready,
+    stats,
+):
+    import cv2
+
+    from game.presence import PresenceDetector
+
+    ring = FrameRing(shape, slots, name=ring_name)
+    result = ResultBlock(name=result_name)
+    h, w = ring.shape[:2]
+    flipped = np.empty(ring.shape, np.uint8)
+    rgb = np.empty(ring.shape, np.uint8)
+    pose = None
+    presence = None
+    if presence_kwargs is not None:
+        presence = PresenceDetector(**presence_kwargs)
+    idle_interval = 1.0 / idle_fps if idle_fps else 0.0
+    next_infer = 0.0
+    try:
+        if pose_kwargs is not None:
+            import mediapipe as mp
+
+            from game.camera_control import landmarks_array
+
+            pose = mp.solutions.pose.Pose(**pose_kwargs)
+        done = 0
+        while not stop.is_set():
+            if not ready.wait(0.1):
+                continue
+            ready.clear()
+            # infer_fps é compartilhado: o jogo pode mudar o ritmo (governador)
+            rate = infer_fps.value
+            if rate:
+                # limite camera_fps: espera a vez e usa o quadro mais novo
+                wait = next_infer - time.monotonic()
+                if wait > 0 and stop.wait(wait):
+                    break
+                next_infer = max(next_infer + 1.0 / rate, time.monotonic())
+            seq = ring.latest()
+            if seq <= done:
+                continue
+            captured = ring.stamps[seq % ring.slots]
+            slot = ring.frames[seq % ring.slots]
+            present = presence is None or presence.update(slot, captured)
+            if not present:
+                # ninguém na frente: sem Pose.process, e checando a presença
+                # só 'idle_fps' vezes por segundo
+                if ring.slot_seq(seq) == seq:
+                    result.write(seq, captured, None, w, h, 0.0, present=False)
+                    stats[3] += 1
+                done = seq
+                stop.wait(idle_interval)
+                continue
+            # leitura direta do slot (sem cópia extra)
+            cv2.flip(slot, 1, dst=flipped)
+            if ring.slot_seq(seq) != seq:
+                # a captura deu a volta no anel durante a leitura
+                stats[1] += 1
+                continue
+            cv2.cvtColor(flipped, cv2.COLOR_BGR2RGB, dst=rgb)
+            t0 = time.perf_counter()
+            # sem modelo (pose_kwargs None): só o transporte é medido
+            lm = landmarks_array(pose.process(rgb)) if pose is not None else None
+            infer_ms = (time.perf_counter() - t0) * 1000.0
+            if lm is not None and presence is not None:
+                presence.keep_alive(captured)
+            result.write(seq, captured, lm, w, h, infer_ms)
+            stats[2] += 1
+            done = seq
+    finally:
+        if pose is not None:
+            try:
+                pose.close()
+            except Exception:
+                pass
+        ring.close()
+        result.close()
+
+
+# --- lado do jogo ------------------------------------------------------------
+
+
+class CameraPipeline:
+    def __init__(
+        self,
+        source=0,
+        shape=DEFAULT_SHAPE,
+        slots=DEFAULT_SLOTS,
+        fps=30,
+        pose_kwargs=None,
+        pose=True,
+        presence_kwargs=None,
+        idle_fps=10,
+        infer_fps=0,
+    ):
+        """
+        source: índice da câmera, "synthetic", pasta de imagens ou vídeo
+            (game.frame_sources.open_source)
+        shape: (altura, largura) dos quadros no anel (a captura redimensiona)
+        slots: quadros no anel (folga para a inferência ler sem ser atropelada)
+        fps: ritmo da fonte sintética (0 = o mais rápido possível)
+        pose: False pula o Pose.process (teste do transporte, sem modelo)
+        presence_kwargs: liga o game.presence.PresenceDetector (None = sempre
+            presente); sem ninguém na frente não há Pose.process e a presença
+            é checada só 'idle_fps' vezes por segundo
+        infer_fps: máximo de Pose.process por segundo (0 = todo quadro)
+        Os processos sobem em segundo plano; até o primeiro resultado
+        get_action() devolve None.
+        """
+        from game.gestures import GestureClassifier, config_options
+
+        self.decider = GestureClassifier(**config_options())
+        self.ring = FrameRing(shape, slots)
+        self.result = ResultBlock()
+        self._landmarks = np.zeros((N_LANDMARKS, 4), np.float32)
+        self._last_seq = 0
+        self.last_meta = None
+        # spawn: não herdar o estado do SDL/pygame do processo do jogo
+        ctx = multiprocessing.get_context("spawn")
+        self._stop = ctx.Event()
+        # referência guardada: Process.start() solta os args, e um Event
+        # coletado apaga o semáforo antes de o processo filho abri-lo
+        self._ready = ready = ctx.Event()
+        self.infer_fps = ctx.Value("d", infer_fps or 0, lock=False)
+        # [quadros capturados, atropelados, inferências, quadros ociosos]
+        self.stats = ctx.Array("q", 4, lock=False)
+        if pose:
+            pose_kwargs = pose_kwargs or {
+                "model_complexity": 0,
+                "min_detection_confidence": 0.6,
+                "min_tracking_confidence": 0.6,
+            }
+        else:
+            pose_kwargs = None
+        self._procs = [
+            ctx.Process(
+                target=_capture_main,
+                args=(source, self.ring.name, shape, slots, fps)
+                + (self._stop, ready, self.stats),
+                name="camera-capture",
+                daemon=True,
+            ),
+            ctx.Process(
+                target=_inference_main,
+                args=(self.ring.name, self.result.name, shape, slots, pose_kwargs)
+                + (presence_kwargs, idle_fps, self.infer_fps)
+                + (self._stop, ready, self.stats),
+                name="camera-pose",
+                daemon=True,
+            ),
+        ]
+        for proc in self._procs:
+            proc.start()
+
+    def latest(self):
+        """
+        (landmarks (33, 4), meta) do resultado mais novo ainda não lido, ou
+        None. Os landmarks vêm num buffer reaproveitado: copie para guardar.
+        """
+        if self.result is None:
+            return None
+        if int(self.result.meta[_SEQ]) == self._last_seq:
+            return None
+        meta = self.result.read(self._landmarks)
+        if meta is None:
+            return None
+        self._last_seq = int(meta[_SEQ])
+        self.last_meta = meta
+        if not meta[_HAS_POSE]:
+            return None
+        return self._landmarks, meta
+
+    def get_action(self):
+        """Mesmo contrato do CameraController.get_action (não bloqueia)."""
+        res = self.latest()
+        if res is None:
+            return None
+        lm, meta = res
+        # instante da captura: o filtro usa o intervalo real entre quadros
+        return self.decider.decide(lm, meta[_W], meta[_H], meta[_CAPTURED])
+
+    @property
+    def present(self):
+        """Alguém na frente da câmera, pelo último quadro processado."""
+        if self.result is None:
+            return False
+        return bool(self.result.meta[_PRESENT])
+
+    def check_presence(self):
+        """Mesmo contrato do CameraController.check_presence (não bloqueia)."""
+        return self.present
+
+    def set_infer_fps(self, fps):
+        """Muda o máximo de Pose.process por segundo (0 = todo quadro)."""
+        self.infer_fps.value = fps or 0
+
+    def reset(self):
+        """Recomeça filtro, histerese e janelas do classificador (nova rodada)."""
+        self.decider.reset()
+
+    def close(self, timeout=2.0):
+        """Encerra captura e inferência e libera a memória compartilhada."""
+        procs, self._procs = getattr(self, "_procs", []), []
+        try:
+            self._stop.set()
+        except Exception:
+            pass
+        deadline = time.monotonic() + timeout
+        for proc in procs:
+            try:
+                proc.join(max(0.0, deadline - time.monotonic()))
+                if proc.is_alive():
+                    proc.terminate()
+                    proc.join(0.5)
+            except Exception:
+                pass
+        for block in ("ring", "result"):
+            obj = getattr(self, block, None)
+            if obj is not None:
+                obj.close()
+                setattr(self, block, None)
+
+
+def open_camera(mode=None):
+    """
+    Controle por câmera conforme a config "camera_mode": "process" (padrão,
+    CameraPipeline) ou "inline" (CameraController no processo do jogo).
+    """
+    if mode is None:
+        from game.config import get_config
+
+        mode = get_config().get("camera_mode", "process")
+    if mode == "inline":
+        from game.camera_control import CameraController
+
+        return CameraController()
+    from game.config import get_config
+    from game.presence import presence_options
+
+    cfg = get_config()
+    w, h = cfg.get("camera_size", [640, 480])
+    return CameraPipeline(
+        cfg.get("camera_source", 0),
+        shape=(h, w),
+        pose_kwargs={
+            "model_complexity": cfg.get("camera_model_complexity", 0),
+            "min_detection_confidence": 0.6,
+            "min_tracking_confidence": 0.6,
+        },
+        presence_kwargs=presence_options(),
+        infer_fps=cfg.get("camera_fps", 0),
+    )
+
+
+def stress(
+    seconds=10.0, shape=DEFAULT_SHAPE, slots=DEFAULT_SLOTS, fps=0, tick=60, pose=True
+):
+    """
+    Roda o pipeline com quadros sintéticos e um "loop do jogo" a 'tick' Hz
+    chamando get_action(); mede vazão, atraso e o custo no loop, e confere
+    que close() encerra tudo. Retorna dict com as métricas.
+    """
+    pipe = CameraPipeline("synthetic", shape=shape, slots=slots, fps=fps, pose=pose)
+    ring_name, result_name = pipe.ring.name, pipe.result.name
+    procs = list(pipe._procs)
+    costs, lags = [], []
+    t_end = time.monotonic() + seconds
+    frame = 1.0 / tick
+    next_t = time.monotonic()
+    started = None
+    while time.monotonic() < t_end:
+        last = pipe._last_seq
+        t0 = time.perf_counter()
+        res = pipe.latest()
+        if res is not None:
+            pipe.decider.decide(res[0], res[1][_W], res[1][_H], res[1][_CAPTURED])
+        costs.append(time.perf_counter() - t0)
+        meta = pipe.last_meta
+        if pipe._last_seq != last:
+            if started is None:
+                # vazão medida a partir do primeiro resultado (sem a subida)
+                started = (time.monotonic(), pipe.stats[0], pipe.stats[2])
+            lags.append(meta[_DONE] - meta[_CAPTURED])
+        next_t += frame
+        time.sleep(max(0.0, next_t - time.monotonic()))
+    now = time.monotonic()
+    captured, torn, inferred = pipe.stats[0], pipe.stats[1], pipe.stats[2]
+    pipe.close()
+
+    leaked = []
+    for name in (ring_name, result_name):
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+            leaked.append(name)
+            shm.close()
+        except FileNotFoundError:
+            pass
+    costs.sort()
+    lags.sort()
+    span = now - started[0] if started else 0.0
+    return {
+        "captured": captured,
+        "inferred": inferred,
+        "torn": torn,
+        "capture_fps": (captured - started[1]) / span if span else 0.0,
+        "inference_fps": (inferred - started[2]) / span if span else 0.0,
+        "lag_ms_p50": 1000 * lags[len(lags) // 2] if lags else None,
+        "loop_us_p50": 1e6 * costs[len(costs) // 2] if costs else None,
+        "loop_us_max": 1e6 * costs[-1] if costs else None,
+        "processes_alive": any(p.is_alive() for p in procs),
+        "leaked_blocks": leaked,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pipeline de câmera em processos")
+    parser.add_argument("--stress", action="store_true", help="fonte sintética")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--fps", type=float, default=0, help="0 = sem limite")
+    parser.add_argument("--size", default="640x480")
+    parser.add_argument("--slots", type=int, default=DEFAULT_SLOTS)
+    parser.add_argument(
+        "--no-pose",
+        action="store_true",
+        help="não roda o MediaPipe (mede só captura + memória compartilhada)",
+    )
+    args = parser.parse_args()
+
+    w, h = (int(v) for v in args.size.lower().split("x"))
+    if not args.stress:
+        parser.error("por enquanto só o modo --stress (fonte sintética)")
+    r = stress(args.seconds, (h, w), args.slots, args.fps, pose=not args.no_pose)
+    print(
+        f"[camera_pipeline] {args.size}, {args.slots} slots, {os.cpu_count()} CPU(s):"
+        f" captura {r['capture_fps']:.0f} fps, inferência {r['inference_fps']:.1f}"
+        f" fps ({r['torn']} quadro(s) atropelado(s))"
+    )
+    lag = r["lag_ms_p50"]
+    print(
+        f"[camera_pipeline] atraso captura->resultado p50" f" {lag:.1f} ms"
+        if lag is not None
+        else "[camera_pipeline] sem resultados"
+    )
+    print(
+        f"[camera_pipeline] custo no loop do jogo: p50 {r['loop_us_p50']:.0f} µs,"
+        f" máx {r['loop_us_max']:.0f} µs"
+    )
+    ok = not r["processes_alive"] and not r["leaked_blocks"] and r["inferred"] > 0
+    print(
+        "[camera_pipeline] encerramento limpo"
+        if ok
+        else f"[camera_pipeline] FALHA: {r}"
+    )
+    sys.exit(0 if ok else 1)
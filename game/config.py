@@ -0,0 +1,340 @@
+"""
+Serviço único de configuração (data/config.json).
+
+- lê e valida o arquivo uma vez e mantém o resultado em memória
+- acompanha o mtime do arquivo: edições externas são recarregadas sozinhas
+  (no máximo uma checagem por check_interval segundos) e avisam os ouvintes
+- set() altera o cache e agenda a gravação (debounce); a gravação é atômica
+  (arquivo temporário + os.replace) e flush() força a escrita imediata
+- concentra os parâmetros de jogabilidade ("gameplay") que antes eram fixos
+  no código: velocidade, spawn, lanes, física do pulo e curva de dificuldade
+"""
+
+import os
+import copy
+import json
+import time
+import atexit
+import threading
+
+from game.settings import GROUND_Y, LANES, OBSTACLE_SIZE, PLAYER_SIZE
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "config.json")
+
+DEFAULT_GAMEPLAY = {
+    "speed": 220,  # deslocamento dos obstáculos (pixels/seg)
+    "spawn_interval": 1.2,  # intervalo base entre spawns (segundos)
+    "spawn_jitter": 1.6,  # próximo spawn sorteado em [base, base * jitter]
+    # lanes, chão e tamanhos derivados do layout do canvas lógico (settings)
+    "lanes": list(LANES),  # centro x de cada lane
+    "jump_velocity": -16,  # velocidade inicial do pulo (pixels/frame)
+    "gravity": 1.0,  # incremento de velocidade por frame
+    "ground_y": GROUND_Y,  # base (bottom) do player no chão
+    "player_size": list(PLAYER_SIZE),
+    "obstacle_size": list(OBSTACLE_SIZE),
+    # "classic" (um obstáculo por vez) ou "patterns" (game.patterns)
+    "spawn_mode": "patterns",
+    "ramp_time": 90,  # segundos até a dificuldade máxima
+    "ramp_evades": 150,  # ou desvios até a dificuldade máxima
+    "max_speed_scale": 1.8,  # velocidade na dificuldade máxima (x speed)
+    "max_density_scale": 2.0,  # densidade de obstáculos na dificuldade máxima
+    "switch_time": 0.3,  # tempo de reação por troca de lane (checagem)
+    "slide_time": 0.6,  # duração do deslize (segundos)
+    "slide_height": 0.5,  # altura do jogador deslizando (fração da normal)
+}
+
+DEFAULTS = {
+    "characters": {},
+    "selected": None,
+    "max_collisions": 10,
+    "points_per_evade": 10,
+    "score_backend": "json",
+    "camera_mode": "process",
+    "camera_source": 0,  # índice da câmera, "synthetic", pasta ou vídeo
+    "camera_size": [640, 480],
+    "camera_model_complexity": 0,
+    "camera_filter": "one_euro",  # filtro dos landmarks (game.pose_filters)
+    "camera_filter_params": {},  # ex.: {"min_cutoff": 1.0, "beta": 3.0}
+    "presence_detection": True,  # sem ninguém na câmera: sem Pose.process
+    "presence_timeout": 10.0,  # segundos sem movimento até "ninguém"
+    "attract_delay": 30.0,  # segundos ocioso e sem ninguém até a demo
+    # preset de qualidade (game.quality): null = calibrar no próximo início
+    "quality_preset": None,
+    "camera_fps": 0,  # inferências por segundo (0 = todo quadro)
+    "target_fps": 60,  # quadros por segundo da rodada (a simulação fica em FPS)
+    "smooth_scale": True,  # smoothscale (qualidade) ou scale (rápido) nos assets
+    # janela (game.display): null = tamanho do canvas lógico WIDTHxHEIGHT
+    "display_size": None,
+    "fullscreen": False,  # tela cheia na resolução do monitor
+    "display_smooth": False,  # smoothscale ao ampliar o canvas (mais caro)
+    "render_backend": "surface",  # "surface" (blits) ou "sdl2" (texturas)
+    # fundo rolando (game.scroll): fator do deslocamento dos obstáculos
+    "road_scroll": 1.0,  # 0 = estrada parada
+    "parallax_layers": [],  # ex.: [{"image": "nuvens", "factor": 0.3}]
+    "gameplay": DEFAULT_GAMEPLAY,
+}
+
+
+def _is_number(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _is_size(v):
+    return (
+        isinstance(v, (list, tuple))
+        and len(v) == 2
+        and all(isinstance(x, int) and x > 0 for x in v)
+    )
+
+
+def _is_layer(v):
+    return (
+        isinstance(v, dict)
+        and isinstance(v.get("image"), str)
+        and _is_number(v.get("factor", 0.5))
+        and isinstance(v.get("mirror", True), bool)
+    )
+
+
+# chave -> (validador, descrição para a mensagem de erro)
+SCHEMA = {
+    "characters": (
+        lambda v: isinstance(v, dict)
+        and all(isinstance(k, str) and isinstance(p, str) for k, p in v.items()),
+        "objeto nome -> pasta",
+    ),
+    "selected": (lambda v: v is None or isinstance(v, str), "texto"),
+    "max_collisions": (lambda v: isinstance(v, int) and v > 0, "inteiro > 0"),
+    "points_per_evade": (lambda v: isinstance(v, int) and v >= 0, "inteiro >= 0"),
+    "score_backend": (lambda v: v in ("json", "sqlite"), '"json" ou "sqlite"'),
+    "camera_mode": (
+        lambda v: v in ("process", "inline"),
+        '"process" ou "inline"',
+    ),
+    "camera_source": (
+        lambda v: (isinstance(v, int) and not isinstance(v, bool) and v >= 0)
+        or (isinstance(v, str) and v != ""),
+        'índice >= 0, "synthetic" ou caminho',
+    ),
+    "camera_size": (_is_size, "[w, h] inteiros > 0"),
+    "camera_model_complexity": (lambda v: v in (0, 1, 2), "0, 1 ou 2"),
+    "camera_filter": (
+        lambda v: v in ("one_euro", "kalman", "mean", "none"),
+        '"one_euro", "kalman", "mean" ou "none"',
+    ),
+    "camera_filter_params": (
+        lambda v: isinstance(v, dict)
+        and all(isinstance(k, str) and _is_number(x) for k, x in v.items()),
+        "objeto nome -> número",
+    ),
+    "presence_detection": (lambda v: isinstance(v, bool), "true ou false"),
+    "presence_timeout": (lambda v: _is_number(v) and v > 0, "número > 0"),
+    "attract_delay": (lambda v: _is_number(v) and v > 0, "número > 0"),
+    "quality_preset": (
+        lambda v: v in (None, "low", "medium", "high", "custom"),
+        'null, "low", "medium", "high" ou "custom"',
+    ),
+    "camera_fps": (lambda v: _is_number(v) and v >= 0, "número >= 0"),
+    "target_fps": (lambda v: isinstance(v, int) and v > 0, "inteiro > 0"),
+    "smooth_scale": (lambda v: isinstance(v, bool), "true ou false"),
+    "display_size": (lambda v: v is None or _is_size(v), "null ou [w, h] inteiros > 0"),
+    "fullscreen": (lambda v: isinstance(v, bool), "true ou false"),
+    "display_smooth": (lambda v: isinstance(v, bool), "true ou false"),
+    "render_backend": (lambda v: v in ("surface", "sdl2"), '"surface" ou "sdl2"'),
+    "road_scroll": (lambda v: _is_number(v) and v >= 0, "número >= 0"),
+    "parallax_layers": (
+        lambda v: isinstance(v, list) and all(_is_layer(x) for x in v),
+        'lista de {"image": nome, "factor": número, "mirror": true/false}',
+    ),
+}
+
+GAMEPLAY_SCHEMA = {
+    "speed": (lambda v: _is_number(v) and v > 0, "número > 0"),
+    "spawn_interval": (lambda v: _is_number(v) and v > 0, "número > 0"),
+    "spawn_jitter": (lambda v: _is_number(v) and v >= 1, "número >= 1"),
+    "lanes": (
+        lambda v: isinstance(v, list) and len(v) >= 1 and all(_is_number(x) for x in v),
+        "lista de números",
+    ),
+    "jump_velocity": (lambda v: _is_number(v) and v < 0, "número < 0"),
+    "gravity": (lambda v: _is_number(v) and v > 0, "número > 0"),
+    "ground_y": (lambda v: _is_number(v) and v > 0, "número > 0"),
+    "player_size": (_is_size, "[w, h] inteiros > 0"),
+    "obstacle_size": (_is_size, "[w, h] inteiros > 0"),
+    "spawn_mode": (lambda v: v in ("classic", "patterns"), '"classic" ou "patterns"'),
+    "ramp_time": (lambda v: _is_number(v) and v > 0, "número > 0"),
+    "ramp_evades": (lambda v: isinstance(v, int) and v > 0, "inteiro > 0"),
+    "max_speed_scale": (lambda v: _is_number(v) and v >= 1, "número >= 1"),
+    "max_density_scale": (lambda v: _is_number(v) and v >= 1, "número >= 1"),
+    "switch_time": (lambda v: _is_number(v) and v > 0, "número > 0"),
+    "slide_time": (lambda v: _is_number(v) and v > 0, "número > 0"),
+    "slide_height": (lambda v: _is_number(v) and 0 < v <= 1, "número em (0, 1]"),
+}
+
+
+def validate(raw):
+    """
+    Valida 'raw' contra SCHEMA/GAMEPLAY_SCHEMA. Valores inválidos ou ausentes
+    viram o padrão; chaves desconhecidas são preservadas.
+    Retorna (config_normalizada, lista_de_erros).
+    """
+    errors = []
+    if not isinstance(raw, dict):
+        return copy.deepcopy(DEFAULTS), ["config não é um objeto JSON"]
+    cfg = copy.deepcopy(raw)
+    for key, (ok, desc) in SCHEMA.items():
+        if key not in cfg:
+            cfg[key] = copy.deepcopy(DEFAULTS[key])
+        elif not ok(cfg[key]):
+            errors.append(f"{key}: esperado {desc}, recebido {cfg[key]!r}")
+            cfg[key] = copy.deepcopy(DEFAULTS[key])
+
+    gp = cfg.get("gameplay")
+    if not isinstance(gp, dict):
+        if gp is not None:
+            errors.append(f"gameplay: esperado objeto, recebido {gp!r}")
+        gp = {}
+    merged = copy.deepcopy(DEFAULT_GAMEPLAY)
+    for key, value in gp.items():
+        check = GAMEPLAY_SCHEMA.get(key)
+        if check is None:
+            merged[key] = value
+        elif check[0](value):
+            merged[key] = value
+        else:
+            errors.append(f"gameplay.{key}: esperado {check[1]}, recebido {value!r}")
+    cfg["gameplay"] = merged
+    return cfg, errors
+
+
+class ConfigService:
+    def __init__(self, path=None, debounce=0.5, check_interval=1.0):
+        """
+        path: arquivo de configuração (padrão data/config.json)
+        debounce: segundos entre o último set() e a gravação em disco
+        check_interval: intervalo mínimo entre checagens de mtime
+        """
+        self.path = path or CONFIG_PATH
+        self.debounce = debounce
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._data = None
+        self._raw = None
+        self._mtime = None
+        self._last_check = 0.0
+        self._timer = None
+        self._listeners = []
+        self.reload()
+        atexit.register(self.flush)
+
+    # --- leitura -----------------------------------------------------------
+
+    def _stat_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def reload(self):
+        """Relê e valida o arquivo (mantém o cache anterior se a leitura falhar)."""
+        with self._lock:
+            mtime = self._stat_mtime()
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    raw = json.load(f)
+            except Exception as e:
+                print(f"[config] falha ao ler {self.path!r}: {e}")
+                if self._data is None:
+                    self._raw, self._data = {}, copy.deepcopy(DEFAULTS)
+                self._mtime = mtime
+                return False
+            data, errors = validate(raw)
+            for err in errors:
+                print(f"[config] valor inválido, usando padrão — {err}")
+            changed = self._data is not None and data != self._data
+            self._raw, self._data, self._mtime = raw, data, mtime
+        if changed:
+            self._notify()
+        return True
+
+    def reload_if_changed(self, force=False):
+        """Recarrega se o mtime mudou. Retorna True se recarregou."""
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+        with self._lock:
+            # gravação pendente nossa tem prioridade sobre o arquivo
+            if self._timer is not None:
+                return False
+            if self._stat_mtime() == self._mtime:
+                return False
+        return self.reload()
+
+    @property
+    def data(self):
+        """Config validada (dict compartilhado; use set() para alterar)."""
+        self.reload_if_changed()
+        return self._data
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def gameplay(self):
+        """Parâmetros de jogabilidade já mesclados com os padrões."""
+        return self.data["gameplay"]
+
+    # --- ouvintes ----------------------------------------------------------
+
+    def add_listener(self, fn):
+        """fn(config) é chamado quando o arquivo muda em disco."""
+        self._listeners.append(fn)
+
+    def _notify(self):
+        for fn in list(self._listeners):
+            try:
+                fn(self._data)
+            except Exception as e:
+                print(f"[config] ouvinte falhou: {e}")
+
+    # --- escrita -----------------------------------------------------------
+
+    def set(self, key, value):
+        """Altera 'key' em memória e agenda a gravação (debounce)."""
+        with self._lock:
+            self._raw[key] = value
+            self._data, _ = validate(self._raw)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Grava já as alterações pendentes (tmp + rename atômico)."""
+        with self._lock:
+            if self._timer is None:
+                return
+            self._timer.cancel()
+            self._timer = None
+            tmp = self.path + ".tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(self._raw, f, indent=4, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+                self._mtime = self._stat_mtime()
+            except Exception as e:
+                print(f"[config] falha ao gravar {self.path!r}: {e}")
+
+
+_service = None
+
+
+def get_config():
+    """Instância compartilhada do ConfigService."""
+    global _service
+    if _service is None:
+        _service = ConfigService()
+    return _service
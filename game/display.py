@@ -0,0 +1,250 @@
+"""
+Janela do jogo e apresentação do canvas lógico.
+
+Todo o jogo desenha no canvas lógico WIDTH x HEIGHT (game.settings), sempre
+nas mesmas coordenadas, e present() entrega o quadro à janela — de qualquer
+tamanho, inclusive tela cheia 1080p/4K. Dois backends (config
+render_backend):
+
+- "surface" (Display, padrão e fallback): blits de Surface; o canvas inteiro
+  é escalado (mantendo a proporção, com faixas pretas) direto numa
+  subsurface da janela calculada uma vez na abertura — uma transformação por
+  quadro, nenhum sprite escalado. Com a janela do tamanho do canvas, o
+  canvas é a própria janela e present() é só o flip.
+- "sdl2" (TextureDisplay, pygame._sdl2.video): Renderer com logical_size;
+  o SDL escala e põe as faixas. A rodada desenha pela cena (begin, draw,
+  draw_sprites): cada Surface (estrada, quadros de animação, textos do HUD)
+  vira Texture uma vez, em cache enquanto a Surface existir — trate-as como
+  imutáveis depois de desenhadas. Telas que desenham no canvas (menu, popup,
+  demo) sobem o canvas inteiro numa textura de streaming por quadro. Com
+  driver acelerado, a rodada não faz nenhum blit na CPU.
+
+Config: display_size (null = tamanho do canvas; [w, h] = janela), fullscreen
+(tela cheia na resolução do monitor), display_smooth (filtro suave na
+ampliação) e render_backend.
+"""
+
+import os
+import weakref
+
+import pygame
+
+from game.settings import BG_COLOR, WIDTH, HEIGHT
+
+LETTERBOX_COLOR = (0, 0, 0)
+
+_current = None
+
+
+class Display:
+    textured = False
+
+    def __init__(self, size=None, fullscreen=False, smooth=False, caption=None):
+        """
+        size: (largura, altura) da janela (padrão: o canvas lógico; em tela
+            cheia, a resolução do monitor)
+        smooth: smoothscale na apresentação (melhor, mais caro)
+        """
+        if fullscreen:
+            self.window = pygame.display.set_mode(
+                tuple(size) if size else (0, 0), pygame.FULLSCREEN
+            )
+        else:
+            self.window = pygame.display.set_mode(tuple(size or (WIDTH, HEIGHT)))
+        if caption:
+            pygame.display.set_caption(caption)
+        self.smooth = smooth
+        ww, wh = self.window.get_size()
+        scale = min(ww / WIDTH, wh / HEIGHT)
+        w, h = max(1, round(WIDTH * scale)), max(1, round(HEIGHT * scale))
+        self.rect = pygame.Rect((ww - w) // 2, (wh - h) // 2, w, h)
+        if self.rect.size == (WIDTH, HEIGHT):
+            # mesmo tamanho: desenha direto na janela (centralizado se sobrar)
+            self.window.fill(LETTERBOX_COLOR)
+            self.canvas = self.window.subsurface(self.rect)
+            self._target = None
+        else:
+            self.canvas = pygame.Surface((WIDTH, HEIGHT)).convert(self.window)
+            self.window.fill(LETTERBOX_COLOR)
+            self._target = self.window.subsurface(self.rect)
+            if smooth and self.canvas.get_bitsize() not in (24, 32):
+                self.smooth = False
+
+    @property
+    def scaled(self):
+        return self._target is not None
+
+    @property
+    def target(self):
+        """
+        Área da janela onde o quadro aparece (o próprio canvas se não há
+        escala). Quem desenha ali direto (ScaledCanvas) termina com flip().
+        """
+        return self.canvas if self._target is None else self._target
+
+    # --- cena (rodada): no backend de Surface, blits no canvas -------------
+
+    def begin(self, background=None, color=BG_COLOR):
+        """
+        Começa um quadro: fundo (Surface do tamanho do canvas) ou cor; sem
+        nenhum dos dois (fundo desenhado depois, ex. game.scroll), nada.
+        """
+        if background is not None:
+            self.canvas.blit(background, (0, 0))
+        elif color is not None:
+            self.canvas.fill(color)
+
+    def draw(self, surf, pos):
+        self.canvas.blit(surf, pos)
+
+    def draw_sprites(self, sprites):
+        blit = self.canvas.blit
+        for spr in sprites:
+            blit(spr.image, spr.rect)
+
+    def present(self):
+        """Escala o canvas para a janela (se preciso) e mostra o quadro."""
+        if self._target is not None:
+            if self.smooth:
+                pygame.transform.smoothscale(self.canvas, self.rect.size, self._target)
+            else:
+                pygame.transform.scale(self.canvas, self.rect.size, self._target)
+        pygame.display.flip()
+
+    def flip(self):
+        """Mostra o quadro já desenhado em target, sem passar pelo canvas."""
+        pygame.display.flip()
+
+    def to_logical(self, pos):
+        """Posição na janela (eventos de mouse) -> coordenadas do canvas."""
+        x = (pos[0] - self.rect.x) * WIDTH / self.rect.w
+        y = (pos[1] - self.rect.y) * HEIGHT / self.rect.h
+        return int(x), int(y)
+
+
+class TextureDisplay:
+    textured = True
+    scaled = True
+
+    def __init__(self, size=None, fullscreen=False, smooth=False, caption=None):
+        from pygame._sdl2.video import Renderer, Texture, Window
+
+        # filtro da ampliação das texturas (lido pelo SDL ao criá-las)
+        os.environ["SDL_RENDER_SCALE_QUALITY"] = "1" if smooth else "0"
+        # janela do módulo display escondida: convert()/convert_alpha() dos
+        # assets precisam de um modo de vídeo (ela não aceita Renderer)
+        pygame.display.set_mode((1, 1), pygame.HIDDEN)
+        if fullscreen and not size:
+            self.window = Window(caption or "", fullscreen_desktop=True)
+        else:
+            self.window = Window(
+                caption or "",
+                size=tuple(size or (WIDTH, HEIGHT)),
+                fullscreen=fullscreen,
+            )
+        self.renderer = Renderer(self.window, accelerated=-1, vsync=False)
+        # escala e faixas pelo SDL; eventos de mouse já chegam em coordenadas
+        # lógicas
+        self.renderer.logical_size = (WIDTH, HEIGHT)
+        self._Texture = Texture
+        self.canvas = pygame.Surface((WIDTH, HEIGHT)).convert()
+        self._canvas_tex = Texture(self.renderer, (WIDTH, HEIGHT), streaming=True)
+        self._textures = weakref.WeakKeyDictionary()
+        self._direct = False
+
+    def _texture(self, surf):
+        tex = self._textures.get(surf)
+        if tex is None:
+            tex = self._Texture.from_surface(self.renderer, surf)
+            self._textures[surf] = tex
+        return tex
+
+    def begin(self, background=None, color=BG_COLOR):
+        self._direct = True
+        r = self.renderer
+        r.draw_color = LETTERBOX_COLOR + (255,)
+        r.clear()
+        if background is not None:
+            self._texture(background).draw(dstrect=(0, 0, WIDTH, HEIGHT))
+        elif color is not None:
+            r.draw_color = tuple(color) + (255,)
+            r.fill_rect((0, 0, WIDTH, HEIGHT))
+
+    def draw(self, surf, pos):
+        w, h = surf.get_size()
+        self._texture(surf).draw(dstrect=(pos[0], pos[1], w, h))
+
+    def draw_sprites(self, sprites):
+        for spr in sprites:
+            self._texture(spr.image).draw(dstrect=spr.rect)
+
+    def present(self):
+        r = self.renderer
+        if not self._direct:
+            # quadro desenhado no canvas (menu, popup, demo): sobe inteiro
+            self._canvas_tex.update(self.canvas)
+            r.draw_color = LETTERBOX_COLOR + (255,)
+            r.clear()
+            self._canvas_tex.draw()
+        r.present()
+        self._direct = False
+        # a janela escondida do módulo display impede o SDL de gerar QUIT ao
+        # fechar a janela visível
+        if pygame.event.peek(pygame.WINDOWCLOSE):
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    def to_logical(self, pos):
+        return pos
+
+
+BACKENDS = {"surface": Display, "sdl2": TextureDisplay}
+
+
+def open_display(size=None, fullscreen=None, smooth=None, backend=None, caption=None):
+    """
+    Abre a janela conforme a config (display_size, fullscreen,
+    display_smooth, render_backend; argumentos explícitos têm prioridade) e
+    a torna a atual para present() e to_logical(). O backend "sdl2" volta
+    para "surface" se o pygame._sdl2 ou o Renderer não estiverem disponíveis.
+    -> Display ou TextureDisplay
+    """
+    global _current
+    from game.config import get_config
+
+    cfg = get_config()
+    if size is None:
+        size = cfg.get("display_size")
+    if fullscreen is None:
+        fullscreen = cfg.get("fullscreen", False)
+    if smooth is None:
+        smooth = cfg.get("display_smooth", False)
+    if backend is None:
+        backend = cfg.get("render_backend", "surface")
+    display = None
+    if backend != "surface":
+        try:
+            display = BACKENDS[backend](size, fullscreen, smooth, caption)
+        except Exception as e:
+            print(f"[display] backend {backend!r} indisponível ({e}); usando surface")
+    if display is None:
+        display = Display(size, fullscreen, smooth, caption)
+    _current = display
+    return display
+
+
+def current():
+    """Display aberto por open_display() (None antes dele)."""
+    return _current
+
+
+def present():
+    """Mostra o quadro do canvas atual (flip simples sem Display aberto)."""
+    if _current is None:
+        pygame.display.flip()
+    else:
+        _current.present()
+
+
+def to_logical(pos):
+    """Posição do mouse na janela -> canvas lógico (igual sem Display aberto)."""
+    return pos if _current is None else _current.to_logical(pos)
@@ -0,0 +1,246 @@
+"""
+Fontes de quadros para o controle por câmera.
+
+Todas imitam o pedaço do cv2.VideoCapture que o jogo usa — read() ->
+(ok, quadro BGR) e release() — e podem escrever direto num buffer
+(read_into), como faz a captura do game.camera_pipeline:
+
+- DeviceSource: webcam (índice do cv2.VideoCapture)
+- VideoFileSource: arquivo de vídeo, em loop (ritmo do vídeo ou máximo)
+- ImageDirSource: pasta com uma sequência de imagens (ordem alfabética)
+- SyntheticSource: quadros gerados (boneco de palitos mexendo os braços)
+
+open_source() escolhe pela especificação da config "camera_source": número
+(câmera), "synthetic", caminho de pasta ou caminho de arquivo. Com 'size',
+todas entregam quadros nesse tamanho (a webcam é configurada; as demais são
+redimensionadas).
+"""
+
+import os
+import time
+import math
+from abc import ABC, abstractmethod
+
+import cv2
+import numpy as np
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class FrameSource(ABC):
+    """Base: subclasses implementam _grab() -> quadro BGR ou None."""
+
+    def __init__(self, size=None):
+        """size: (largura, altura) dos quadros entregues (None = nativo)."""
+        self.size = tuple(size) if size else None
+        self.frames_read = 0
+
+    @abstractmethod
+    def _grab(self):
+        """Próximo quadro BGR (tamanho nativo) ou None se acabou/falhou."""
+
+    def _fit(self, frame, dst=None):
+        size = (dst.shape[1], dst.shape[0]) if dst is not None else self.size
+        if size is None or (frame.shape[1], frame.shape[0]) == size:
+            if dst is None:
+                return frame
+            dst[:] = frame
+            return dst
+        return cv2.resize(frame, size, dst=dst)
+
+    def read(self):
+        frame = self._grab()
+        if frame is None:
+            return False, None
+        self.frames_read += 1
+        return True, self._fit(frame)
+
+    def read_into(self, dst):
+        """Escreve o próximo quadro em 'dst' (já no tamanho final). -> ok"""
+        frame = self._grab()
+        if frame is None:
+            return False
+        self.frames_read += 1
+        self._fit(frame, dst)
+        return True
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        pass
+
+
+class DeviceSource(FrameSource):
+    def __init__(self, index=0, size=None):
+        super().__init__(size)
+        self.cap = cv2.VideoCapture(index)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        if self.size:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.size[0])
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.size[1])
+
+    def _grab(self):
+        ok, frame = self.cap.read()
+        return frame if ok else None
+
+    def read_into(self, dst):
+        # no tamanho certo o OpenCV decodifica direto no buffer
+        ok, frame = self.cap.read(dst)
+        if not ok or frame is None:
+            return False
+        self.frames_read += 1
+        if not np.shares_memory(frame, dst):
+            self._fit(frame, dst)
+        return True
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class _Paced(FrameSource):
+    """Fonte de arquivo que pode seguir o fps nominal (realtime) ou não."""
+
+    def __init__(self, size=None, fps=0.0):
+        super().__init__(size)
+        self.interval = 1.0 / fps if fps and fps > 0 else 0.0
+        self._next = None
+
+    def _pace(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self._next is None or now - self._next > 0.25:
+            self._next = now
+        delay = self._next - now
+        if delay > 0:
+            time.sleep(delay)
+        self._next += self.interval
+
+
+class VideoFileSource(_Paced):
+    def __init__(self, path, size=None, loop=True, realtime=True):
+        """realtime: entrega no fps do vídeo (False = o mais rápido possível)."""
+        self.cap = cv2.VideoCapture(path)
+        fps = self.cap.get(cv2.CAP_PROP_FPS) if realtime else 0.0
+        super().__init__(size, fps)
+        self.path = path
+        self.loop = loop
+
+    def _grab(self):
+        self._pace()
+        ok, frame = self.cap.read()
+        if not ok and self.loop and self.frames_read:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.cap.read()
+        return frame if ok else None
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageDirSource(_Paced):
+    def __init__(self, folder, size=None, loop=True, fps=30.0, preload=False):
+        """
+        fps: ritmo de entrega (0 = o mais rápido possível)
+        preload: decodifica tudo na abertura (benchmark sem custo de disco)
+        """
+        super().__init__(size, fps)
+        self.paths = sorted(
+            os.path.join(folder, f)
+            for f in os.listdir(folder)
+            if f.lower().endswith(IMAGE_EXTS)
+        )
+        self.loop = loop
+        self._i = 0
+        self._cache = None
+        if preload:
+            self._cache = [self._fit(cv2.imread(p)) for p in self.paths]
+
+    def _grab(self):
+        if not self.paths:
+            return None
+        if self._i >= len(self.paths):
+            if not self.loop:
+                return None
+            self._i = 0
+        self._pace()
+        i, self._i = self._i, self._i + 1
+        if self._cache is not None:
+            return self._cache[i]
+        return cv2.imread(self.paths[i])
+
+    def isOpened(self):
+        return bool(self.paths)
+
+
+class SyntheticSource(_Paced):
+    def __init__(self, size=None, fps=30.0):
+        """Boneco de palitos em fundo liso; fps 0 = o mais rápido possível."""
+        super().__init__(size or (640, 480), fps)
+        w, h = self.size
+        self._frame = np.empty((h, w, 3), np.uint8)
+        self._n = 0
+
+    def fill(self, dst, n):
+        """Desenha o quadro 'n' em 'dst' (sem alocar)."""
+        h, w = dst.shape[:2]
+        dst[:] = (60, 50, 40)
+        s = h / 480.0
+        cx = int(w / 2 + math.sin(n / 25.0) * w * 0.15)
+        head = (cx, int(130 * s))
+        neck = (cx, int(175 * s))
+        hip = (cx, int(320 * s))
+        white = (230, 230, 230)
+        t = int(max(1, 8 * s))
+        cv2.circle(dst, head, int(35 * s), white, -1)
+        cv2.line(dst, neck, hip, white, t)
+        arm = math.sin(n / 8.0) * 90 * s
+        for side in (-1, 1):
+            sh = (cx + side * int(45 * s), int(190 * s))
+            cv2.line(dst, neck, sh, white, t)
+            wrist = (sh[0] + side * int(40 * s), int(sh[1] + 60 * s - arm))
+            cv2.line(dst, sh, wrist, white, t)
+            foot = (cx + side * int(50 * s), int(460 * s))
+            cv2.line(dst, hip, foot, white, t)
+        return dst
+
+    def _grab(self):
+        self._pace()
+        self._n += 1
+        return self.fill(self._frame, self._n)
+
+    def read_into(self, dst):
+        self._pace()
+        self._n += 1
+        self.frames_read += 1
+        if dst.shape == self._frame.shape:
+            self.fill(dst, self._n)
+        else:
+            self._fit(self.fill(self._frame, self._n), dst)
+        return True
+
+
+def open_source(spec=0, size=None, realtime=True):
+    """
+    Fonte pela especificação: int ou "0" (câmera), "synthetic", pasta de
+    imagens ou arquivo de vídeo. realtime=False faz arquivos e sintéticos
+    entregarem o mais rápido possível (benchmark).
+    """
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        return DeviceSource(int(spec), size)
+    if spec == "synthetic":
+        return SyntheticSource(size, fps=30.0 if realtime else 0.0)
+    if os.path.isdir(spec):
+        return ImageDirSource(
+            spec, size, fps=30.0 if realtime else 0.0, preload=not realtime
+        )
+    if os.path.isfile(spec):
+        return VideoFileSource(spec, size, realtime=realtime)
+    raise ValueError(f"fonte de câmera desconhecida: {spec!r}")
@@ -0,0 +1,210 @@
+"""
+Classificação de gestos a partir dos landmarks da pose (MediaPipe, 33 pontos).
+
+Usada pelo jogo (CameraController / CameraPipeline) e pelo diagnóstico
+testReconhecimento.py. Os landmarks entram como array (N, 33, k), k >= 2
+(x, y normalizados; z e visibility são ignorados), e todas as regras são
+calculadas de uma vez para os N quadros:
+
+1. filtro (game.pose_filters) nos 7 pontos usados — One Euro, Kalman ou a
+   média de 5 quadros antiga; o estado continua entre chamadas
+2. uma medida por ação, "maior = mais ativa":
+   - JUMP: quanto os dois pulsos estão acima do nariz
+   - DUCK: quadril perto da cabeça (menos de 22% da altura do quadro)
+   - LEFT/RIGHT: inclinação dos ombros em relação ao centro
+3. histerese por ação: liga acima de 'on', só desliga abaixo de 'off' (a
+   tremida em cima do limite não liga/desliga a ação a cada quadro)
+4. janela refratária por ação: uma ação ativa dispara de novo só depois de
+   'refractory' segundos dela mesma — uma ação não bloqueia as outras
+
+hand_cross (só no diagnóstico): pulso direito cruzando a linha do corpo
+também liga LEFT/RIGHT. Prioridade no mesmo quadro: JUMP > DUCK > LEFT >
+RIGHT. Quadros sem pose (linhas NaN) não geram ação nem passam pelo filtro.
+Uma sessão gravada inteira é classificada numa chamada só com
+classify_session().
+"""
+
+import time
+
+import numpy as np
+
+from game.pose_filters import make_filter
+
+# códigos de ação (índice em ACTIONS)
+ACTIONS = (None, "JUMP", "DUCK", "LEFT", "RIGHT")
+NONE, JUMP, DUCK, LEFT, RIGHT = range(len(ACTIONS))
+
+# landmarks usados (mp.solutions.pose.PoseLandmark)
+NOSE = 0
+L_SHOULDER, R_SHOULDER = 11, 12
+L_WRIST, R_WRIST = 15, 16
+L_HIP, R_HIP = 23, 24
+POINTS = [NOSE, L_SHOULDER, R_SHOULDER, L_WRIST, R_WRIST, L_HIP, R_HIP]
+# colunas de POINTS
+_NO, _LS, _RS, _LW, _RW, _LH, _RH = range(len(POINTS))
+
+# ação -> (liga acima de, desliga abaixo de), nas medidas de features()
+HYSTERESIS = {
+    "JUMP": (0.0, -0.03),
+    "DUCK": (-0.22, -0.26),
+    "LEFT": (0.25, 0.18),
+    "RIGHT": (0.25, 0.18),
+}
+# ação -> segundos até a mesma ação poder disparar de novo
+REFRACTORY = {"JUMP": 0.35, "DUCK": 0.35, "LEFT": 0.35, "RIGHT": 0.35}
+
+
+def features(pts, w, h):
+    """
+    Pontos (N, 7, 2) normalizados (colunas de POINTS) -> medidas (N, 4) de
+    JUMP, DUCK, LEFT, RIGHT (maior = mais ativa; compare com HYSTERESIS).
+    """
+    x = pts[..., 0] * w
+    y = pts[..., 1] * h
+    head_y = y[:, _NO]
+    out = np.empty((len(pts), 4), np.float64)
+    # pulsos acima do nariz: o mais baixo dos dois decide
+    out[:, 0] = (head_y - np.maximum(y[:, _LW], y[:, _RW])) / h
+    out[:, 1] = -((y[:, _LH] + y[:, _RH]) / 2 - head_y) / h
+    tilt = ((x[:, _LS] + x[:, _RS]) / 2 - w / 2) / (w * 0.5)
+    out[:, 2] = -tilt
+    out[:, 3] = tilt
+    return out
+
+
+def hysteresis(values, on, off, state):
+    """
+    Estado liga/desliga (N, A) das medidas (N, A): liga com valor > on,
+    desliga com valor <= off, senão mantém; 'state' (A,) é o estado antes
+    do primeiro quadro. Vetorizado: cada quadro olha o último evento.
+    """
+    if len(values) == 1:
+        # um quadro (jogo): sem a varredura
+        v = values[0]
+        return np.where(v > on, True, np.where(v <= off, False, state))[None]
+    turn_on = values > on
+    event = turn_on | (values <= off)
+    idx = np.where(event, np.arange(len(values))[:, None], -1)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    last = np.take_along_axis(turn_on, np.maximum(idx, 0), axis=0)
+    return np.where(idx >= 0, last, state)
+
+
+class GestureClassifier:
+    def __init__(
+        self,
+        filter="one_euro",
+        filter_params=None,
+        hysteresis=True,
+        refractory=None,
+        hand_cross=False,
+    ):
+        """
+        filter: nome em game.pose_filters.FILTERS; filter_params: kwargs dele
+        hysteresis: False liga/desliga no mesmo limite (regra antiga)
+        refractory: segundos por ação ({"JUMP": 0.35, ...}) ou um número
+            para todas (padrão REFRACTORY)
+        hand_cross: liga as regras do pulso cruzando o corpo (diagnóstico)
+        """
+        self.filter = make_filter(filter, **(filter_params or {}))
+        names = ACTIONS[1:]
+        self._on = np.array([HYSTERESIS[a][0] for a in names])
+        if hysteresis:
+            self._off = np.array([HYSTERESIS[a][1] for a in names])
+        else:
+            self._off = self._on
+        if refractory is None:
+            refractory = REFRACTORY
+        if not isinstance(refractory, dict):
+            refractory = dict.fromkeys(names, refractory)
+        self._refractory = [float(refractory[a]) for a in names]
+        self.hand_cross = hand_cross
+        self.reset()
+
+    def reset(self):
+        self.filter.reset()
+        self._state = np.zeros(len(ACTIONS) - 1, bool)
+        self._shown = self._state
+        self._last_fire = [-np.inf] * (len(ACTIONS) - 1)
+
+    @property
+    def current(self):
+        """Ação ativa de maior prioridade no último quadro (sem refratário)."""
+        active = np.flatnonzero(self._shown)
+        return ACTIONS[active[0] + 1] if len(active) else None
+
+    def classify(self, landmarks, w, h, times):
+        """
+        Códigos de ação (N,) int8 para landmarks (N, 33, k) de quadros w x h
+        nos instantes 'times' (N,) em segundos. Atualiza filtro, histerese e
+        janelas refratárias.
+        """
+        lm = np.asarray(landmarks, dtype=np.float32)
+        if lm.ndim == 2:
+            lm = lm[None]
+        times = np.asarray(times, dtype=np.float64).reshape(-1)
+        codes = np.zeros(len(lm), np.int8)
+        pts = lm[:, POINTS, :2]
+        valid = np.isfinite(pts).all(axis=(1, 2))
+        if not valid.all():
+            pts, times = pts[valid], times[valid]
+        if not len(pts):
+            return codes
+        if len(pts) == 1:
+            pts = self.filter.step(pts[0], times[0])[None]
+        else:
+            pts = self.filter.run(pts, times)
+
+        active = hysteresis(features(pts, w, h), self._on, self._off, self._state)
+        self._state = active[-1].copy()
+        if self.hand_cross:
+            x = pts[..., 0] * w
+            mid_body_x = (x[:, _LH] + x[:, _RH]) / 2
+            active[:, 2] |= x[:, _RW] < mid_body_x - w * 0.05
+            active[:, 3] |= x[:, _RW] > mid_body_x + w * 0.15
+        self._shown = active[-1]
+
+        fired = np.zeros(len(pts), np.int8)
+        last, refractory = self._last_fire, self._refractory
+        for i in np.flatnonzero(active.any(axis=1)).tolist():
+            t = times[i]
+            for a, on in enumerate(active[i].tolist()):
+                if on and t - last[a] >= refractory[a]:
+                    fired[i] = a + 1
+                    last[a] = t
+                    break
+        codes[valid] = fired
+        return codes
+
+    def decide(self, lm, w, h, now=None):
+        """
+        Ação do quadro (landmarks (33, k)) ou None — contrato do get_action.
+        now: instante do quadro (padrão: time.monotonic()).
+        """
+        if now is None:
+            now = time.monotonic()
+        return ACTIONS[self.classify(lm, w, h, now)[0]]
+
+
+def config_options():
+    """Opções do GestureClassifier vindas da config (camera_filter...)."""
+    from game.config import get_config
+
+    cfg = get_config()
+    return {
+        "filter": cfg.get("camera_filter", "one_euro"),
+        "filter_params": cfg.get("camera_filter_params") or {},
+    }
+
+
+def classify_session(landmarks, w, h, times=None, fps=30.0, **kwargs):
+    """
+    Ações de uma sessão gravada (landmarks (N, 33, k), NaN = sem pose) numa
+    chamada. times: instante de cada quadro (padrão: índice / fps).
+    kwargs vão para o GestureClassifier. -> lista de ações (None = nada)
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    if times is None:
+        times = np.arange(len(landmarks)) / fps
+    codes = GestureClassifier(**kwargs).classify(landmarks, w, h, times)
+    return [ACTIONS[c] for c in codes]
@@ -0,0 +1,223 @@
+"""
+Governador de qualidade da rodada.
+
+Quando o quadro passa do orçamento, clock.tick não segura o ritmo, o dt
+cresce e a simulação recupera passos em rajada (o jogo "engasga"). O
+FrameGovernor acompanha a média móvel do tempo de trabalho de cada quadro
+(clock.get_rawtime(), sem a espera do tick) e desce um nível quando ela passa
+do orçamento (1000 / target_fps ms); com folga de novo, sobe um nível. Os
+níveis são cumulativos:
+
+0. "full": tudo ligado
+1. "camera": Pose.process no máximo na metade do ritmo configurado
+2. "resolution": o mundo é desenhado em resolução interna menor
+   (ScaledCanvas, RENDER_SCALE) e escalado para a janela; o HUD continua na
+   resolução cheia (no backend "sdl2" de game.display a escala já é do SDL,
+   e o nível não muda o desenho)
+3. "effects": sem efeitos decorativos (fundo da estrada vira cor sólida, sem
+   som de pulo)
+
+Cada troca espera 'hold' segundos desde a anterior; uma volta de nível que
+logo em seguida precisa ser desfeita dobra a espera da próxima volta (não
+fica oscilando). Toda transição vai para o console e para data/quality.log
+(uma linha JSON com máquina, níveis e tempos), para ver que quiosques vivem
+degradados.
+"""
+
+import os
+import json
+import time
+import socket
+import weakref
+from collections import deque
+
+import pygame
+
+LEVELS = ("full", "camera", "resolution", "effects")
+LOG_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "quality.log")
+# fração da resolução cheia no nível "resolution"
+RENDER_SCALE = 0.5
+# espera máxima (s) entre voltas de nível após oscilações
+MAX_RESTORE_HOLD = 120.0
+
+
+class FrameGovernor:
+    def __init__(
+        self,
+        target_fps,
+        window=60,
+        hold=2.0,
+        restore_hold=8.0,
+        degrade_at=1.0,
+        restore_at=0.6,
+        log_path=LOG_PATH,
+    ):
+        """
+        target_fps: ritmo alvo (orçamento = 1000 / target_fps ms)
+        window: quadros da média móvel
+        hold: segundos mínimos entre descidas; restore_hold: entre subidas
+        degrade_at / restore_at: frações do orçamento que disparam a descida
+            (média acima) e a subida (média abaixo)
+        log_path: arquivo das transições (None = só console)
+        """
+        self.budget_ms = 1000.0 / target_fps
+        self.window = window
+        self.hold = hold
+        self.restore_hold = self._base_restore_hold = restore_hold
+        self.degrade_at = degrade_at
+        self.restore_at = restore_at
+        self.log_path = log_path
+        self.level = 0
+        self._changed_at = float("-inf")
+        self._restored_at = None
+        self.reset_window()
+
+    def reset_window(self, skip=0):
+        """
+        Esquece as medidas (nova rodada); o nível atual continua. skip:
+        quadros seguintes ignorados (carregamento da rodada).
+        """
+        self._times = deque(maxlen=self.window)
+        self._sum = 0.0
+        self._skip = skip
+
+    @property
+    def name(self):
+        return LEVELS[self.level]
+
+    @property
+    def mean_ms(self):
+        return self._sum / len(self._times) if self._times else 0.0
+
+    def at_least(self, name):
+        """True se o nível atual já inclui a degradação 'name'."""
+        return self.level >= LEVELS.index(name)
+
+    def update(self, work_ms, now=None):
+        """
+        Registra o tempo de trabalho de um quadro. -> True se o nível mudou
+        (consulte level/name/at_least e aplique).
+        """
+        if self._skip:
+            self._skip -= 1
+            return False
+        if now is None:
+            now = time.monotonic()
+        if len(self._times) == self.window:
+            self._sum -= self._times[0]
+        self._times.append(work_ms)
+        self._sum += work_ms
+        if len(self._times) < self.window:
+            return False
+
+        mean = self.mean_ms
+        since = now - self._changed_at
+        if mean > self.budget_ms * self.degrade_at and self.level < len(LEVELS) - 1:
+            if since < self.hold:
+                return False
+            restored = self._restored_at
+            if restored is not None and now - restored < 2 * self.restore_hold:
+                # a subida anterior não se sustentou: espera mais para a próxima
+                self.restore_hold = min(self.restore_hold * 2, MAX_RESTORE_HOLD)
+            self._change(self.level + 1, mean, now)
+            return True
+        if mean < self.budget_ms * self.restore_at and self.level > 0:
+            if since < self.restore_hold:
+                return False
+            if self._restored_at is not None and since >= 4 * self.restore_hold:
+                self.restore_hold = self._base_restore_hold
+            self._restored_at = now
+            self._change(self.level - 1, mean, now)
+            return True
+        return False
+
+    def _change(self, level, mean, now):
+        old = LEVELS[self.level]
+        self.level = level
+        self._changed_at = now
+        # medidas do nível anterior não valem para o novo
+        self.reset_window()
+        print(
+            f"[governor] qualidade {old} -> {LEVELS[level]}"
+            f" (quadro {mean:.1f} ms, orçamento {self.budget_ms:.1f} ms)"
+        )
+        if self.log_path:
+            entry = {
+                "time": int(time.time()),
+                "host": socket.gethostname(),
+                "from": old,
+                "to": LEVELS[level],
+                "frame_ms": round(mean, 2),
+                "budget_ms": round(self.budget_ms, 2),
+            }
+            try:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry) + "\n")
+            except OSError as e:
+                print(f"[governor] falha ao gravar {self.log_path!r}: {e}")
+
+
+class ScaledCanvas:
+    """
+    Mundo desenhado numa superfície menor (scale do destino) e escalado para
+    o destino em present(), numa só transformação. Posições chegam em
+    coordenadas do canvas lógico; cada imagem é reduzida uma vez e
+    reaproveitada enquanto existir (os quadros de animação já são fixos).
+    O destino é a área da janela (Display.target): com a janela de outro
+    tamanho o quadro não passa pelo canvas lógico, e o HUD entra depois com
+    overlay(), já na resolução da janela.
+    """
+
+    def __init__(self, size, target, scale=RENDER_SCALE):
+        """
+        size: tamanho das coordenadas de desenho (o canvas lógico)
+        target: Surface que recebe o quadro (Display.target)
+        scale: fração da resolução do destino
+        """
+        self.full_size = tuple(size)
+        self.target = target
+        w, h = self.full_size
+        tw, th = target.get_size()
+        sw, sh = max(1, int(tw * scale)), max(1, int(th * scale))
+        # de coordenadas lógicas para a superfície menor e para o destino
+        self.scale = sw / w
+        self.overlay_scale = tw / w
+        self.surface = pygame.Surface((sw, sh))
+        display = pygame.display.get_surface()
+        if display is not None:
+            self.surface = self.surface.convert(display)
+        self._scaled = weakref.WeakKeyDictionary()
+        self._overlays = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _resized(cache, surf, scale):
+        out = cache.get(surf)
+        if out is None:
+            w, h = surf.get_size()
+            size = (max(1, round(w * scale)), max(1, round(h * scale)))
+            out = pygame.transform.scale(surf, size)
+            cache[surf] = out
+        return out
+
+    def fill(self, color):
+        self.surface.fill(color)
+
+    def blit(self, surf, pos):
+        s = self.scale
+        small = self._resized(self._scaled, surf, s)
+        self.surface.blit(small, (round(pos[0] * s), round(pos[1] * s)))
+
+    def draw_sprites(self, sprites):
+        for spr in sprites:
+            self.blit(spr.image, spr.rect.topleft)
+
+    def present(self):
+        """Escala o mundo para target numa transformação."""
+        pygame.transform.scale(self.surface, self.target.get_size(), self.target)
+
+    def overlay(self, surf, pos):
+        """Desenha surf (HUD) por cima, no destino, depois de present()."""
+        s = self.overlay_scale
+        if s != 1:
+            surf = self._resized(self._overlays, surf, s)
+        self.target.blit(surf, (round(pos[0] * s), round(pos[1] * s)))
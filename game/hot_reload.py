@@ -0,0 +1,279 @@
+"""
+Hot-reload de assets e parâmetros de jogabilidade durante a sessão.
+
+FileWatcher observa pastas e arquivos avulsos (inotify no Linux, via ctypes;
+nos demais sistemas uma varredura de mtime limitada a uma por poll_interval)
+e poll() devolve os arquivos alterados desde a chamada anterior — sem
+bloquear o loop. De data/ só o config.json interessa: cache, replays e logs
+gravados durante a rodada não acordam o watcher nem entram na varredura.
+
+HotReloader junta as duas coisas:
+- arquivo de assets alterado -> descarta o que foi derivado dele nos caches
+  (game.assets_loader.invalidate_asset); o player recarrega a própria imagem e
+  os próximos obstáculos/sons já saem do arquivo novo
+- data/config.json alterado -> ConfigService recarrega, valida e avisa; a
+  seção "gameplay" é aplicada em ObstacleManager/Player vivos
+
+Tudo roda na thread principal, entre um frame e outro (HotReloader.poll()).
+"""
+
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+import struct
+
+from game.assets_loader import (
+    ASSETS_PATH,
+    IMAGE_EXTS,
+    SOUND_EXTS,
+    invalidate_asset,
+)
+from game.config import get_config
+from game import animation
+
+# constantes de <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# só eventos de escrita concluída: um PNG salvo pela metade não é recarregado
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE
+_EVENT = struct.Struct("iIII")
+
+
+class FileWatcher:
+    def __init__(self, paths, poll_interval=1.0, use_inotify=True, files=()):
+        """
+        paths: pastas observadas (recursivamente)
+        poll_interval: intervalo mínimo entre varreduras no modo polling
+        use_inotify: False força o modo polling
+        files: arquivos observados sozinhos (a pasta deles não é varrida)
+        """
+        self.paths = [os.path.abspath(p) for p in paths if os.path.isdir(p)]
+        self.files = {os.path.abspath(f) for f in files}
+        self.poll_interval = poll_interval
+        self._fd = None
+        self._wds = {}
+        # watches das pastas de 'files': só os eventos desses arquivos contam
+        self._only = set()
+        self._mtimes = {}
+        self._last_scan = 0.0
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._init_inotify()
+            except Exception as e:
+                print(f"[hot_reload] inotify indisponível ({e}); usando polling")
+                self.close()
+        if self._fd is None:
+            self._mtimes = self._scan()
+            self._last_scan = time.monotonic()
+
+    @property
+    def backend(self):
+        return "inotify" if self._fd is not None else "polling"
+
+    # --- inotify -----------------------------------------------------------
+
+    def _init_inotify(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch_fn = libc.inotify_add_watch
+        self._add_watch_fn.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        self._fd = fd
+        for path in self.paths:
+            for root, _, _ in os.walk(path):
+                self._add_watch(root)
+        for folder in {os.path.dirname(f) for f in self.files}:
+            self._add_watch(folder, only_files=True)
+
+    def _add_watch(self, folder, only_files=False):
+        wd = self._add_watch_fn(self._fd, os.fsencode(folder), _WATCH_MASK)
+        if wd < 0:
+            print(f"[hot_reload] não foi possível observar {folder!r}")
+            return
+        if only_files and wd in self._wds:
+            # pasta já observada inteira (recursiva)
+            return
+        self._wds[wd] = folder
+        if only_files:
+            self._only.add(wd)
+
+    def _read_inotify(self):
+        changed = set()
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not buf:
+                break
+            offset = 0
+            while offset + _EVENT.size <= len(buf):
+                wd, mask, _, length = _EVENT.unpack_from(buf, offset)
+                offset += _EVENT.size
+                name = buf[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # fila do kernel estourou: não dá para saber o que mudou
+                    changed.update(self._all_files())
+                    continue
+                folder = self._wds.get(wd)
+                if folder is None or not name:
+                    continue
+                path = os.path.join(folder, os.fsdecode(name))
+                if wd in self._only and path not in self.files:
+                    continue
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        for root, _, files in os.walk(path):
+                            self._add_watch(root)
+                            changed.update(os.path.join(root, f) for f in files)
+                    continue
+                # IN_CREATE de arquivo vem seguido de IN_CLOSE_WRITE
+                if mask & IN_CREATE:
+                    continue
+                changed.add(path)
+        return changed
+
+    # --- polling -----------------------------------------------------------
+
+    def _all_files(self):
+        for path in self.paths:
+            for root, _, files in os.walk(path):
+                for fname in files:
+                    yield os.path.join(root, fname)
+        yield from self.files
+
+    def _scan(self):
+        mtimes = {}
+        for fpath in self._all_files():
+            try:
+                st = os.stat(fpath)
+            except OSError:
+                continue
+            mtimes[fpath] = (st.st_size, st.st_mtime_ns)
+        return mtimes
+
+    def _read_polling(self):
+        now = time.monotonic()
+        if now - self._last_scan < self.poll_interval:
+            return set()
+        self._last_scan = now
+        old, new = self._mtimes, self._scan()
+        self._mtimes = new
+        return {p for p in old.keys() | new.keys() if old.get(p) != new.get(p)}
+
+    # --- interface ---------------------------------------------------------
+
+    def poll(self):
+        """Arquivos criados/alterados/removidos desde a última chamada (set)."""
+        if self._fd is not None:
+            return self._read_inotify()
+        return self._read_polling()
+
+    def close(self):
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+        self._fd = None
+        self._wds = {}
+        self._only = set()
+
+
+class HotReloader:
+    def __init__(self, config=None, watcher=None):
+        """
+        config: ConfigService (padrão get_config())
+        watcher: FileWatcher (padrão: assets/ + o próprio config.json)
+        """
+        self.config = config or get_config()
+        self.config_path = os.path.abspath(self.config.path)
+        self.watcher = watcher or FileWatcher([ASSETS_PATH], files=[self.config_path])
+        self.obstacles = None
+        self.player = None
+        self.sim = None
+        self.config.add_listener(self._on_config)
+
+    def attach(self, obstacles=None, player=None, sim=None):
+        """
+        Define os objetos da rodada que recebem tuning/assets novos. Com 'sim'
+        (game.round.RoundSim) o tuning passa por ela e fica gravado no replay.
+        """
+        self.obstacles = obstacles
+        self.player = player
+        self.sim = sim
+
+    def detach(self):
+        self.attach(None, None, None)
+
+    def _on_config(self, config):
+        tuning = config.get("gameplay", {})
+        targets = (self.sim,) if self.sim is not None else (self.obstacles, self.player)
+        for target in targets:
+            if target is None:
+                continue
+            try:
+                target.apply_tuning(tuning)
+            except Exception as e:
+                print(f"[hot_reload] falha ao aplicar tuning em {target!r}: {e}")
+        print("[hot_reload] parâmetros de jogabilidade recarregados")
+
+    def poll(self):
+        """
+        Processa as mudanças pendentes (chamar uma vez por frame).
+        Retorna o conjunto de assets alterados, para o chamador recarregar o
+        que ele mesmo mantém (ex.: fundo da estrada).
+        """
+        changed = self.watcher.poll()
+        if not changed:
+            return set()
+        assets = set()
+        config_changed = False
+        for path in changed:
+            path = os.path.abspath(path)
+            if path == self.config_path:
+                config_changed = True
+            elif path.lower().endswith(IMAGE_EXTS + SOUND_EXTS):
+                invalidate_asset(path)
+                animation.invalidate(path)
+                assets.add(path)
+        if config_changed:
+            # listener (_on_config) aplica o tuning se algo mudou de fato
+            self.config.reload_if_changed(force=True)
+        if assets:
+            print(f"[hot_reload] {len(assets)} asset(s) recarregado(s)")
+            self._reload_assets(assets)
+        return assets
+
+    def _reload_assets(self, paths):
+        player = self.player
+        strips = os.path.abspath(animation.STRIP_PATH)
+        if player is not None and getattr(player, "image_path", None):
+            src = os.path.abspath(player.image_path)
+            if any(
+                p == src or p.startswith(src + os.sep) or os.path.dirname(p) == strips
+                for p in paths
+            ):
+                player.reload_image()
+        if self.obstacles is not None:
+            if any(p.lower().endswith(SOUND_EXTS) for p in paths):
+                self.obstacles.reload_sounds()
+            if any(p.lower().endswith(IMAGE_EXTS) for p in paths):
+                self.obstacles.reload_images()
+
+    def close(self):
+        self.detach()
+        self.watcher.close()
@@ -9,7 +9,33 @@ from game.assets_loader import (
     find_first_sound_in_folder,
     load_sound,
 )
-from game.settings import HEIGHT
+from game.settings import HEIGHT, LANES, OBSTACLE_NAMES, OBSTACLE_SIZE
+from game.config import get_config
+from game.patterns import PatternGenerator
+from game.animation import obstacle_animator
+
+
+def obstacle_type(path):
+    """Tipo do obstáculo pelo nome do arquivo ('need_jump' ou 'must_avoid')."""
+    src_name = os.path.basename(path).lower() if path else ""
+    # mapear substrings para tipo
+    if "barra" in src_name or "buraco" in src_name:
+        return "need_jump"
+    # "bola"/"cometa"/"cone" e nomes desconhecidos: desviar
+    return "must_avoid"
+
+
+def pixel_overlap(a, b):
+    """
+    Fase fina da colisão: as máscaras prontas (sprite.mask, do cache de
+    game.animation) se tocam? Sem máscara em algum dos dois vale o rect —
+    nunca gera máscara aqui (isto roda a cada frame).
+    """
+    ma = getattr(a, "mask", None)
+    mb = getattr(b, "mask", None)
+    if ma is None or mb is None:
+        return True
+    return ma.overlap(mb, (b.rect.x - a.rect.x, b.rect.y - a.rect.y)) is not None
 
 
 class Obstacle(pygame.sprite.Sprite):
@@ -18,13 +44,28 @@ class Obstacle(pygame.sprite.Sprite):
     - 'need_jump' : deve ser evitado pulando
     - 'must_avoid': deve ser evitado desviando (troca de lane)
     Cada obstáculo conhece a lane index onde nasceu (self.lane).
+    rng: random.Random usado no deslocamento inicial (padrão: módulo random)
+    jitter: deslocamento vertical inicial máximo (0 = alinhado, p/ padrões)
+    ob_type: força o tipo (senão é inferido pelo nome do arquivo)
+    A imagem anima pelo tipo (game.animation) no dt de update().
     """
 
-    def __init__(self, lane_x, lane_idx, image_path=None, w=48, h=48):
+    def __init__(
+        self,
+        lane_x,
+        lane_idx,
+        image_path=None,
+        w=48,
+        h=48,
+        rng=None,
+        jitter=80,
+        ob_type=None,
+    ):
         super().__init__()
         self.lane = lane_idx
         self.ob_type = "must_avoid"  # default
         self.image = None
+        source = None
 
         # tentar carregar imagem específica
         if image_path:
@@ -32,6 +73,7 @@ class Obstacle(pygame.sprite.Sprite):
                 img = load_image(image_path, size=(w, h), use_alpha=True)
                 if img:
                     self.image = img
+                    source = image_path
             except Exception:
                 self.image = None
 
@@ -47,6 +89,7 @@ class Obstacle(pygame.sprite.Sprite):
             if imgp:
                 try:
                     self.image = load_image(imgp, size=(w, h), use_alpha=True)
+                    source = imgp if self.image else None
                 except Exception:
                     self.image = None
 
@@ -57,36 +100,52 @@ class Obstacle(pygame.sprite.Sprite):
 
         # determinar tipo pelo nome do arquivo se possível
         try:
-            src_name = ""
             if image_path:
-                src_name = os.path.basename(image_path).lower()
+                self.ob_type = obstacle_type(image_path)
             elif "imgp" in locals() and imgp:
-                src_name = os.path.basename(imgp).lower()
-            # mapear substrings para tipo
-            if "barra" in src_name or "buraco" in src_name or "buraco" in src_name:
-                self.ob_type = "need_jump"
-            elif "bola" in src_name or "cometa" in src_name or "cone" in src_name:
-                self.ob_type = "must_avoid"
+                self.ob_type = obstacle_type(imgp)
             # se não for possível inferir, manter default must_avoid
         except Exception:
             pass
+        if ob_type is not None:
+            self.ob_type = ob_type
+
+        # quadros da animação do tipo, prontos em cache (por arquivo/tamanho)
+        self.animator = obstacle_animator(source, self.image, self.ob_type)
+        self.image = self.animator.image
+        self.mask = self.animator.mask
 
         # rect - posicionado acima da tela inicialmente
         self.rect = self.image.get_rect()
         self.rect.centerx = lane_x
-        self.rect.top = -self.rect.height - random.randint(0, 80)
+        self.rect.top = -self.rect.height - (rng or random).randint(0, jitter)
 
         # flags para evitar dupla contagem
         self._hit_counted = False
         self._evaded_counted = False
 
+    @property
+    def counted(self):
+        """Já contou como colisão ou desvio (não conta de novo)."""
+        return self._hit_counted or self._evaded_counted
+
     def update(self, dt, speed=180):
         # mover verticalmente para baixo
         self.rect.y += int(speed * dt)
+        self.animator.update(dt)
+        self.image = self.animator.image
+        self.mask = self.animator.mask
 
 
 class ObstacleManager:
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, tuning=None, rng=None, **kwargs):
+        """
+        tuning: dict com os parâmetros de jogabilidade (ver game.config
+        DEFAULT_GAMEPLAY); se None usa a seção "gameplay" da config.
+        rng: random.Random da rodada; com a mesma semente (e as mesmas
+        entradas) a sequência de spawns se repete exatamente.
+        """
+        self._rng = rng or random.Random()
         # grupo principal de obstáculos (usado por main.py para detecção)
         self.obstacle_sprites = pygame.sprite.Group()
         # contadores públicos
@@ -94,20 +153,104 @@ class ObstacleManager:
         self.evaded_count = 0
         # controle de spawn — aumenta espaçamento para dar tempo de desviar
         self._spawn_timer = 0.0
-        # intervalo base maior; será usado para gerar _next_spawn aleatório
-        self._spawn_interval = 1.2  # segundos base (aumentado)
-        # intervalo real até o próximo spawn (varia entre _spawn_interval e 1.6x)
-        self._next_spawn = random.uniform(
-            self._spawn_interval, self._spawn_interval * 1.6
+        # parâmetros ajustáveis (config "gameplay"): intervalo base de spawn,
+        # variação, velocidade (pixels/seg), lanes e tamanho dos obstáculos
+        self.apply_tuning(tuning if tuning is not None else get_config().gameplay())
+        # intervalo real até o próximo spawn (varia entre _spawn_interval e jitter x)
+        self._next_spawn = self._rng.uniform(
+            self._spawn_interval, self._spawn_interval * self._spawn_jitter
         )
         # evita spawn repetido na mesma lane
         self._last_lane = None
-        self._speed = 220  # velocidade de deslocamento (pixels/seg)
-        # lanes x - manter compatibilidade com seu layout
-        self._lane_x = [300, 450, 600]
 
         # som de colisão
         self._collision_sound = None
+        # imagens por tipo (modo "patterns"), resolvidas uma vez
+        self._image_pools = None
+
+    def apply_tuning(self, tuning):
+        """Aplica parâmetros de jogabilidade (chaves ausentes mantêm o valor atual)."""
+        self._spawn_interval = float(
+            tuning.get("spawn_interval", getattr(self, "_spawn_interval", 1.2))
+        )
+        self._spawn_jitter = float(
+            tuning.get("spawn_jitter", getattr(self, "_spawn_jitter", 1.6))
+        )
+        self._speed = tuning.get("speed", getattr(self, "_speed", 220))
+        self._lane_x = list(tuning.get("lanes", getattr(self, "_lane_x", LANES)))
+        size = tuple(
+            tuning.get("obstacle_size", getattr(self, "_obstacle_size", OBSTACLE_SIZE))
+        )
+        if size != getattr(self, "_obstacle_size", None):
+            self._obstacle_size = size
+            self._prepare_animations()
+        # "classic": um obstáculo por vez; "patterns": trechos de game.patterns
+        # com curva de dificuldade (tuning sem a chave, ex. replays antigos,
+        # mantém o clássico)
+        self._spawn_mode = tuning.get(
+            "spawn_mode", getattr(self, "_spawn_mode", "classic")
+        )
+        if self._spawn_mode == "patterns":
+            if getattr(self, "_patterns", None) is None:
+                self._patterns = PatternGenerator(tuning, self._rng)
+                self._elapsed = 0.0
+            else:
+                self._patterns.apply_tuning(tuning)
+        else:
+            self._patterns = None
+
+    def _prepare_animations(self):
+        """
+        Gera agora (fora do loop) quadros e máscaras de todo obstáculo
+        conhecido no tamanho atual; os spawns só leem o cache.
+        """
+        w, h = self._obstacle_size
+        for nm in OBSTACLE_NAMES:
+            p = find_image_by_name(nm)
+            if not p:
+                continue
+            try:
+                img = load_image(p, size=(w, h), use_alpha=True)
+                if img:
+                    obstacle_animator(p, img, obstacle_type(p))
+            except Exception:
+                pass
+
+    def reload_sounds(self):
+        """Esquece o som de colisão carregado (o arquivo mudou em disco)."""
+        self._collision_sound = None
+
+    def reload_images(self):
+        """Refaz a lista de imagens por tipo (arquivos mudaram em disco)."""
+        self._image_pools = None
+        self._prepare_animations()
+
+    def _image_for(self, kind):
+        if self._image_pools is None:
+            pools = {"need_jump": [], "must_avoid": []}
+            for nm in OBSTACLE_NAMES:
+                p = find_image_by_name(nm)
+                if p and p not in pools[obstacle_type(p)]:
+                    pools[obstacle_type(p)].append(p)
+            self._image_pools = pools
+        pool = self._image_pools.get(kind)
+        return self._rng.choice(pool) if pool else None
+
+    def _spawn_kind(self, lane_idx, kind):
+        """Cria um obstáculo do tipo pedido, alinhado no topo (modo padrões)."""
+        ow, oh = self._obstacle_size
+        obs = Obstacle(
+            self._lane_x[lane_idx],
+            lane_idx,
+            image_path=self._image_for(kind),
+            w=ow,
+            h=oh,
+            rng=self._rng,
+            jitter=0,
+            # a checagem de resolubilidade assumiu este tipo
+            ob_type=kind,
+        )
+        self.obstacle_sprites.add(obs)
 
     def _play_collision_sound(self):
         try:
@@ -126,21 +269,43 @@ class ObstacleManager:
             pass
 
     def update(self, dt):
+        if self._patterns is not None:
+            # trechos pré-gerados: só retira da fila o que venceu
+            self._elapsed += dt
+            for lane_idx, kind in self._patterns.due(self._elapsed, self.evaded_count):
+                if lane_idx < len(self._lane_x):
+                    self._spawn_kind(lane_idx, kind)
+            self._speed = self._patterns.speed
+        else:
+            self._spawn_classic(dt)
+        self._move_sprites(dt)
+
+    @property
+    def speed(self):
+        """Velocidade atual dos obstáculos (pixels/seg)."""
+        return self._speed
+
+    @property
+    def difficulty(self):
+        """Dificuldade atual 0..1 (modo "patterns"; 0 no clássico)."""
+        return self._patterns.difficulty if self._patterns is not None else 0.0
+
+    def _spawn_classic(self, dt):
         # spawn com espaçamento maior e variação aleatória
         self._spawn_timer += dt
         if self._spawn_timer >= self._next_spawn:
             self._spawn_timer = 0.0
             # recalcula próximo intervalo (variação)
-            self._next_spawn = random.uniform(
-                self._spawn_interval, self._spawn_interval * 1.6
+            self._next_spawn = self._rng.uniform(
+                self._spawn_interval, self._spawn_interval * self._spawn_jitter
             )
             # escolhe lane evitando repetir a mesma lane consecutiva quando possível
-            lane_idx = random.randrange(len(self._lane_x))
+            lane_idx = self._rng.randrange(len(self._lane_x))
             if self._last_lane is not None and len(self._lane_x) > 1:
                 # com alta probabilidade força outra lane
                 if lane_idx == self._last_lane:
                     alts = [i for i in range(len(self._lane_x)) if i != self._last_lane]
-                    lane_idx = random.choice(alts)
+                    lane_idx = self._rng.choice(alts)
             self._last_lane = lane_idx
             lx = self._lane_x[lane_idx]
             # escolher imagem aleatória entre as esperadas (preferir pasta obstacles)
@@ -157,7 +322,7 @@ class ObstacleManager:
             ]
             chosen_path = None
             # tenta encontrar por nome exato/contendo
-            for nm in random.sample(candidates_names, len(candidates_names)):
+            for nm in self._rng.sample(candidates_names, len(candidates_names)):
                 p = find_image_by_name(nm)
                 if p:
                     chosen_path = p
@@ -170,9 +335,13 @@ class ObstacleManager:
                         chosen_path = p2
                 except Exception:
                     chosen_path = None
-            obs = Obstacle(lx, lane_idx, image_path=chosen_path, w=64, h=64)
+            ow, oh = self._obstacle_size
+            obs = Obstacle(
+                lx, lane_idx, image_path=chosen_path, w=ow, h=oh, rng=self._rng
+            )
             self.obstacle_sprites.add(obs)
 
+    def _move_sprites(self, dt):
         # atualizar todos os sprites e remover evadidos que saíram da tela
         for spr in list(self.obstacle_sprites):
             try:
@@ -200,6 +369,8 @@ class ObstacleManager:
         Verifica colisões com lógica diferenciada:
         - 'need_jump' : pode ser evitado pulando OU desviando para outra lane
         - 'must_avoid': deve ser evitado desviando (troca de lane)
+        Deslizar não evita nenhum dos dois: a hitbox achatada do player só
+        muda quando o contato começa (Player.slide).
         Atualiza collision_count e evaded_count.
         """
         grp = self._get_obstacle_group()
@@ -210,9 +381,13 @@ class ObstacleManager:
         evaded = 0
         collisions = 0
 
-        # colisões por spritecollide (rect overlap)
+        # fase larga por spritecollide (rect overlap); fase fina por máscara,
+        # só nos pares que já se tocam (cantos transparentes não contam).
+        # Deslizando, rect e máscara do player já são os achatados (só adia o
+        # contato; não há regra de desvio por deslize)
         try:
             hits = pygame.sprite.spritecollide(player, grp, False)
+            hits = [spr for spr in hits if pixel_overlap(player, spr)]
         except Exception:
             hits = []
 
@@ -234,11 +409,13 @@ class ObstacleManager:
                         evaded_by_jump = False
                         evaded_by_lane = False
                         try:
+                            # visão de cima: o contato acontece com o obstáculo
+                            # ainda "à frente" do player, então o que conta é a
+                            # altura dos pés em relação ao chão, não ao obstáculo
                             threshold = max(8, int(spr.rect.height * 0.25))
-                            player_feet = player.rect.bottom
-                            ob_top = spr.rect.top
+                            ground_y = player.ground_y
                             if player.is_jumping and (
-                                player_feet <= ob_top + threshold
+                                ground_y - player.rect.bottom >= threshold
                             ):
                                 evaded_by_jump = True
                         except Exception:
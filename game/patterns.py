@@ -0,0 +1,219 @@
+"""
+Gerador procedural de obstáculos por padrões (gameplay "spawn_mode": "patterns").
+
+Em vez de um obstáculo por vez, o ObstacleManager recebe trechos ("chunks")
+montados a partir de uma biblioteca ponderada de padrões — paredes com uma
+lane livre, paredes de pulo, pulo seguido de desvio, zigue-zague... A
+dificuldade (0..1) cresce com o tempo de rodada ou com os desvios e escala a
+velocidade, a densidade (intervalo entre linhas e entre trechos) e libera
+padrões mais difíceis.
+
+Os trechos são gerados com alguns segundos de antecedência numa fila de spawns
+com horário; por frame o manager só retira da fila o que venceu, então o custo
+de spawn não cresce com a densidade. Cada spawn leva a velocidade do seu
+trecho, que só passa a valer (PatternGenerator.speed) quando ele sai da fila
+— a tela não acelera antes de o trecho mais difícil chegar.
+
+Todo trecho passa por uma checagem de resolubilidade antes de entrar na fila:
+partindo das lanes em que o jogador pode estar, cada linha só é alcançável se
+houver tempo para trocar de lane depois que a linha anterior passou e se os
+pulos couberem no tempo de voo. Padrão que não passa é sorteado de novo; sem
+alternativa, o trecho fica vazio (respiro).
+"""
+
+from collections import deque
+
+from game.settings import FPS, OBSTACLE_SIZE, PLAYER_SIZE
+
+# células de uma linha: vazio, obstáculo de pular, obstáculo de desviar
+EMPTY, JUMP, AVOID = ".", "J", "A"
+CELL_KINDS = {JUMP: "need_jump", AVOID: "must_avoid"}
+
+# nome -> (peso, dificuldade mínima, [(batida, células para 3 lanes)])
+PATTERNS = {
+    "single": (6.0, 0.0, [(0, "A..")]),
+    "single_jump": (4.0, 0.0, [(0, "J..")]),
+    "pair": (4.0, 0.15, [(0, "AA.")]),
+    "gap_wall": (2.0, 0.3, [(0, "A.A")]),
+    "jump_wall": (2.0, 0.3, [(0, "JJJ")]),
+    "zigzag": (2.0, 0.35, [(0, "A.."), (1, "..A"), (2, "A..")]),
+    "jump_then_dodge": (2.0, 0.5, [(0, "JJJ"), (1.2, "AA.")]),
+    "corridor": (1.0, 0.55, [(0, "A.A"), (1, "A.A"), (2, "A.A")]),
+    "mixed_wall": (1.5, 0.6, [(0, "AJA")]),
+    "staircase": (1.5, 0.65, [(0, "AA."), (1, ".AA"), (2, "AA.")]),
+    "double_jump_wall": (1.0, 0.75, [(0, "JJJ"), (1.6, "JJJ")]),
+}
+
+# batida base = spawn_interval * BEAT_FRACTION (dividida pela densidade)
+BEAT_FRACTION = 0.6
+# folga aplicada aos tempos de reação/voo na checagem (a velocidade sobe
+# enquanto o trecho ainda está na tela)
+SAFETY = 1.15
+# antecedência mínima do pulo até o obstáculo chegar (pés acima do limiar)
+JUMP_LEAD = 0.1
+
+
+def difficulty_at(elapsed, evaded, tuning):
+    """Dificuldade 0..1 pelo tempo de rodada ou pelos desvios (o que for maior)."""
+    by_time = elapsed / max(tuning.get("ramp_time", 90), 1e-6)
+    by_score = evaded / max(tuning.get("ramp_evades", 150), 1)
+    return max(0.0, min(1.0, max(by_time, by_score)))
+
+
+def jump_airtime(tuning, fps=FPS):
+    """Segundos no ar de um pulo (física por frame do Player)."""
+    v = abs(tuning.get("jump_velocity", -16))
+    g = tuning.get("gravity", 1.0)
+    return 2.0 * v / g / fps
+
+
+def reachable(states, gap, cells, occupancy, switch_time, airtime, t_row):
+    """
+    Um passo da checagem: 'states' é {lane: instante em que pode pular de
+    novo} na linha anterior; devolve o mesmo para a linha em 't_row'.
+    - gap: segundos desde a linha anterior
+    - occupancy: segundos que uma linha leva para passar pelo jogador
+    """
+    moves = max(0, int((gap - occupancy * SAFETY) / (switch_time * SAFETY) + 1e-9))
+    result = {}
+    n = len(cells)
+    for lane, free_at in states.items():
+        for dest in range(max(0, lane - moves), min(n, lane + moves + 1)):
+            cell = cells[dest]
+            if cell == EMPTY:
+                nxt = free_at
+            elif cell == JUMP and free_at <= t_row - JUMP_LEAD:
+                nxt = t_row + airtime * SAFETY
+            else:
+                continue
+            if dest not in result or nxt < result[dest]:
+                result[dest] = nxt
+    return result
+
+
+def _fit_cells(cells, n_lanes, offset, mirror):
+    if mirror:
+        cells = cells[::-1]
+    row = [EMPTY] * n_lanes
+    for i, c in enumerate(cells):
+        if 0 <= offset + i < n_lanes:
+            row[offset + i] = c
+    return "".join(row)
+
+
+class PatternGenerator:
+    def __init__(self, tuning, rng, lookahead=3.0, fps=FPS):
+        """
+        tuning: seção "gameplay" (speed, spawn_interval, lanes, ramp_* ...)
+        rng: random.Random da rodada (mesma semente -> mesmos trechos)
+        lookahead: segundos de spawns mantidos prontos na fila
+        """
+        self.rng = rng
+        self.lookahead = lookahead
+        self.fps = fps
+        self.difficulty = 0.0
+        self.last_pattern = None
+        self._queue = deque()
+        self.apply_tuning(tuning)
+        self.speed = self.base_speed
+        # primeiro trecho depois de um intervalo base, como no modo clássico
+        self._horizon = self.interval
+        # jogador começa na lane central, livre para pular
+        self._states = {self.n_lanes // 2: 0.0}
+        self._last_row = 0.0
+        self._names = list(PATTERNS)
+
+    def apply_tuning(self, tuning):
+        self.tuning = dict(tuning)
+        self.base_speed = float(tuning.get("speed", 220))
+        self.interval = float(tuning.get("spawn_interval", 1.2))
+        self.jitter = float(tuning.get("spawn_jitter", 1.6))
+        self.n_lanes = len(tuning.get("lanes", (0, 0, 0)))
+        self.max_speed_scale = float(tuning.get("max_speed_scale", 1.8))
+        self.max_density_scale = float(tuning.get("max_density_scale", 2.0))
+        self.switch_time = float(tuning.get("switch_time", 0.3))
+        self.airtime = jump_airtime(tuning, self.fps)
+        ob_h = tuning.get("obstacle_size", OBSTACLE_SIZE)[1]
+        pl_h = tuning.get("player_size", PLAYER_SIZE)[1]
+        self._contact = ob_h + pl_h
+        # estados de lanes que deixaram de existir
+        if hasattr(self, "_states"):
+            self._states = {
+                min(lane, self.n_lanes - 1): t for lane, t in self._states.items()
+            }
+
+    def _scales(self, difficulty):
+        speed = self.base_speed * (1 + (self.max_speed_scale - 1) * difficulty)
+        density = 1 + (self.max_density_scale - 1) * difficulty
+        return speed, density
+
+    def _candidate(self, difficulty):
+        names = [n for n in self._names if PATTERNS[n][1] <= difficulty]
+        weights = [PATTERNS[n][0] for n in names]
+        name = self.rng.choices(names, weights)[0]
+        offset = self.rng.randrange(max(1, self.n_lanes - 2))
+        mirror = self.rng.random() < 0.5
+        rows = [
+            (beat, _fit_cells(cells, self.n_lanes, offset, mirror))
+            for beat, cells in PATTERNS[name][2]
+        ]
+        return name, rows
+
+    def _next_chunk(self, difficulty, tries=8):
+        speed, density = self._scales(difficulty)
+        occupancy = self._contact / speed
+        # batida nunca menor que o necessário para trocar uma lane entre linhas
+        beat = max(
+            self.interval * BEAT_FRACTION / density,
+            (occupancy + self.switch_time) * SAFETY,
+        )
+        start = self._horizon
+        for _ in range(tries):
+            name, rows = self._candidate(difficulty)
+            states, last = self._states, self._last_row
+            spawns = []
+            for b, cells in rows:
+                t = start + b * beat
+                states = reachable(
+                    states,
+                    t - last,
+                    cells,
+                    occupancy,
+                    self.switch_time,
+                    self.airtime,
+                    t,
+                )
+                if not states:
+                    break
+                last = t
+                for lane, c in enumerate(cells):
+                    if c != EMPTY:
+                        spawns.append((t, lane, CELL_KINDS[c], speed))
+            if states:
+                self._states, self._last_row = states, last
+                self.last_pattern = name
+                self._queue.extend(spawns)
+                end = last
+                break
+        else:
+            # nenhum candidato resolúvel: respiro sem obstáculos
+            self.last_pattern = None
+            end = start
+        gap = self.rng.uniform(self.interval, self.interval * self.jitter) / density
+        self._horizon = max(end + gap, start + gap)
+
+    def due(self, elapsed, evaded=0):
+        """
+        Spawns vencidos até 'elapsed' (segundos de rodada) como
+        [(lane, tipo)]. Gera novos trechos quando a fila fica curta; speed
+        passa a ser a do trecho do último spawn liberado.
+        """
+        while self._horizon < elapsed + self.lookahead:
+            self.difficulty = difficulty_at(elapsed, evaded, self.tuning)
+            self._next_chunk(self.difficulty)
+        out = []
+        queue = self._queue
+        while queue and queue[0][0] <= elapsed:
+            _, lane, kind, self.speed = queue.popleft()
+            out.append((lane, kind))
+        return out
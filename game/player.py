@@ -1,54 +1,48 @@
 import os
 import pygame
-from game.assets_loader import load_image
-from game.settings import LANES
+from game.assets_loader import load_image, load_variant, scale_image
+from game.animation import player_animator
+from game.settings import GROUND_Y, LANES, PLAYER_SIZE
+from game.config import get_config
 
 
 class Player(pygame.sprite.Sprite):
-    def __init__(self, image_path=None, pos=None, *args, **kwargs):
+    def __init__(self, image_path=None, pos=None, *args, tuning=None, **kwargs):
         """
         image_path: caminho para a imagem do personagem (pode ser None)
         pos: opcional (topleft) — se None, posiciona na lane central e no chão (GROUND_Y)
+        tuning: parâmetros de jogabilidade (ver game.config DEFAULT_GAMEPLAY);
+                se None usa a seção "gameplay" da config
+
+        A imagem vem do Animator (run/jump/slide/hit, quadros prontos em
+        game.animation) e avança com o dt de update(); self.mask acompanha o
+        quadro. Deslizando, o rect e a máscara — o que check_collision usa —
+        ficam mais baixos (slide_height).
         """
         super().__init__(*args, **kwargs)
 
-        # tamanho do jogador
-        w, h = 48, 48
-
-        # tenta carregar a imagem escolhida pelo menu e usá-la diretamente
-        loaded = None
-        if image_path:
+        if tuning is None:
             try:
-                loaded = load_image(image_path, size=(w, h), use_alpha=True)
+                tuning = get_config().gameplay()
             except Exception:
-                loaded = None
-
-        if loaded:
-            sw, sh = loaded.get_size()
-            if (sw, sh) != (w, h):
-                try:
-                    loaded = pygame.transform.smoothscale(loaded, (w, h))
-                except Exception:
-                    loaded = pygame.transform.scale(loaded, (w, h))
-            self.image = loaded
-        else:
-            # fallback: quadrado vermelho
-            base = pygame.Surface((w, h), pygame.SRCALPHA)
-            base.fill((200, 50, 50))
-            self.image = base
-
-        # determinar posição vertical do chão (GROUND_Y) se existir em settings
-        try:
-            from game.settings import GROUND_Y
+                tuning = {}
+        self.image_path = image_path
+        # estado de movimento
+        self._vel_y = 0
+        self.is_jumping = False
+        self.is_sliding = False
+        self._slide_left = 0.0
+        self._hit_left = 0.0
+        self.apply_tuning(tuning)
+        self.image = self._load_image()
 
-            ground_y = GROUND_Y
-        except Exception:
-            ground_y = 500  # fallback
+        # posição vertical do chão (config gameplay.ground_y)
+        ground_y = self._ground_y
 
-        # determinar lane inicial (centro) e posicao x via LANES
+        # determinar lane inicial (centro) e posicao x via lanes
         try:
-            self.current_lane = 1 if len(LANES) > 1 else 0
-            start_x = LANES[self.current_lane]
+            self.current_lane = len(self._lanes) // 2
+            start_x = self._lanes[self.current_lane]
         except Exception:
             # fallback: usar posição fornecida ou 100
             self.current_lane = 0
@@ -59,39 +53,142 @@ class Player(pygame.sprite.Sprite):
         self.rect.centerx = start_x
         self.rect.bottom = ground_y
 
-        # estado de movimento
-        self._vel_y = 0
-        self.is_jumping = False
-        self.is_sliding = False
+    def _load_image(self):
+        # tamanho do jogador (config gameplay.player_size)
+        w, h = self._size
 
-        # parâmetros de física (podem ser ajustados)
-        try:
-            from game.settings import JUMP_VELOCITY, GRAVITY
+        # tenta carregar a imagem escolhida pelo menu e usá-la diretamente
+        loaded = None
+        if self.image_path:
+            try:
+                # variante 48x48 já esticada (atlas/bake); senão carrega e escala
+                loaded = load_variant("exact", self.image_path, (w, h))
+                if loaded is None:
+                    loaded = load_image(self.image_path, size=(w, h), use_alpha=True)
+            except Exception:
+                loaded = None
 
-            self._jump_velocity = JUMP_VELOCITY
-            self._gravity = GRAVITY
-        except Exception:
-            self._jump_velocity = -16  # pixels por frame inicial
-            self._gravity = 1.0  # incremento por frame
+        if loaded:
+            sw, sh = loaded.get_size()
+            if (sw, sh) != (w, h):
+                loaded = scale_image(loaded, (w, h))
+            base = loaded
+        else:
+            # fallback: quadrado vermelho
+            base = pygame.Surface((w, h), pygame.SRCALPHA)
+            base.fill((200, 50, 50))
+        # todos os quadros de todas as animações, escalados uma vez (em cache)
+        self.animator = player_animator(self.image_path, base, (w, h), self._slide_size)
+        self.animator.play(self._animation_state())
+        # máscara do quadro (colisão por pixel), já pronta no cache
+        self.mask = self.animator.mask
+        return self.animator.image
+
+    @property
+    def lanes(self):
+        """Centros x das lanes (pixels)."""
+        return tuple(self._lanes)
+
+    @property
+    def ground_y(self):
+        """Base do player no chão (pixels)."""
+        return self._ground_y
+
+    @property
+    def _slide_size(self):
+        w, h = self._size
+        return (w, max(1, int(round(h * self._slide_height))))
+
+    def _animation_state(self):
+        if self.is_sliding:
+            return "slide"
+        if self._hit_left > 0:
+            return "hit"
+        if self.is_jumping:
+            return "jump"
+        return "run"
+
+    def _set_frame(self):
+        """Imagem do quadro atual; o rect só muda se o tamanho mudar (deslize)."""
+        image = self.animator.image
+        if image is not self.image:
+            self.image = image
+            self.mask = self.animator.mask
+            if image.get_size() != self.rect.size:
+                self.rect = image.get_rect(midbottom=self.rect.midbottom)
+
+    def reload_image(self):
+        """Recarrega a imagem (arquivo ou tamanho mudou) mantendo a posição."""
+        self.image = self._load_image()
+        if hasattr(self, "rect"):
+            midbottom = self.rect.midbottom
+            self.rect = self.image.get_rect(midbottom=midbottom)
+
+    def apply_tuning(self, tuning):
+        """
+        Aplica lanes, chão, tamanho e física do pulo (chaves ausentes mantêm o
+        valor atual). Com o player já criado, reposiciona x na lane atual.
+        """
+        size = tuple(tuning.get("player_size", getattr(self, "_size", PLAYER_SIZE)))
+        slide_height = tuning.get("slide_height", getattr(self, "_slide_height", 0.5))
+        resized = hasattr(self, "image") and (
+            size != self._size or slide_height != self._slide_height
+        )
+        self._size = size
+        self._slide_height = slide_height
+        if resized:
+            self.reload_image()
+        self._lanes = list(tuning.get("lanes", getattr(self, "_lanes", LANES)))
+        self._ground_y = tuning.get("ground_y", getattr(self, "_ground_y", GROUND_Y))
+        # pixels por frame inicial / incremento por frame
+        self._jump_velocity = tuning.get(
+            "jump_velocity", getattr(self, "_jump_velocity", -16)
+        )
+        self._gravity = tuning.get("gravity", getattr(self, "_gravity", 1.0))
+        self._slide_time = tuning.get("slide_time", getattr(self, "_slide_time", 0.6))
+        if hasattr(self, "rect") and self._lanes:
+            self.current_lane = min(self.current_lane, len(self._lanes) - 1)
+            self.rect.centerx = self._lanes[self.current_lane]
+            if not self.is_jumping:
+                self.rect.bottom = self._ground_y
 
     def switch_lane(self, direction):
         new_lane = self.current_lane + direction
         try:
-            if 0 <= new_lane < len(LANES):
+            if 0 <= new_lane < len(self._lanes):
                 self.current_lane = new_lane
-                self.rect.centerx = LANES[self.current_lane]
+                self.rect.centerx = self._lanes[self.current_lane]
         except Exception:
             # fallback: ajustar em pixels
             self.rect.x += direction * 100
 
     def jump(self):
         if not self.is_jumping:
+            # pular encerra o deslize
+            self.is_sliding = False
+            self._slide_left = 0.0
             self.is_jumping = True
             self._vel_y = self._jump_velocity
+            self.animator.play("jump", restart=True)
+            self._set_frame()
 
     def slide(self):
-        # ...existing code...
-        pass
+        """
+        Desliza por slide_time segundos (só no chão): hitbox mais baixa.
+        Com a visão de cima e os obstáculos descendo a tela, a hitbox menor só
+        atrasa o contato em poucos pixels — nenhum tipo de obstáculo é
+        evitado deslizando (ObstacleManager.check_collision); é visual.
+        """
+        if self.is_jumping or self.is_sliding:
+            return
+        self.is_sliding = True
+        self._slide_left = self._slide_time
+        self.animator.play("slide", restart=True)
+        self._set_frame()
+
+    def hit(self, duration=0.4):
+        """Pisca por 'duration' segundos (chamado quando há colisão)."""
+        self._hit_left = duration
 
     def update(self, dt):
         # atualiza pulo por frame (mantém compatibilidade com update simples)
@@ -100,17 +197,23 @@ class Player(pygame.sprite.Sprite):
             self.rect.y += int(self._vel_y)
             # aplica "gravidade"
             self._vel_y += self._gravity
-            # aterrissagem: detectar chão (GROUND_Y)
-            try:
-                from game.settings import GROUND_Y
-
-                ground_y = GROUND_Y
-            except Exception:
-                ground_y = 500
+            # aterrissagem: detectar chão (ground_y)
+            ground_y = self._ground_y
             if self.rect.bottom >= ground_y:
                 self.rect.bottom = ground_y
                 self.is_jumping = False
                 self._vel_y = 0
+        if self.is_sliding:
+            self._slide_left -= dt
+            if self._slide_left <= 0:
+                self.is_sliding = False
+        if self._hit_left > 0:
+            self._hit_left -= dt
+
+        # animação no relógio da simulação
+        self.animator.play(self._animation_state())
+        self.animator.update(dt)
+        self._set_frame()
 
     def draw(self, screen):
         screen.blit(self.image, self.rect)
@@ -0,0 +1,295 @@
+"""
+Filtros dos landmarks da pose antes da classificação de gestos.
+
+Cada filtro recebe os pontos usados pelas regras — array (P, 2) de x, y
+normalizados — e o instante do quadro (segundos), e devolve os pontos
+filtrados. Tudo é vetorizado sobre os pontos (alguns µs por quadro); run()
+filtra uma sessão inteira (N, P, 2) de uma vez.
+
+- "one_euro": passa-baixa com corte adaptativo (One Euro filter): parado,
+  corte baixo (tira a tremida); em movimento, o corte sobe com a velocidade
+  (pouco atraso). Parâmetros: min_cutoff (Hz), beta, d_cutoff (Hz).
+- "kalman": Kalman de velocidade constante por coordenada. Parâmetros: q
+  (ruído de processo, aceleração) e r (variância da medida).
+- "mean": média dos últimos 'window' quadros (o comportamento antigo).
+- "none": sem filtro.
+
+evaluate() mede, numa sessão gravada (testReconhecimento.py --record), o
+atraso (ms) e a tremida que sobra de um filtro; tune() procura os parâmetros
+de menor atraso para uma tremida máxima. Linha de comando:
+  python -m game.pose_filters sessao.npz [--jitter 0.002]
+"""
+
+import math
+import itertools
+
+import numpy as np
+
+
+class PointFilter:
+    """Base: step(pontos, t) por quadro; run() aplica numa sessão inteira."""
+
+    def reset(self):
+        pass
+
+    def step(self, x, t):
+        return x
+
+    def run(self, xs, times):
+        out = np.empty_like(xs)
+        for i in range(len(xs)):
+            out[i] = self.step(xs[i], times[i])
+        return out
+
+
+class NoFilter(PointFilter):
+    def run(self, xs, times):
+        return xs
+
+
+class MeanFilter(PointFilter):
+    def __init__(self, window=5):
+        self.window = max(1, int(window))
+        self.reset()
+
+    def reset(self):
+        self._ring = None
+        self._count = 0
+
+    def run(self, xs, times):
+        # média móvel com o fim da chamada anterior como começo
+        n = min(self._count, self.window - 1)
+        if n:
+            pos = self._count % self.window
+            hist = np.roll(self._ring, -pos, axis=0)[self.window - n :]
+            seq = np.concatenate([hist, xs])
+        else:
+            seq = np.asarray(xs, dtype=np.float64)
+        csum = np.concatenate([np.zeros((1,) + seq.shape[1:]), np.cumsum(seq, axis=0)])
+        end = np.arange(n + 1, len(seq) + 1)
+        start = np.maximum(0, end - self.window)
+        span = (end - start).reshape((-1,) + (1,) * (seq.ndim - 1))
+        out = ((csum[end] - csum[start]) / span).astype(xs.dtype)
+        self._push(xs)
+        return out
+
+    def _push(self, xs):
+        if self._ring is None:
+            self._ring = np.zeros((self.window,) + xs.shape[1:], np.float64)
+        xs = xs[-self.window :]
+        idx = (self._count + np.arange(len(xs))) % self.window
+        self._ring[idx] = xs
+        self._count += len(xs)
+
+    def step(self, x, t):
+        # um quadro: a soma do anel não depende da ordem
+        self._push(x[None])
+        n = min(self._count, self.window)
+        return (self._ring[:n].sum(axis=0) / n).astype(x.dtype)
+
+
+class OneEuroFilter(PointFilter):
+    def __init__(self, min_cutoff=1.0, beta=3.0, d_cutoff=3.0):
+        self.min_cutoff = float(min_cutoff)
+        self.beta = float(beta)
+        self.d_cutoff = float(d_cutoff)
+        self.reset()
+
+    def reset(self):
+        self._x = None
+        self._dx = None
+        self._t = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        # passa-baixa de 1ª ordem: alfa = 1 / (1 + tau / dt), tau = 1 / (2 pi fc)
+        return 1.0 / (1.0 + 1.0 / (2.0 * math.pi * cutoff * dt))
+
+    def step(self, x, t):
+        if self._x is None or t <= self._t:
+            if self._x is None:
+                self._x = np.array(x, dtype=np.float64)
+                self._dx = np.zeros_like(self._x)
+                self._t = t
+            return self._x.astype(x.dtype)
+        dt = t - self._t
+        self._t = t
+        a_d = self._alpha(self.d_cutoff, dt)
+        self._dx += a_d * ((x - self._x) / dt - self._dx)
+        cutoff = self.min_cutoff + self.beta * np.abs(self._dx)
+        self._x += self._alpha(cutoff, dt) * (x - self._x)
+        return self._x.astype(x.dtype)
+
+
+class KalmanFilter(PointFilter):
+    def __init__(self, q=0.03, r=3e-5):
+        self.q = float(q)
+        self.r = float(r)
+        self.reset()
+
+    def reset(self):
+        self._p = None
+        self._t = None
+
+    def step(self, x, t):
+        if self._p is None:
+            self._p = np.array(x, dtype=np.float64)
+            self._v = np.zeros_like(self._p)
+            # covariância [[p00, p01], [p01, p11]]: mesmo dt, q e r para todas
+            # as coordenadas -> a mesma matriz (escalares) serve para todas
+            self._cov = (self.r, 0.0, 1.0)
+            self._t = t
+            return self._p.astype(x.dtype)
+        dt = max(t - self._t, 1e-3)
+        self._t = t
+        q = self.q
+        p00, p01, p11 = self._cov
+        # previsão (velocidade constante, aceleração como ruído branco)
+        p00 += dt * (2 * p01 + dt * p11) + q * dt**3 / 3
+        p01 += dt * p11 + q * dt**2 / 2
+        p11 += q * dt
+        # correção
+        k0 = p00 / (p00 + self.r)
+        k1 = p01 / (p00 + self.r)
+        y = x - self._p - self._v * dt
+        self._p += self._v * dt + k0 * y
+        self._v += k1 * y
+        self._cov = ((1 - k0) * p00, (1 - k0) * p01, p11 - k1 * p01)
+        return self._p.astype(x.dtype)
+
+
+FILTERS = {
+    "none": NoFilter,
+    "mean": MeanFilter,
+    "one_euro": OneEuroFilter,
+    "kalman": KalmanFilter,
+}
+
+# grade de busca do tune()
+TUNE_GRID = {
+    "mean": {"window": [1, 2, 3, 4, 5, 6, 8]},
+    "one_euro": {
+        "min_cutoff": [0.1, 0.2, 0.3, 0.5, 0.7, 1.0, 1.5, 2.0, 3.0, 5.0],
+        "beta": [0.0, 1.0, 3.0, 10.0, 30.0, 100.0, 300.0],
+        "d_cutoff": [1.0, 3.0],
+    },
+    "kalman": {
+        "q": [0.001, 0.003, 0.01, 0.03, 0.1, 0.3, 1.0, 3.0, 10.0],
+        "r": [1e-6, 1e-5, 1e-4],
+    },
+}
+
+
+def make_filter(name="one_euro", **params):
+    """Filtro pelo nome (FILTERS); ValueError se não existir."""
+    cls = FILTERS.get(name)
+    if cls is None:
+        raise ValueError(f"filtro desconhecido: {name!r} ({', '.join(FILTERS)})")
+    return cls(**params)
+
+
+def _centered_mean(xs, k):
+    """Média centrada (sem atraso, não causal) de k quadros ao longo do eixo 0."""
+    pad = k // 2
+    ext = np.concatenate([np.repeat(xs[:1], pad, 0), xs, np.repeat(xs[-1:], pad, 0)])
+    csum = np.concatenate([np.zeros((1,) + xs.shape[1:]), np.cumsum(ext, axis=0)])
+    return (csum[k:] - csum[:-k]) / k
+
+
+def lag_and_jitter(raw, filtered, times, max_shift=15):
+    """
+    (atraso em ms, tremida) de 'filtered' em relação a 'raw' (N, ...).
+    Atraso: deslocamento que melhor alinha o filtrado a uma versão centrada
+    (sem atraso) do bruto, com refinamento parabólico entre quadros.
+    Tremida: RMS da variação de alta frequência que sobra no filtrado, na
+    metade mais parada da sessão (em movimento a tremida não aparece).
+    """
+    raw = np.asarray(raw, dtype=np.float64).reshape(len(raw), -1)
+    filtered = np.asarray(filtered, dtype=np.float64).reshape(len(filtered), -1)
+    ref = _centered_mean(raw, 5)
+    shifts = range(0, min(max_shift, len(raw) // 2) + 1)
+    err = np.array([np.mean((filtered[k:] - ref[: len(ref) - k]) ** 2) for k in shifts])
+    k = int(np.argmin(err))
+    frac = 0.0
+    if 0 < k < len(err) - 1:
+        den = err[k - 1] - 2 * err[k] + err[k + 1]
+        if den > 0:
+            frac = 0.5 * (err[k - 1] - err[k + 1]) / den
+    dt = float(np.median(np.diff(times))) if len(times) > 1 else 0.0
+
+    speed = np.abs(np.gradient(_centered_mean(raw, 9), axis=0))
+    still = speed <= np.median(speed, axis=0)
+    residual = filtered - _centered_mean(filtered, 5)
+    jitter = float(np.sqrt(np.mean(residual[still] ** 2))) if still.any() else 0.0
+    return 1000.0 * (k + frac) * dt, jitter
+
+
+def evaluate(name, params, points, times):
+    """
+    Filtra a sessão 'points' (N, P, 2), sem quadros NaN, e mede atraso e
+    tremida. -> dict com lag_ms, jitter e µs por quadro.
+    """
+    import time
+
+    filt = make_filter(name, **params)
+    points = np.asarray(points, dtype=np.float32)
+    t0 = time.perf_counter()
+    out = filt.run(points, times)
+    us = 1e6 * (time.perf_counter() - t0) / max(1, len(points))
+    lag, jitter = lag_and_jitter(points, out, times)
+    return {"filter": name, "params": params, "lag_ms": lag, "jitter": jitter, "us": us}
+
+
+def tune(points, times, max_jitter, names=("one_euro", "kalman", "mean")):
+    """
+    Para cada filtro, os parâmetros da TUNE_GRID com menor atraso cuja
+    tremida fica em até 'max_jitter'. -> lista de resultados do evaluate().
+    """
+    best = []
+    for name in names:
+        grid = TUNE_GRID[name]
+        found = None
+        for values in itertools.product(*grid.values()):
+            res = evaluate(name, dict(zip(grid, values)), points, times)
+            if res["jitter"] > max_jitter:
+                continue
+            if found is None or res["lag_ms"] < found["lag_ms"]:
+                found = res
+        if found is not None:
+            best.append(found)
+    return best
+
+
+def session_points(path):
+    """Pontos usados pelas regras (N, P, 2) e instantes de uma sessão .npz."""
+    from game.gestures import POINTS
+
+    data = np.load(path)
+    lm = data["landmarks"][:, POINTS, :2]
+    valid = np.isfinite(lm).all(axis=(1, 2))
+    return lm[valid], data["times"][valid]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Atraso e tremida dos filtros")
+    parser.add_argument("session", help="sessão gravada (testReconhecimento --record)")
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=None,
+        help="tremida máxima para o tune (padrão: a do filtro 'mean' antigo)",
+    )
+    args = parser.parse_args()
+
+    points, times = session_points(args.session)
+    base = evaluate("mean", {"window": 5}, points, times)
+    raw = evaluate("none", {}, points, times)
+    limit = args.jitter if args.jitter is not None else base["jitter"]
+    print(f"[pose_filters] {len(points)} quadros com pose, tremida máx {limit:.5f}")
+    for res in [raw, base] + tune(points, times, limit):
+        print(
+            f"  {res['filter']:<9}{res['lag_ms']:>8.1f} ms{res['jitter']:>10.5f}"
+            f"{res['us']:>8.1f} µs/quadro  {res['params']}"
+        )
@@ -0,0 +1,138 @@
+"""
+Carregamento paralelo de assets na inicialização.
+
+Arquivo + decode (SDL_image, frombytes, SDL_mixer) e escalas rodam em um pool
+de threads — essas chamadas liberam o GIL —, enquanto o convert_alpha(), que
+depende do display, fica na thread principal. Os resultados vão para os
+caches de game.assets_loader, então show_menu, Player e main.main passam a
+receber as superfícies/sons já prontos.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pygame
+
+from game.assets_loader import (
+    _convert,
+    _decode_sound,
+    _resolve_path,
+    atlas_image,
+    atlas_key,
+    baked_image,
+    cache_image,
+    cache_sound,
+    cache_variant,
+    find_first_sound_in_folder,
+    install_atlas,
+    read_atlas,
+)
+from game.atlas import variant_specs, render_spec
+
+
+def default_sound_paths():
+    """Efeitos sonoros usados durante a rodada (a música é tocada em streaming)."""
+    folder = _resolve_path(os.path.join("assets", "sounds"))
+    paths = []
+    if folder and os.path.isdir(folder):
+        for fname in sorted(os.listdir(folder)):
+            p = find_first_sound_in_folder(os.path.join(folder, fname))
+            if p and "music" not in fname.lower():
+                paths.append(p)
+    return paths
+
+
+class AssetPreloader:
+    """
+    Decodifica atlas, variantes de imagem e sons em paralelo.
+
+    progress: callable(done, total, label) chamado na thread principal a cada
+    item concluído — uma tela de carregamento pode desenhar a barra ali.
+    """
+
+    def __init__(self, workers=None, progress=None):
+        self.workers = workers or max(2, os.cpu_count() or 2)
+        self.progress = progress
+        self._done = 0
+        self._total = 0
+
+    def _tick(self, label):
+        self._done += 1
+        if self.progress:
+            try:
+                self.progress(self._done, self._total, label)
+            except Exception:
+                pass
+
+    @staticmethod
+    def _decode_variant(spec):
+        # roda na thread de trabalho: nada de convert() aqui
+        kind, path, size, _ = spec
+        img = baked_image(atlas_key(kind, path, size), convert=False)
+        if img is None:
+            img = render_spec(spec, convert=False)
+        return img
+
+    def run(self, specs=None, sounds=None, with_atlas=True):
+        """
+        Fase 1: atlas + sons. Fase 2: variantes que o atlas não cobre.
+        Retorna o número de itens carregados.
+        """
+        specs = variant_specs() if specs is None else specs
+        sounds = default_sound_paths() if sounds is None else sounds
+        mixer_ok = bool(pygame.mixer.get_init())
+        if not mixer_ok:
+            sounds = []
+        self._done = 0
+        self._total = len(specs) + len(sounds) + (1 if with_atlas else 0)
+        loaded = 0
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            jobs = {}
+            if with_atlas:
+                jobs[pool.submit(read_atlas)] = ("atlas", None)
+            for p in sounds:
+                jobs[pool.submit(_decode_sound, p)] = ("sound", p)
+            for fut in as_completed(jobs):
+                kind, arg = jobs[fut]
+                try:
+                    result = fut.result()
+                except Exception as e:
+                    print(f"[preloader] falha ao carregar {kind} {arg!r}: {e}")
+                    result = None
+                if result is not None:
+                    if kind == "atlas":
+                        install_atlas(*result)
+                    else:
+                        cache_sound(arg, result)
+                    loaded += 1
+                self._tick(kind if arg is None else os.path.basename(arg))
+
+            # o que o atlas já cobre não precisa de decode
+            pending = []
+            for spec in specs:
+                kind, path, size, _ = spec
+                if atlas_image(atlas_key(kind, path, size)) is not None:
+                    loaded += 1
+                    self._tick(os.path.basename(path))
+                else:
+                    pending.append(spec)
+
+            jobs = {pool.submit(self._decode_variant, spec): spec for spec in pending}
+            for fut in as_completed(jobs):
+                kind, path, size, use_alpha = jobs[fut]
+                try:
+                    img = fut.result()
+                except Exception as e:
+                    print(f"[preloader] falha ao carregar imagem {path!r}: {e}")
+                    img = None
+                if img is not None:
+                    # único passo dependente do display, na thread principal
+                    img = _convert(img, use_alpha)
+                    if kind == "fit":
+                        cache_image(path, size, use_alpha, img)
+                    else:
+                        cache_variant(atlas_key(kind, path, size), img)
+                    loaded += 1
+                self._tick(os.path.basename(path))
+        return loaded
@@ -0,0 +1,85 @@
+"""
+Detecção barata de presença na frente da câmera (sem MediaPipe).
+
+Cada quadro é reduzido para uma miniatura em cinza (INTER_AREA já tira o
+ruído do sensor) e comparado com a miniatura anterior: se uma fração
+'motion' dos pixels mudou mais que 'diff' níveis de cinza, houve movimento.
+Alguém está presente enquanto houve movimento (ou pose detectada, via
+keep_alive) nos últimos 'timeout' segundos — parado jogando, a pose mantém
+a presença; sala vazia, ela some depois do timeout. Um único quadro com
+movimento acorda na hora.
+
+O custo é o resize da imagem cheia (~0,1–0,3 ms em 640x480); com ninguém na
+frente, os consumidores (CameraPipeline, CameraController) pulam o
+Pose.process inteiro.
+"""
+
+import time
+
+import cv2
+import numpy as np
+
+
+class PresenceDetector:
+    def __init__(self, size=(64, 48), diff=18, motion=0.01, timeout=10.0):
+        """
+        size: (largura, altura) da miniatura comparada
+        diff: mudança de cinza (0..255) que conta como pixel alterado
+        motion: fração de pixels alterados que conta como movimento
+        timeout: segundos sem movimento nem pose até 'ausente'
+        """
+        self.size = tuple(size)
+        self.diff = diff
+        self.motion = motion
+        self.timeout = timeout
+        w, h = self.size
+        self._small = np.empty((h, w, 3), np.uint8)
+        self._gray = np.empty((h, w), np.uint8)
+        self._prev = np.empty((h, w), np.uint8)
+        self._delta = np.empty((h, w), np.uint8)
+        self._has_prev = False
+        self.last_seen = None
+        self.present = False
+        self.changed = 0.0  # fração alterada no último quadro (diagnóstico)
+
+    def update(self, frame, now=None):
+        """Processa um quadro BGR e devolve se há alguém presente."""
+        if now is None:
+            now = time.monotonic()
+        cv2.resize(frame, self.size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        if self._has_prev:
+            cv2.absdiff(self._gray, self._prev, dst=self._delta)
+            cv2.threshold(
+                self._delta, self.diff, 255, cv2.THRESH_BINARY, dst=self._delta
+            )
+            self.changed = cv2.countNonZero(self._delta) / float(self._delta.size)
+            if self.changed >= self.motion:
+                self.last_seen = now
+        else:
+            # primeiro quadro: assume alguém (quem abriu o jogo) até o timeout
+            self.last_seen = now
+            self._has_prev = True
+        self._prev, self._gray = self._gray, self._prev
+        return self._refresh(now)
+
+    def keep_alive(self, now=None):
+        """Pose detectada: conta como presença mesmo sem movimento."""
+        self.last_seen = time.monotonic() if now is None else now
+        self.present = True
+
+    def _refresh(self, now):
+        self.present = (
+            self.last_seen is not None and now - self.last_seen < self.timeout
+        )
+        return self.present
+
+
+def presence_options():
+    """kwargs do PresenceDetector pela config, ou None se desligado."""
+    from game.config import get_config
+
+    cfg = get_config()
+    if not cfg.get("presence_detection", True):
+        return None
+    return {"timeout": cfg.get("presence_timeout", 10.0)}
@@ -0,0 +1,280 @@
+"""
+Perfil da máquina e preset de qualidade.
+
+Os quiosques vão de dual-cores antigos a desktops novos; em vez de ajustar
+cada instalação à mão, a calibração mede a máquina e grava na config um dos
+PRESETS (resolução e ritmo da inferência, modelo do Pose, FPS alvo da
+rodada e escala dos assets):
+
+- pose: ms por Pose.process na resolução/modelo de cada preset (quadros
+  sintéticos, game.camera_bench)
+- render: ms para desenhar uma cena típica da rodada (fundo cheio, sprites
+  com alfa e HUD) numa superfície do formato da tela
+- assets: ms por megapixel para decodificar as imagens de assets/ e
+  reescalá-las com smoothscale
+
+O preset escolhido é o mais alto cujos custos cabem nos orçamentos
+(POSE_BUDGET, RENDER_BUDGET, ASSET_MS_PER_MPX). Roda sozinha na primeira
+execução (quality_preset null na config) e sob demanda:
+  python -m game.quality [--dry-run] [--preset low|medium|high]
+quality_preset "custom" mantém os valores ajustados à mão (sem calibrar).
+"""
+
+import io
+import os
+import time
+
+import pygame
+
+from game.settings import WIDTH, HEIGHT
+
+# do mais alto para o mais baixo; chaves gravadas na config
+PRESETS = {
+    "high": {
+        "camera_size": [640, 480],
+        "camera_model_complexity": 1,
+        "camera_fps": 0,  # 0 = todo quadro capturado
+        "target_fps": 60,
+        "smooth_scale": True,
+    },
+    "medium": {
+        "camera_size": [480, 360],
+        "camera_model_complexity": 0,
+        "camera_fps": 24,
+        "target_fps": 60,
+        "smooth_scale": True,
+    },
+    "low": {
+        "camera_size": [320, 240],
+        "camera_model_complexity": 0,
+        "camera_fps": 15,
+        "target_fps": 30,
+        "smooth_scale": False,
+    },
+}
+
+# fração de um núcleo que a inferência pode ocupar (metade com uma CPU só,
+# em que captura, inferência e jogo dividem o mesmo núcleo)
+POSE_BUDGET = 0.6
+# fração do tempo do quadro gasta desenhando (o resto: flip, eventos, sim)
+RENDER_BUDGET = 0.4
+# decode + smoothscale por megapixel aceitável para manter o smoothscale
+ASSET_MS_PER_MPX = 60.0
+# ritmo assumido quando camera_fps é 0 (câmera comum)
+CAMERA_RATE = 30
+
+
+def measure_pose(size, complexity, frames=40):
+    """ms médios por Pose.process em 'size', ou None sem MediaPipe/modelo."""
+    from game.camera_bench import bench
+
+    try:
+        res = bench("synthetic", tuple(size), complexity, frames, pose=True)
+    except Exception as e:
+        print(f"[quality] pose {size[0]}x{size[1]} modelo {complexity}: {e}")
+        return None
+    return res["ms"]["pose"] if res["frames"] else None
+
+
+def measure_render(frames=120, size=(WIDTH, HEIGHT)):
+    """ms por quadro da cena típica da rodada, desenhada fora da tela."""
+    screen = pygame.display.get_surface()
+    target = pygame.Surface(size, 0, screen) if screen else pygame.Surface(size)
+    background = pygame.Surface(size, 0, target)
+    background.fill((60, 60, 70))
+    sprite = pygame.Surface((64, 64), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, (220, 120, 40, 255), (32, 32), 30)
+    if not pygame.font.get_init():
+        pygame.font.init()
+    font = pygame.font.SysFont(None, 26)
+    t0 = time.perf_counter()
+    for i in range(frames):
+        target.blit(background, (0, 0))
+        for k in range(12):
+            target.blit(sprite, ((k * 71 + i * 5) % size[0], 120 + 30 * (k % 12)))
+        target.blit(font.render(f"Pontuação: {i}", True, (255, 255, 255)), (16, 16))
+        target.blit(font.render(f"Colisões: {k}", True, (255, 200, 60)), (16, 46))
+    return 1000.0 * (time.perf_counter() - t0) / frames
+
+
+def _sample_images(limit):
+    from game.assets_loader import ASSETS_PATH, IMAGE_EXTS
+
+    paths = []
+    for root, _, files in os.walk(ASSETS_PATH):
+        for fname in sorted(files):
+            if fname.lower().endswith(IMAGE_EXTS):
+                paths.append(os.path.join(root, fname))
+                if len(paths) >= limit:
+                    return paths
+    return paths
+
+
+def measure_assets(limit=8):
+    """
+    ms por megapixel para decodificar imagens de assets/ (ou uma PNG gerada,
+    sem assets) e para reescalá-las à metade com smoothscale e com scale.
+    """
+    blobs = []
+    for path in _sample_images(limit):
+        with open(path, "rb") as f:
+            blobs.append((f.read(), os.path.basename(path)))
+    if not blobs:
+        noise = pygame.image.frombytes(os.urandom(512 * 512 * 3), (512, 512), "RGB")
+        buf = io.BytesIO()
+        pygame.image.save(noise, buf, "amostra.png")
+        blobs.append((buf.getvalue(), "amostra.png"))
+
+    decode = smooth = fast = 0.0
+    mpx = 0.0
+    for data, name in blobs:
+        t0 = time.perf_counter()
+        img = pygame.image.load(io.BytesIO(data), name)
+        t1 = time.perf_counter()
+        w, h = img.get_size()
+        half = (max(1, w // 2), max(1, h // 2))
+        if img.get_bitsize() not in (24, 32):
+            # smoothscale só aceita 24/32 bits (no jogo o convert() resolve)
+            img32 = pygame.Surface(img.get_size(), pygame.SRCALPHA, 32)
+            img32.blit(img, (0, 0))
+            img = img32
+        t2 = time.perf_counter()
+        pygame.transform.smoothscale(img, half)
+        t3 = time.perf_counter()
+        pygame.transform.scale(img, half)
+        t4 = time.perf_counter()
+        decode += t1 - t0
+        smooth += t3 - t2
+        fast += t4 - t3
+        mpx += w * h / 1e6
+    mpx = max(mpx, 1e-6)
+    return {
+        "images": len(blobs),
+        "decode_ms_mpx": 1000.0 * decode / mpx,
+        "smooth_ms_mpx": 1000.0 * smooth / mpx,
+        "scale_ms_mpx": 1000.0 * fast / mpx,
+    }
+
+
+def _pose_fits(pose_ms, preset, cpus):
+    rate = preset["camera_fps"] or CAMERA_RATE
+    budget = POSE_BUDGET if cpus > 1 else POSE_BUDGET / 2
+    return pose_ms * rate <= 1000.0 * budget
+
+
+def _render_fits(render_ms, preset):
+    return render_ms * preset["target_fps"] <= 1000.0 * RENDER_BUDGET
+
+
+def _assets_fit(assets, preset):
+    if not preset["smooth_scale"]:
+        return True
+    return assets["decode_ms_mpx"] + assets["smooth_ms_mpx"] <= ASSET_MS_PER_MPX
+
+
+def calibrate(progress=None, pose_frames=40):
+    """
+    Mede a máquina e escolhe o preset. progress(done, total, label) é
+    chamado a cada etapa (tela de carregamento). A pose é medida do preset
+    mais alto para o mais baixo e para no primeiro que cabe; sem MediaPipe
+    a escolha fica em no máximo "medium". -> (nome, medidas)
+    """
+    cpus = os.cpu_count() or 1
+    total = 2 + len(PRESETS)
+    done = 0
+
+    def step(label):
+        nonlocal done
+        done += 1
+        if progress is not None:
+            progress(done, total, label)
+
+    measured = {"cpus": cpus, "pose_ms": {}}
+    measured["render_ms"] = measure_render()
+    step("render")
+    measured["assets"] = measure_assets()
+    step("assets")
+
+    chosen = None
+    pose_cache = {}
+    for name, preset in PRESETS.items():
+        key = (tuple(preset["camera_size"]), preset["camera_model_complexity"])
+        if key not in pose_cache:
+            pose_cache[key] = measure_pose(key[0], key[1], pose_frames)
+            measured["pose_ms"]["%dx%d/%d" % (key[0] + (key[1],))] = pose_cache[key]
+        step(name)
+        pose_ms = pose_cache[key]
+        if pose_ms is None:
+            # sem modelo não dá para garantir o preset mais pesado
+            if name == "high":
+                continue
+        elif not _pose_fits(pose_ms, preset, cpus):
+            continue
+        if _render_fits(measured["render_ms"], preset) and _assets_fit(
+            measured["assets"], preset
+        ):
+            chosen = name
+            break
+    if progress is not None:
+        progress(total, total, "")
+    return chosen or "low", measured
+
+
+def apply_preset(name, config=None):
+    """Grava os valores do preset 'name' e quality_preset na config."""
+    if config is None:
+        from game.config import get_config
+
+        config = get_config()
+    for key, value in PRESETS[name].items():
+        config.set(key, list(value) if isinstance(value, list) else value)
+    config.set("quality_preset", name)
+    config.flush()
+
+
+def needs_calibration(config=None):
+    """True na primeira execução (quality_preset ainda null)."""
+    if config is None:
+        from game.config import get_config
+
+        config = get_config()
+    return config.get("quality_preset") is None
+
+
+def format_report(name, measured):
+    lines = [f"[quality] {measured['cpus']} CPU(s) -> preset {name!r}"]
+    lines.append(f"  render   {measured['render_ms']:8.2f} ms/quadro")
+    a = measured["assets"]
+    lines.append(
+        f"  assets   decode {a['decode_ms_mpx']:.1f} ms/Mpx, smoothscale "
+        f"{a['smooth_ms_mpx']:.1f} ms/Mpx, scale {a['scale_ms_mpx']:.1f} ms/Mpx"
+        f" ({a['images']} imagens)"
+    )
+    for key, ms in measured["pose_ms"].items():
+        value = "indisponível" if ms is None else f"{ms:.1f} ms"
+        lines.append(f"  pose     {key:<12}{value}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Calibra o preset de qualidade")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="só mede e mostra (não grava)"
+    )
+    parser.add_argument(
+        "--preset", choices=tuple(PRESETS), help="grava este preset sem medir"
+    )
+    args = parser.parse_args()
+
+    if args.preset:
+        apply_preset(args.preset)
+        print(f"[quality] preset {args.preset!r} gravado na config")
+    else:
+        pygame.init()
+        name, measured = calibrate()
+        print(format_report(name, measured))
+        if not args.dry_run:
+            apply_preset(name)
+            print(f"[quality] preset {name!r} gravado na config")
@@ -0,0 +1,145 @@
+"""
+Replays de rodadas: seed + entradas com tick, reexecutáveis sem janela.
+
+O arquivo (data/replays/*.json) guarda só o necessário para a RoundSim
+repetir a rodada: seed, fps, regras, tuning inicial, mudanças de tuning
+(hot-reload) e as entradas como [tick, "LJ"]. O resultado gravado (ticks,
+pontuação, colisões e hash do estado final) permite conferir a reexecução.
+
+Uso: python -m game.replay data/replays/<arquivo>.json [--repeat N]
+"""
+
+import os
+import sys
+import json
+import time
+
+from game.assets_loader import PROJECT_ROOT, _project_relpath
+from game.round import RoundSim, CODE_ACTIONS
+
+# 2: velocidade do trecho aplicada quando ele entra na tela (game.patterns)
+REPLAY_VERSION = 2
+REPLAY_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "replays")
+MAX_REPLAYS = 50
+
+
+def replay_data(sim, player_name=None):
+    """Monta o dicionário do replay a partir de uma RoundSim já jogada."""
+    return {
+        "version": REPLAY_VERSION,
+        "seed": sim.seed,
+        "fps": sim.fps,
+        "player": player_name,
+        "sprite": _project_relpath(sim.sprite_path) if sim.sprite_path else None,
+        "rules": {
+            "max_collisions": sim.max_collisions,
+            "points_per_evade": sim.points_per_evade,
+        },
+        "tuning": sim.initial_tuning,
+        "tuning_changes": sim.tuning_changes,
+        "inputs": sim.inputs,
+        "result": {
+            "ticks": sim.tick,
+            "score": sim.score,
+            "collisions": sim.collisions,
+            "digest": sim.state_digest(),
+        },
+        "time": int(time.time()),
+    }
+
+
+def save_replay(sim, player_name=None, folder=None, keep=MAX_REPLAYS):
+    """
+    Grava o replay de 'sim' (tmp + rename atômico) e apaga os mais antigos
+    além de 'keep'. Retorna o caminho do arquivo.
+    """
+    folder = folder or REPLAY_PATH
+    os.makedirs(folder, exist_ok=True)
+    data = replay_data(sim, player_name)
+    path = os.path.join(
+        folder, time.strftime("%Y%m%d-%H%M%S") + f"-{sim.seed:08x}.json"
+    )
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+    os.replace(tmp, path)
+
+    if keep:
+        old = sorted(f for f in os.listdir(folder) if f.endswith(".json"))
+        for fname in old[:-keep]:
+            try:
+                os.remove(os.path.join(folder, fname))
+            except OSError:
+                pass
+    return path
+
+
+def load_replay(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != REPLAY_VERSION:
+        raise ValueError(f"versão de replay não suportada: {data.get('version')!r}")
+    return data
+
+
+def simulate(data):
+    """
+    Reexecuta o replay 'data' sem janela nem relógio, o mais rápido possível.
+    Retorna a RoundSim no estado final.
+    """
+    sprite = data.get("sprite")
+    rules = data.get("rules", {})
+    sim = RoundSim(
+        os.path.join(PROJECT_ROOT, sprite) if sprite else None,
+        seed=data["seed"],
+        tuning=data["tuning"],
+        max_collisions=rules.get("max_collisions", 10),
+        points_per_evade=rules.get("points_per_evade", 10),
+        fps=data.get("fps", 60),
+    )
+    inputs = {tick: codes for tick, codes in data.get("inputs", [])}
+    changes = {tick: tuning for tick, tuning in data.get("tuning_changes", [])}
+    ticks = data.get("result", {}).get("ticks")
+    while (ticks is None and not sim.over) or (ticks is not None and sim.tick < ticks):
+        if sim.tick in changes:
+            sim.apply_tuning(changes[sim.tick])
+        codes = inputs.get(sim.tick, "")
+        sim.step([CODE_ACTIONS[c] for c in codes])
+    return sim
+
+
+def verify(data):
+    """True se a reexecução chega ao mesmo resultado gravado."""
+    sim = simulate(data)
+    expected = data.get("result", {})
+    ok = (
+        sim.score == expected.get("score")
+        and sim.collisions == expected.get("collisions")
+        and sim.state_digest() == expected.get("digest")
+    )
+    sim.close()
+    return ok
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Reexecuta um replay sem janela")
+    parser.add_argument("path")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    data = load_replay(args.path)
+    ticks = data.get("result", {}).get("ticks", 0)
+    ok = True
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        ok = verify(data) and ok
+    elapsed = time.perf_counter() - t0
+    real = ticks / data.get("fps", 60) * args.repeat
+    print(
+        f"[replay] {ticks} ticks x{args.repeat} em {elapsed:.2f}s"
+        f" ({real / max(elapsed, 1e-9):.0f}x tempo real) — "
+        + ("resultado idêntico" if ok else "DIVERGIU do gravado")
+    )
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,144 @@
+"""
+Simulação de uma rodada, separada da janela e do relógio real.
+
+RoundSim avança em passos fixos de 1/FPS segundo: o mesmo seed, o mesmo
+tuning e as mesmas entradas nos mesmos ticks reproduzem a rodada exatamente
+(spawns, colisões e pontuação). main.py converte o tempo real em passos e só
+desenha; game.replay grava/reexecuta as entradas registradas aqui.
+"""
+
+import copy
+import random
+import hashlib
+
+from game.player import Player
+from game.obstacles import ObstacleManager
+from game.settings import FPS
+from game.config import get_config
+
+# ação -> código de uma letra usado no replay
+ACTION_CODES = {"LEFT": "L", "RIGHT": "R", "JUMP": "J", "DUCK": "D"}
+CODE_ACTIONS = {v: k for k, v in ACTION_CODES.items()}
+
+
+def new_seed():
+    """Seed aleatório de 32 bits para uma rodada nova."""
+    return random.SystemRandom().getrandbits(32)
+
+
+class RoundSim:
+    def __init__(
+        self,
+        sprite_path=None,
+        seed=None,
+        tuning=None,
+        max_collisions=10,
+        points_per_evade=10,
+        fps=FPS,
+    ):
+        """
+        sprite_path: imagem do personagem (ver Player)
+        seed: semente do RNG da rodada (padrão: new_seed())
+        tuning: seção "gameplay" (padrão: a da config, copiada)
+        fps: passos de simulação por segundo
+        """
+        self.sprite_path = sprite_path
+        self.seed = new_seed() if seed is None else int(seed)
+        self.rng = random.Random(self.seed)
+        self.tuning = copy.deepcopy(
+            tuning if tuning is not None else get_config().gameplay()
+        )
+        self.initial_tuning = copy.deepcopy(self.tuning)
+        self.max_collisions = max_collisions
+        self.points_per_evade = points_per_evade
+        self.fps = fps
+        self.dt = 1.0 / fps
+
+        self.player = Player(sprite_path, tuning=self.tuning)
+        self.obstacles = ObstacleManager(tuning=self.tuning, rng=self.rng)
+
+        self.tick = 0
+        self.score = 0
+        self.collisions = 0
+        # inicializar prev a partir dos contadores do manager
+        self._prev_coll = self.obstacles.collision_count
+        self._prev_evade = self.obstacles.evaded_count
+
+        # registro para o replay: [tick, "LJ"] e [tick, tuning]
+        self.inputs = []
+        self.tuning_changes = []
+
+    @property
+    def over(self):
+        return self.collisions >= self.max_collisions
+
+    def apply_tuning(self, tuning):
+        """Aplica tuning novo a partir do próximo tick (e registra no replay)."""
+        self.tuning = copy.deepcopy(tuning)
+        self.tuning_changes.append([self.tick, self.tuning])
+        self.obstacles.apply_tuning(self.tuning)
+        self.player.apply_tuning(self.tuning)
+
+    def step(self, actions=()):
+        """
+        Avança um tick aplicando 'actions' ("LEFT"/"RIGHT"/"JUMP"/"DUCK", na
+        ordem recebida). Retorna o resultado de check_collision do tick.
+        """
+        codes = "".join(ACTION_CODES[a] for a in actions if a in ACTION_CODES)
+        if codes:
+            self.inputs.append([self.tick, codes])
+        player = self.player
+        for code in codes:
+            if code == "L":
+                player.switch_lane(-1)
+            elif code == "R":
+                player.switch_lane(+1)
+            elif code == "J":
+                player.jump()
+            elif code == "D":
+                player.slide()
+
+        player.update(self.dt)
+        self.obstacles.update(self.dt)
+
+        # checa colisões/evitações via método do manager
+        try:
+            res = self.obstacles.check_collision(player)
+        except Exception:
+            res = None
+        if isinstance(res, int) and not isinstance(res, bool) and res > 0:
+            # evadidos retornados diretamente
+            self.score += self.points_per_evade * res
+
+        # ler contadores do ObstacleManager e aplicar deltas
+        delta = self.obstacles.collision_count - self._prev_coll
+        if delta > 0:
+            self.collisions += delta
+            player.hit()
+        self._prev_coll = self.obstacles.collision_count
+        delta_ev = self.obstacles.evaded_count - self._prev_evade
+        if delta_ev > 0:
+            self.score += self.points_per_evade * delta_ev
+        self._prev_evade = self.obstacles.evaded_count
+
+        self.tick += 1
+        return res
+
+    def state_digest(self):
+        """Hash curto do estado atual (confere se um replay reproduziu a rodada)."""
+        h = hashlib.sha1()
+        h.update(repr((self.tick, self.score, self.collisions)).encode())
+        h.update(repr(tuple(self.player.rect)).encode())
+        for spr in sorted(
+            self.obstacles.obstacle_sprites, key=lambda s: (s.rect.y, s.rect.x)
+        ):
+            h.update(repr((tuple(spr.rect), spr.lane, spr.ob_type)).encode())
+        h.update(repr(self.rng.getstate()).encode())
+        return h.hexdigest()[:16]
+
+    def close(self):
+        try:
+            self.player.kill()
+        except Exception:
+            pass
+        self.obstacles.clear()
@@ -0,0 +1,188 @@
+"""
+Backend SQLite opcional para o placar (config: "score_backend": "sqlite").
+
+Mesma interface de game.score_store.ScoreStore (add/flush/all/top/rank_of/
+close), com consultas indexadas: a posição no ranking do popup de fim de jogo
+sai do histograma score_counts sem contar o histórico.
+
+- journal em WAL + synchronous=NORMAL: leitores não bloqueiam o escritor
+- índices em score e (player, score): top-N e recordes viram
+  buscas em índice em vez de varrer o histórico
+- na primeira abertura importa data/score.json + data/score.log
+"""
+
+import os
+import json
+import uuid
+import sqlite3
+import threading
+
+from game.score_store import DATA_PATH, SCORE_PATH, JOURNAL_PATH, ScoreStore
+
+DB_PATH = os.path.join(DATA_PATH, "score.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    uid TEXT UNIQUE,
+    score INTEGER NOT NULL,
+    player TEXT,
+    time INTEGER NOT NULL DEFAULT 0,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_scores_score ON scores (score DESC);
+CREATE INDEX IF NOT EXISTS idx_scores_player_score ON scores (player, score DESC);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+-- histograma por (personagem, pontuação): o rank soma poucas linhas
+-- (pontuações distintas) em vez de contar o histórico inteiro
+CREATE TABLE IF NOT EXISTS score_counts (
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (player, score)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS trg_scores_count AFTER INSERT ON scores
+BEGIN
+    INSERT INTO score_counts (player, score, n) VALUES ('*', NEW.score, 1)
+        ON CONFLICT (player, score) DO UPDATE SET n = n + 1;
+    INSERT INTO score_counts (player, score, n)
+        SELECT NEW.player, NEW.score, 1 WHERE NEW.player IS NOT NULL
+        ON CONFLICT (player, score) DO UPDATE SET n = n + 1;
+END;
+"""
+
+_BASE_FIELDS = ("id", "score", "player", "time")
+
+
+class SQLiteScoreStore:
+    def __init__(self, db_path=None, snapshot_path=None, journal_path=None, top_n=10):
+        """
+        db_path: arquivo SQLite (padrão data/score.db)
+        snapshot_path/journal_path: origem da migração JSON (padrão data/score.json/.log)
+        """
+        self.db_path = db_path or DB_PATH
+        self.top_n = top_n
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate_json(snapshot_path or SCORE_PATH, journal_path or JOURNAL_PATH)
+
+    # --- migração ----------------------------------------------------------
+
+    def _migrate_json(self, snapshot_path, journal_path):
+        with self._lock:
+            done = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'migrated_json'"
+            ).fetchone()
+            if done:
+                return
+        # ScoreStore já resolve snapshot + journal (sem duplicar ids)
+        entries = ScoreStore(snapshot_path, journal_path, compact_every=0).all()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO scores (uid, score, player, time, extra)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [self._row(e) for e in entries],
+            )
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('migrated_json', ?)",
+                (str(len(entries)),),
+            )
+        if entries:
+            print(f"[score_sqlite] {len(entries)} pontuações importadas do JSON")
+
+    # --- conversão ---------------------------------------------------------
+
+    @staticmethod
+    def _row(entry):
+        extra = {k: v for k, v in entry.items() if k not in _BASE_FIELDS}
+        try:
+            score = int(entry.get("score", 0))
+        except Exception:
+            score = 0
+        return (
+            entry.get("id"),
+            score,
+            entry.get("player"),
+            int(entry.get("time", 0) or 0),
+            json.dumps(extra, ensure_ascii=False) if extra else None,
+        )
+
+    @staticmethod
+    def _entry(row):
+        entry = {"score": row["score"], "player": row["player"], "time": row["time"]}
+        if row["uid"]:
+            entry["id"] = row["uid"]
+        if row["extra"]:
+            try:
+                entry.update(json.loads(row["extra"]))
+            except ValueError:
+                pass
+        return entry
+
+    # --- interface comum com ScoreStore ------------------------------------
+
+    @property
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def add(self, entry, sync=True):
+        # o uid (id da entrada) é único: uma nova tentativa com o mesmo id é
+        # ignorada
+        entry = dict(entry)
+        entry.setdefault("id", uuid.uuid4().hex)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO scores (uid, score, player, time, extra)"
+                " VALUES (?, ?, ?, ?, ?)",
+                self._row(entry),
+            )
+        return entry
+
+    def flush(self):
+        # cada add já é uma transação; um checkpoint leva o WAL ao arquivo principal
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def all(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM scores ORDER BY score DESC, time DESC"
+            ).fetchall()
+        return [self._entry(r) for r in rows]
+
+    def top(self, n=None, player=None):
+        n = n or self.top_n
+        with self._lock:
+            if player:
+                rows = self._conn.execute(
+                    "SELECT * FROM scores WHERE player = ?"
+                    " ORDER BY score DESC LIMIT ?",
+                    (player, n),
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT * FROM scores ORDER BY score DESC LIMIT ?", (n,)
+                ).fetchall()
+        return [self._entry(r) for r in rows]
+
+    def rank_of(self, score, player=None):
+        """Posição (1 = melhor) que 'score' ocupa no ranking geral ou do personagem."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(n), 0) FROM score_counts"
+                " WHERE player = ? AND score > ?",
+                (player or "*", score),
+            ).fetchone()
+        return row[0] + 1
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
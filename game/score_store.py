@@ -0,0 +1,248 @@
+"""
+Armazenamento de pontuações com journal append-only.
+
+- data/score.json continua sendo o snapshot (lista ordenada decrescente, mesmo
+  formato de antes) e só é reescrito na compactação, via arquivo temporário +
+  os.replace (rename atômico).
+- Cada partida vira uma linha JSON em data/score.log: gravar uma pontuação é
+  O(1) em I/O, independente do histórico.
+- Um heap top-N por personagem (e um geral) fica em memória para consultas do
+  placar sem varrer o histórico, e uma lista ordenada das pontuações de cada
+  um responde rank_of() por busca binária (sem reler os arquivos).
+- Cada registro recebe um "id"; ao abrir, registros do journal cujo id já está
+  no snapshot são ignorados — assim um crash entre gravar o snapshot e truncar
+  o journal não duplica entradas, e um id repetido no próprio journal (nova
+  tentativa do ScoreWriter) conta uma vez só. Uma linha final truncada (crash
+  no meio do append) é descartada.
+"""
+
+import os
+import json
+import heapq
+import uuid
+import bisect
+import threading
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data")
+SCORE_PATH = os.path.join(DATA_PATH, "score.json")
+JOURNAL_PATH = os.path.join(DATA_PATH, "score.log")
+
+ALL_PLAYERS = "*"
+
+
+class ScoreStore:
+    def __init__(
+        self, snapshot_path=None, journal_path=None, top_n=10, compact_every=500
+    ):
+        """
+        snapshot_path/journal_path: arquivos (padrão data/score.json e data/score.log)
+        top_n: tamanho dos heaps em memória por personagem
+        compact_every: registros no journal que disparam uma compactação
+        """
+        self.snapshot_path = snapshot_path or SCORE_PATH
+        self.journal_path = journal_path or JOURNAL_PATH
+        self.top_n = top_n
+        self.compact_every = compact_every
+        self.count = 0
+        self._journal_count = 0
+        self._seq = 0
+        self._heaps = {}
+        # pontuações em ordem crescente por personagem (e geral), para o rank
+        self._scores = {}
+        self._journal = None
+        # o ScoreWriter grava de outra thread enquanto o jogo consulta o placar
+        self._lock = threading.RLock()
+        self._load()
+
+    # --- carga -------------------------------------------------------------
+
+    def _read_snapshot(self):
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, list) else []
+        except Exception:
+            return []
+
+    def _read_journal(self, skip_ids=()):
+        entries = []
+        seen = set(skip_ids)
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # linha parcial de um append interrompido
+                        continue
+                    uid = entry.get("id")
+                    if uid is not None:
+                        if uid in seen:
+                            continue
+                        seen.add(uid)
+                    entries.append(entry)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[score_store] falha ao ler journal {self.journal_path!r}: {e}")
+        return entries
+
+    def _load(self):
+        snapshot = self._read_snapshot()
+        ids = {e.get("id") for e in snapshot if e.get("id")}
+        journal = self._read_journal(ids)
+        for entry in snapshot:
+            self._index(entry, loading=True)
+        for entry in journal:
+            self._index(entry, loading=True)
+        # na carga as pontuações entram fora de ordem: ordena uma vez só
+        for scores in self._scores.values():
+            scores.sort()
+        self.count = len(snapshot) + len(journal)
+        self._journal_count = len(journal)
+
+    # --- índices em memória -----------------------------------------------
+
+    def _index(self, entry, loading=False):
+        try:
+            score = int(entry.get("score", 0))
+        except Exception:
+            score = 0
+        self._seq += 1
+        item = (score, -int(entry.get("time", 0) or 0), self._seq, entry)
+        for key in (ALL_PLAYERS, entry.get("player")):
+            if key is None:
+                continue
+            scores = self._scores.setdefault(key, [])
+            if loading:
+                scores.append(score)
+            else:
+                bisect.insort(scores, score)
+            heap = self._heaps.setdefault(key, [])
+            if len(heap) < self.top_n:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+    def top(self, n=None, player=None):
+        """Melhores n entradas (padrão top_n), do personagem ou gerais."""
+        with self._lock:
+            best = sorted(self._heaps.get(player or ALL_PLAYERS, []), reverse=True)
+        return [item[3] for item in best[: n or self.top_n]]
+
+    # --- escrita -----------------------------------------------------------
+
+    def _open_journal(self):
+        if self._journal is None:
+            os.makedirs(
+                os.path.dirname(os.path.abspath(self.journal_path)), exist_ok=True
+            )
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+            # isola uma linha parcial deixada por um crash para não corromper
+            # o próximo registro
+            if self._journal.tell() > 0:
+                with open(self.journal_path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        self._journal.write("\n")
+        return self._journal
+
+    def add(self, entry, sync=True):
+        """
+        Acrescenta uma pontuação ao journal (uma linha) e ao índice.
+        sync=False deixa o fsync para um flush() posterior (escrita em lote).
+        Só levanta exceção se a linha não foi gravada: uma compactação que
+        falhar depois dela fica para o próximo add().
+        """
+        entry = dict(entry)
+        entry.setdefault("id", uuid.uuid4().hex)
+        with self._lock:
+            f = self._open_journal()
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+            self._index(entry)
+            self.count += 1
+            self._journal_count += 1
+            if self.compact_every and self._journal_count >= self.compact_every:
+                try:
+                    self.compact()
+                except Exception as e:
+                    print(f"[score_store] falha ao compactar (fica para depois): {e}")
+        return entry
+
+    def flush(self):
+        """Garante em disco tudo o que já foi acrescentado."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+
+    def all(self):
+        """Histórico completo ordenado por pontuação (lê snapshot + journal)."""
+        snapshot = self._read_snapshot()
+        ids = {e.get("id") for e in snapshot if e.get("id")}
+        entries = snapshot + self._read_journal(ids)
+        try:
+            return sorted(entries, key=lambda e: e.get("score", 0), reverse=True)
+        except Exception:
+            return entries
+
+    def compact(self):
+        """
+        Incorpora o journal ao snapshot (tmp + fsync + rename atômico) e só
+        então trunca o journal.
+        """
+        with self._lock:
+            self.flush()
+            entries = self.all()
+            tmp = self.snapshot_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=4, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snapshot_path)
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            with open(self.journal_path, "w", encoding="utf-8"):
+                pass
+            self._journal_count = 0
+
+    def rank_of(self, score, player=None):
+        """Posição (1 = melhor) que 'score' ocupa no ranking geral ou do personagem."""
+        with self._lock:
+            scores = self._scores.get(player or ALL_PLAYERS, ())
+            return 1 + len(scores) - bisect.bisect_right(scores, score)
+
+    def close(self):
+        with self._lock:
+            if self._journal is not None:
+                try:
+                    self.flush()
+                    self._journal.close()
+                except Exception:
+                    pass
+                self._journal = None
+
+
+def open_score_store(backend="json", **kwargs):
+    """
+    Abre o store de pontuações conforme o backend configurado:
+    - "json": snapshot data/score.json + journal (padrão)
+    - "sqlite": data/score.db (migra o JSON na primeira abertura)
+    Se o SQLite falhar, cai no backend JSON.
+    """
+    if backend == "sqlite":
+        try:
+            from game.score_sqlite import SQLiteScoreStore
+
+            return SQLiteScoreStore(**kwargs)
+        except Exception as e:
+            print(f"[score_store] backend sqlite indisponível ({e}); usando JSON")
+            kwargs.pop("db_path", None)
+    return ScoreStore(**kwargs)
@@ -0,0 +1,132 @@
+"""
+Persistência de pontuações fora da thread de renderização.
+
+submit() só enfileira (fila limitada) e retorna; uma thread de fundo grava no
+store em lotes — vários add(sync=False) seguidos de um único flush()/fsync —,
+repete gravações que falharem com backoff e registra tudo no log. close() é
+registrado em atexit para esvaziar a fila ao sair do jogo.
+
+O "id" da entrada é definido uma vez, no submit(): uma nova tentativa grava o
+mesmo id, que o store ignora se já estiver salvo (sem pontuação duplicada).
+"""
+
+import time
+import uuid
+import queue
+import atexit
+import threading
+import traceback
+
+_STOP = object()
+
+
+class ScoreWriter:
+    def __init__(self, store, max_queue=64, batch_window=0.25, retries=3):
+        """
+        store: ScoreStore/SQLiteScoreStore (add/flush)
+        max_queue: tamanho máximo da fila pendente
+        batch_window: segundos aguardando mais entradas antes do fsync do lote
+        retries: tentativas por lote antes de desistir (com log de erro)
+        """
+        self.store = store
+        self.batch_window = batch_window
+        self.retries = retries
+        self.failed = []
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="score-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, entry):
+        """Enfileira 'entry' sem esperar o disco. Retorna True se enfileirou."""
+        entry = dict(entry)
+        entry.setdefault("id", uuid.uuid4().hex)
+        if self._closed:
+            print("[score_writer] writer encerrado; gravando de forma síncrona")
+            self._write_batch([entry])
+            return False
+        try:
+            self._queue.put(entry, timeout=0.05)
+            return True
+        except queue.Full:
+            # fila cheia = disco travado há tempo; não perde a pontuação
+            print("[score_writer] fila cheia; gravando de forma síncrona")
+            self._write_batch([entry])
+            return False
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.batch_window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    more = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if more is _STOP:
+                    stop = True
+                    break
+                batch.append(more)
+            self._write_batch(batch)
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, batch):
+        pending = list(batch)
+        for attempt in range(1, self.retries + 1):
+            try:
+                while pending:
+                    # add() só falha antes de a linha estar gravada; depois
+                    # dela a entrada já conta como salva
+                    self.store.add(pending[0], sync=False)
+                    del pending[0]
+                self.store.flush()
+                return True
+            except Exception as e:
+                print(
+                    f"[score_writer] falha ao gravar {len(pending)} pontuação(ões)"
+                    f" (tentativa {attempt}/{self.retries}): {e}"
+                )
+                traceback.print_exc()
+                time.sleep(0.1 * 2 ** (attempt - 1))
+        print(f"[score_writer] desistindo de {len(pending)} pontuação(ões): {pending}")
+        self.failed.extend(pending)
+        return False
+
+    def flush(self, timeout=None):
+        """Aguarda a fila esvaziar (tudo gravado). Retorna False no timeout."""
+        if timeout is None:
+            self._queue.join()
+            return True
+        end = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= end:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout=5.0):
+        """Grava o que estiver pendente e encerra a thread (idempotente)."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            print("[score_writer] fila cheia ao encerrar; pontuações podem se perder")
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print("[score_writer] timeout ao encerrar a gravação de pontuações")
@@ -0,0 +1,117 @@
+"""
+Fundo rolando da rodada (estrada e camadas de parallax).
+
+Cada camada vira, no carregamento, uma faixa vertical sem emenda da largura
+do canvas: a imagem empilhada com a própria cópia espelhada (a borda de
+baixo de uma encontra a borda igual da outra), repetida até cobrir a altura
+do canvas. Por quadro cada camada são só dois blits da mesma faixa, um logo
+acima do outro, no deslocamento atual — nada é criado nem escalado no loop,
+e no backend "sdl2" (game.display) a faixa vira uma única textura.
+
+O deslocamento acompanha os obstáculos: advance() recebe os pixels que eles
+desceram no passo (ObstacleManager.speed), multiplicados pelo 'factor' da
+camada (1 = junto com a pista; menor = mais ao fundo). Config: road_scroll
+(fator da estrada; 0 = parada) e parallax_layers (camadas por cima dela).
+"""
+
+import os
+
+import pygame
+
+from game.assets_loader import find_image_by_name, load_image
+from game.settings import BG_COLOR, WIDTH, HEIGHT
+
+
+def build_strip(image, size=(WIDTH, HEIGHT), mirror=True):
+    """
+    Faixa vertical sem emenda de 'image' com a largura de size e altura
+    múltipla do período (imagem, ou imagem + espelho) e >= a altura de size.
+    Sobra na largura fica na cor de fundo (ou transparente, com alfa).
+    """
+    w, h = size
+    iw, ih = image.get_size()
+    alpha = bool(image.get_flags() & pygame.SRCALPHA)
+    period = 2 * ih if mirror else ih
+    tiles = max(1, -(-h // period))
+    strip = pygame.Surface((w, period * tiles), image.get_flags(), image)
+    strip.fill((0, 0, 0, 0) if alpha else BG_COLOR)
+    # com alfa, BLEND_RGBA_MAX copia os pixels sem escurecer as bordas
+    flags = pygame.BLEND_RGBA_MAX if alpha else 0
+    flipped = pygame.transform.flip(image, False, True) if mirror else None
+    x = (w - iw) // 2
+    for t in range(tiles):
+        y = t * period
+        strip.blit(image, (x, y), special_flags=flags)
+        if mirror:
+            strip.blit(flipped, (x, y + ih), special_flags=flags)
+    return strip
+
+
+class ScrollLayer:
+    def __init__(self, image, factor=1.0, mirror=True, size=(WIDTH, HEIGHT)):
+        """
+        image: Surface já no tamanho de desenho (largura <= canvas)
+        factor: fração do deslocamento dos obstáculos aplicada à camada
+        mirror: False se a imagem já emenda sozinha na vertical
+        """
+        self.strip = build_strip(image, size, mirror)
+        self.height = self.strip.get_height()
+        self.factor = factor
+        self.offset = 0.0
+
+    def advance(self, pixels):
+        self.offset = (self.offset + pixels * self.factor) % self.height
+
+    def draw(self, blit):
+        y = int(self.offset)
+        blit(self.strip, (0, y - self.height))
+        blit(self.strip, (0, y))
+
+
+class ScrollingBackground:
+    def __init__(self, layers, paths=()):
+        """
+        layers: ScrollLayer do fundo para a frente (a primeira é opaca)
+        paths: arquivos das camadas (recarregar quando mudarem em disco)
+        """
+        self.layers = list(layers)
+        self.paths = {os.path.abspath(p) for p in paths}
+
+    def advance(self, pixels):
+        """Os obstáculos desceram 'pixels' neste passo."""
+        for layer in self.layers:
+            layer.advance(pixels)
+
+    def draw(self, blit):
+        """
+        Desenha as camadas com blit(surface, pos): Surface.blit,
+        ScaledCanvas.blit ou Display.draw.
+        """
+        for layer in self.layers:
+            layer.draw(blit)
+
+
+def load_background(road_surf, road_path=None, config=None):
+    """
+    ScrollingBackground com a estrada (road_surf, opaca) e as camadas de
+    parallax_layers da config, ou None sem estrada.
+    """
+    if road_surf is None:
+        return None
+    if config is None:
+        from game.config import get_config
+
+        config = get_config()
+    layers = [ScrollLayer(road_surf, config.get("road_scroll", 1.0))]
+    paths = [road_path] if road_path else []
+    for spec in config.get("parallax_layers", []):
+        path = find_image_by_name(spec["image"])
+        image = load_image(path, size=(WIDTH, HEIGHT)) if path else None
+        if image is None:
+            print(f"[scroll] camada {spec['image']!r} não encontrada")
+            continue
+        layers.append(
+            ScrollLayer(image, spec.get("factor", 0.5), spec.get("mirror", True))
+        )
+        paths.append(path)
+    return ScrollingBackground(layers, paths)
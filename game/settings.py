@@ -1,4 +1,29 @@
+# canvas lógico: todo o jogo desenha nestas coordenadas; game.display entrega
+# o quadro escalado para a janela ou tela cheia de qualquer tamanho
 WIDTH, HEIGHT = 900, 600
 FPS = 60
 BG_COLOR = (25, 25, 35)
-LANES = [300, 450, 600]
+
+
+def _px(fraction, total):
+    return int(round(fraction * total))
+
+
+# layout da pista em frações do canvas lógico (padrões da "gameplay")
+LANE_COUNT = 3
+LANE_GAP = 1 / 6  # distância entre os centros das lanes (fração da largura)
+LANES = [
+    _px(0.5 + (i - (LANE_COUNT - 1) / 2) * LANE_GAP, WIDTH) for i in range(LANE_COUNT)
+]
+GROUND_Y = _px(5 / 6, HEIGHT)  # base do player no chão
+PLAYER_SIZE = [_px(0.08, HEIGHT)] * 2
+OBSTACLE_SIZE = [_px(0.107, HEIGHT)] * 2
+
+# imagens de obstáculo (nomes em assets/, sem extensão)
+OBSTACLE_NAMES = (
+    "obstaculo.barra",
+    "obstaculo.buraco",
+    "obstaculo.bola",
+    "obstaculo.cometa",
+    "obstaculo.cone",
+)
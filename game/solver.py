@@ -0,0 +1,694 @@
+"""
+Analisador offline de sequências de spawn: dá para passar sem bater?
+
+Recebe uma agenda de spawns (tick, lane, tipo[, top, altura]) e as capacidades
+do jogador (lanes, física do pulo do Player, intervalo mínimo entre trocas de
+lane) e percorre, tick a tick, todos os estados alcançáveis:
+
+    lane x fase do pulo x espera até a próxima troca x "sobre obstáculo pulado"
+
+O conjunto de estados é um inteiro usado como bitset. Os contatos de cada tick
+viram, uma vez por agenda, máscaras de largura cheia (PlayerModel.contact_row
+guarda por altura de obstáculo as fases que encostam em cada top), então o
+passo tick a tick é só shifts e ands, independentemente de quantos estados
+existam; trechos sem obstáculo perto do jogador são pulados de uma vez
+(depois de alguns ticks livres todo estado volta a ser alcançável).
+analyse_many() anda com um lote de agendas junto em arrays numpy (um uint64
+de fases por bloco lane x espera x sobre) para o CI checar da ordem de mil
+rodadas de 30 s por segundo (alguns milhares se forem curtas). As regras de
+contato reproduzem a fase larga de ObstacleManager.check_collision: retângulos na
+mesma lane (a máscara por pixel só descarta contatos), e um 'need_jump' só é
+evitado com o jogador no ar acima do limiar. O deslize
+(hitbox mais baixa) não entra no modelo: só dá mais saídas ao jogador, então
+"limpável" continua garantido e "impossível" é conservador.
+
+Resultado: se a sequência é "limpável" (existe caminho sem nenhuma colisão),
+o tick da primeira falha e uma nota de dificuldade — bits de escolha
+eliminados por segundo (-log2 da fração de estados que sobrevive a cada tick).
+Com witness=True, devolve também entradas que limpam a sequência, no formato
+de game.replay.
+
+Uso (CI): python -m game.solver --rounds 500 --mode patterns
+"""
+
+import math
+import time
+import random
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+import numpy as np
+
+from game.settings import FPS, GROUND_Y, OBSTACLE_SIZE, PLAYER_SIZE
+from game.config import get_config
+
+
+def jump_heights(jump_velocity, gravity):
+    """Altura (px) dos pés a cada tick do pulo, como Player.update calcula."""
+    y, vel, heights = 0, jump_velocity, []
+    while True:
+        y += int(vel)
+        vel += gravity
+        if y >= 0:
+            return heights
+        heights.append(-y)
+
+
+class PlayerModel:
+    def __init__(self, tuning=None, fps=FPS, switch_cooldown=0.0):
+        """
+        tuning: seção "gameplay" (lanes, jump_velocity, gravity, ground_y,
+                player_size); padrão: a da config
+        switch_cooldown: segundos mínimos entre duas trocas de lane
+                         (0 = teclado, uma troca por tick)
+        """
+        tuning = tuning if tuning is not None else get_config().gameplay()
+        self.fps = fps
+        self.n_lanes = len(tuning.get("lanes", (0, 0, 0)))
+        self.ground_y = tuning.get("ground_y", GROUND_Y)
+        self.player_h = tuple(tuning.get("player_size", PLAYER_SIZE))[1]
+        self.heights = [0] + jump_heights(
+            tuning.get("jump_velocity", -16), tuning.get("gravity", 1.0)
+        )
+        self.max_height = max(self.heights)
+
+        # layout dos bits: (((lane * C1 + espera) * 2 + sobre) * P) + fase
+        P = self.phases = len(self.heights)
+        C = self.cooldown = max(0, int(round(switch_cooldown * fps)))
+        C1 = C + 1
+        self._lane_stride = C1 * 2 * P
+        self._cd_stride = 2 * P
+
+        def block(lane, cd, sh):
+            return ((lane * C1 + cd) * 2 + sh) * P
+
+        phase_bits = (1 << P) - 1
+        self.ph0 = self.adv = self.last = 0
+        self.cd0 = self.sh1_all = 0
+        self.lane = []
+        self.rep0 = []
+        self.rep1 = []
+        for lane in range(self.n_lanes):
+            lane_mask = rep0 = rep1 = 0
+            for cd in range(C1):
+                for sh in (0, 1):
+                    base = block(lane, cd, sh)
+                    lane_mask |= phase_bits << base
+                    self.ph0 |= 1 << base
+                    # fases 1..P-2 avançam; a última aterrissa (fase 0)
+                    self.adv |= (phase_bits & ~1 & ~(1 << (P - 1))) << base
+                    if P > 1:
+                        self.last |= 1 << (base + P - 1)
+                    if cd == 0:
+                        self.cd0 |= phase_bits << base
+                    if sh:
+                        self.sh1_all |= phase_bits << base
+                        rep1 |= 1 << base
+                    else:
+                        rep0 |= 1 << base
+            self.lane.append(lane_mask)
+            self.rep0.append(rep0)
+            self.rep1.append(rep1)
+        self.all = sum(self.lane)
+        self.full = self.all & ~self.sh1_all
+        self.cd_pos = self.all & ~self.cd0
+        self.start = 1 << block(self.n_lanes // 2, 0, 0)
+        # ticks livres após os quais qualquer estado (sem "sobre") é alcançável
+        self.saturation = (self.n_lanes - 1) * C1 + P + C1
+        self._masks = {}
+        self._rows = {}
+
+    def phase_mask(self, lo, hi):
+        """Fases cuja altura h satisfaz lo < h < hi (bitset de P bits)."""
+        key = (lo, hi)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = 0
+            for p, h in enumerate(self.heights):
+                if lo < h < hi:
+                    mask |= 1 << p
+            self._masks[key] = mask
+        return mask
+
+    def contact_row(self, h):
+        """
+        Fases que encostam num obstáculo de altura h, por top do obstáculo:
+        (primeiro top, [bitset de fases]) para os tops em [primeiro, chão).
+        """
+        row = self._rows.get(h)
+        if row is None:
+            G, ph = self.ground_y, self.player_h
+            first = G - ph - h - self.max_height
+            masks = [
+                self.phase_mask(G - ph - h - top, G - top) for top in range(first, G)
+            ]
+            row = self._rows[h] = (first, masks)
+        return row
+
+    # --- transições --------------------------------------------------------
+
+    def inputs_and_move(self, S):
+        """Troca de lane (se a espera permitir), pulo e avanço da física."""
+        C = self.cooldown
+        free = S & self.cd0
+        if free and self.n_lanes > 1:
+            moved = 0
+            stride = self._lane_stride
+            moved |= (free & ~self.lane[0]) >> stride
+            moved |= (free & ~self.lane[-1]) << stride
+            # trocar de lane encerra o "sobre obstáculo" e inicia a espera
+            moved = (moved & ~self.sh1_all) | ((moved & self.sh1_all) >> self.phases)
+            if C:
+                moved <<= C * self._cd_stride
+            S |= moved
+        grounded = S & self.ph0
+        S = ((S & self.adv) << 1) | ((S & self.last) >> (self.phases - 1)) | grounded
+        S |= grounded << 1
+        if C:
+            S = (S & self.cd0) | ((S & self.cd_pos) >> self._cd_stride)
+        return S
+
+    def contact_masks(self, hit, evade, over):
+        """
+        Máscaras de largura cheia de um tick a partir dos bitsets já
+        replicados por lane (hit/evade nos blocos sem "sobre", over nos com):
+        -> (keep, em, om1) para collide().
+        """
+        return self.all & ~(hit | evade), evade & ~hit, over
+
+    def collide(self, S, masks):
+        """
+        Aplica os contatos de um tick: masks = contact_masks() ou None quando
+        nada está ao alcance. No chão/baixo o jogador bate; no ar acima do
+        limiar passa "sobre" o obstáculo (que o jogo remove no primeiro
+        contato) e continua sobre ele enquanto houver contato.
+        """
+        P = self.phases
+        s1 = S & self.sh1_all
+        s0 = S ^ s1
+        if masks is None:
+            # sem contato: ninguém continua "sobre" obstáculo
+            return s0 | (s1 >> P)
+        keep, em, om1 = masks
+        return (s0 & keep) | ((s0 & em) << P) | (s1 & om1) | ((s1 & ~om1) >> P)
+
+    def decode(self, index):
+        """Bit -> (lane, espera, sobre, fase)."""
+        P, C1 = self.phases, self.cooldown + 1
+        phase = index % P
+        sh = (index // P) % 2
+        cd = (index // (2 * P)) % C1
+        lane = index // (2 * P * C1)
+        return lane, cd, sh, phase
+
+    def witness(self, history):
+        """
+        Reconstrói, de trás para frente, uma sequência de entradas que limpa
+        a agenda: [[tick, "LJ"], ...] no formato de game.replay.
+        """
+        inputs = []
+        target = (history[-1][2] & -history[-1][2]).bit_length() - 1
+        for idx in range(len(history) - 1, -1, -1):
+            tick, params, _ = history[idx]
+            prev = history[idx - 1][2] if idx else self.start
+            while prev:
+                low = prev & -prev
+                prev ^= low
+                nxt = self.collide(self.inputs_and_move(low), params)
+                if (nxt >> target) & 1:
+                    break
+            src = low.bit_length() - 1
+            lane0, _, _, phase0 = self.decode(src)
+            lane1, _, _, phase1 = self.decode(target)
+            codes = ""
+            if lane1 < lane0:
+                codes += "L"
+            elif lane1 > lane0:
+                codes += "R"
+            if phase0 == 0 and phase1 == 1:
+                codes += "J"
+            if codes:
+                inputs.append([tick, codes])
+            target = src
+        inputs.reverse()
+        return inputs
+
+
+def _normalize(schedule, default_h):
+    out = []
+    for item in schedule:
+        tick, lane, kind = item[0], item[1], item[2]
+        top = item[3] if len(item) > 3 and item[3] is not None else None
+        h = item[4] if len(item) > 4 and item[4] else default_h
+        if top is None:
+            top = -h
+        out.append((int(tick), int(lane), kind, top, h))
+    out.sort()
+    return out
+
+
+def _empty_result():
+    return {
+        "clearable": True,
+        "fail_tick": None,
+        "difficulty": 0.0,
+        "tightest": 1.0,
+        "ticks": 0,
+    }
+
+
+def _windows(schedule, tuning, advance, fps, model):
+    """
+    Janelas de contato da agenda: ([(entra, sai, lane, tipo, top - D[spawn],
+    altura, fases altas)], D), com D o deslocamento acumulado por tick; None
+    com a agenda vazia.
+    """
+    default_h = tuple(tuning.get("obstacle_size", OBSTACLE_SIZE))[1]
+    items = _normalize(schedule, default_h)
+    if not items:
+        return None
+
+    G, ph, maxh = model.ground_y, model.player_h, model.max_height
+    if advance is None:
+        advance = int(tuning.get("speed", 220) * (1.0 / fps))
+    # deslocamento acumulado: top(t) = top_spawn + D[t] - D[spawn]
+    horizon = items[-1][0] + 1
+    if isinstance(advance, int):
+        v = max(advance, 1)
+        reach = G - min(it[3] for it in items)
+        horizon += reach // v + 2
+        D = [v * t for t in range(horizon + 1)]
+    else:
+        D = list(accumulate(advance))
+        if not D:
+            D = [0]
+        step = max(advance[-1] if advance else 1, 1)
+        while D[-1] - D[items[-1][0]] < G - items[-1][3] + 1:
+            D.append(D[-1] + step)
+
+    # janela [entra, sai) de cada obstáculo na faixa em que pode tocar o jogador
+    windows = []
+    highs = {}
+    for tick, lane, kind, top, h in items:
+        if not 0 <= lane < model.n_lanes:
+            continue
+        base = D[tick] - top
+        enter = bisect_right(D, base + (G - ph - maxh - h), tick)
+        leave = bisect_left(D, base + G, tick)
+        if enter < leave:
+            high = highs.get(h)
+            if high is None:
+                thr = max(8, int(h * 0.25))
+                high = 0
+                for p, hp in enumerate(model.heights):
+                    if p and hp >= thr:
+                        high |= 1 << p
+                highs[h] = high
+            windows.append((enter, leave, lane, kind, top - D[tick], h, high))
+    windows.sort()
+    return windows, D
+
+
+def analyse(
+    schedule,
+    tuning=None,
+    advance=None,
+    fps=FPS,
+    switch_cooldown=0.0,
+    model=None,
+    witness=False,
+):
+    """
+    Verifica se a agenda 'schedule' pode ser atravessada sem colisões.
+    - schedule: [(tick, lane, tipo[, top, altura])], tipo 'need_jump' ou
+      'must_avoid'; 'top' é o rect.top no fim do tick do spawn (padrão
+      -altura) e 'altura' a do rect (padrão obstacle_size)
+    - advance: px por tick dos obstáculos (int ou lista por tick); padrão
+      int(speed / fps), como ObstacleManager
+    - model: PlayerModel pronto (reaproveitar acelera lotes grandes)
+    - witness: inclui em "inputs" uma sequência de entradas que limpa a
+      agenda (mais lento: guarda o histórico de estados)
+    Retorna dict com clearable, fail_tick, difficulty (bits/s), tightest
+    (menor fração de estados sobrevivendo num tick) e ticks.
+    """
+    tuning = tuning if tuning is not None else get_config().gameplay()
+    model = model or PlayerModel(tuning, fps, switch_cooldown)
+    prepared = _windows(schedule, tuning, advance, fps, model)
+    if prepared is None:
+        return _empty_result()
+    windows, D = prepared
+    end = max((w[1] for w in windows), default=0)
+
+    # contatos de largura cheia por tick, montados uma vez: hit/evade nos
+    # blocos sem "sobre" (rep0), over nos com (rep1)
+    HIT = [0] * end
+    EVADE = [0] * end
+    OVER = [0] * end
+    active = bytearray(end)
+    for enter, leave, lane, kind, off, h, high in windows:
+        first, row = model.contact_row(h)
+        r0, r1 = model.rep0[lane], model.rep1[lane]
+        jump = kind == "need_jump"
+        active[enter:leave] = b"\x01" * (leave - enter)
+        for t in range(enter, leave):
+            m = row[off + D[t] - first]
+            if not m:
+                continue
+            OVER[t] |= m * r1
+            if jump:
+                HIT[t] |= (m & ~high) * r0
+                EVADE[t] |= (m & high) * r0
+            else:
+                HIT[t] |= m * r0
+
+    move, collide = model.inputs_and_move, model.collide
+    full, saturation = model.full, model.saturation
+    keep_all = model.all
+    S = model.start
+    tick = 0
+    bits = 0.0
+    tightest = 1.0
+    history = [] if witness else None
+    while tick < end:
+        if not active[tick]:
+            # trecho livre até a próxima janela
+            nxt = active.find(1, tick)
+            if nxt - tick >= saturation and not witness:
+                S = full
+                tick = nxt
+                continue
+            while tick < nxt:
+                S = collide(move(S), None)
+                if witness:
+                    history.append((tick, None, S))
+                tick += 1
+
+        S = move(S)
+        before = S.bit_count()
+        hit, evade = HIT[tick], EVADE[tick]
+        masks = (keep_all & ~(hit | evade), evade & ~hit, OVER[tick])
+        S = collide(S, masks)
+        if witness:
+            history.append((tick, masks, S))
+        after = S.bit_count()
+        if after < before:
+            frac = after / before
+            tightest = min(tightest, frac)
+            if after:
+                bits += -math.log2(frac)
+        if not S:
+            return {
+                "clearable": False,
+                "fail_tick": tick,
+                "difficulty": bits / max(tick / fps, 1e-9),
+                "tightest": 0.0,
+                "ticks": tick,
+            }
+        tick += 1
+    result = {
+        "clearable": True,
+        "fail_tick": None,
+        "difficulty": bits / max(tick / fps, 1e-9),
+        "tightest": tightest,
+        "ticks": tick,
+    }
+    if witness:
+        result["inputs"] = model.witness(history)
+    return result
+
+
+def analyse_many(
+    schedules, tuning=None, fps=FPS, switch_cooldown=0.0, model=None, batch=256
+):
+    """
+    analyse() de várias agendas, sem witness: schedules = [(agenda,
+    advance)] -> lista de resultados. Os estados de 'batch' agendas andam
+    juntos em arrays numpy (sobre, lane, espera, agenda) com as fases de
+    cada bloco num uint64, e os contatos do lote viram arrays por tick de
+    uma vez (~32 bytes x ticks x lanes x batch) — o custo de um tick é
+    dividido pelo lote. Pulos com mais de 64 fases caem em analyse() uma a
+    uma.
+    """
+    tuning = tuning if tuning is not None else get_config().gameplay()
+    model = model or PlayerModel(tuning, fps, switch_cooldown)
+    schedules = list(schedules)
+    if not 2 <= model.phases <= 64:
+        return [
+            analyse(sched, tuning, adv, fps, model=model) for sched, adv in schedules
+        ]
+    results = []
+    for i in range(0, len(schedules), batch):
+        prepared = [
+            _windows(sched, tuning, adv, fps, model)
+            for sched, adv in schedules[i : i + batch]
+        ]
+        results.extend(_analyse_batch(prepared, model, fps))
+    return results
+
+
+def _batch_contacts(prepared, model):
+    """
+    Contatos do lote inteiro de uma vez, em arrays (ticks, lanes, n) de
+    fases: keep (sem hit nem evade), em (evade sem hit) e over; mais os
+    ticks com janela (ticks, n) e o tick final de cada agenda.
+    """
+    n, L = len(prepared), model.n_lanes
+    ends = [max((w[1] for w in p[0]), default=0) if p else 0 for p in prepared]
+    T = max(ends, default=0)
+    shape = (T, L, n)
+    over = np.zeros(T * L * n, np.uint64)
+    hit = np.zeros(T * L * n, np.uint64)
+    evade = np.zeros(T * L * n, np.uint64)
+    active = np.zeros((T, n), bool)
+    # janelas da mesma lane podem se sobrepor: cada camada só tem janelas
+    # disjuntas por (agenda, lane), e o OR de uma camada é uma atribuição
+    # vetorizada sem índices repetidos
+    layers = []
+    dists, size = [], 0
+    for k, p in enumerate(prepared):
+        if not p or not p[0]:
+            continue
+        windows, D = p
+        ends_at = {}
+        for w in windows:
+            open_ = ends_at.setdefault(w[2], [])
+            for j, leave in enumerate(open_):
+                if leave <= w[0]:
+                    break
+            else:
+                j = len(open_)
+                open_.append(0)
+                if j == len(layers):
+                    layers.append([])
+            open_[j] = w[1]
+            layers[j].append((k, size) + w)
+        dists.append(np.asarray(D, np.int64))
+        size += len(D)
+    D = np.concatenate(dists) if dists else None
+    rows = {}
+    for layer in layers:
+        col, dbase, enter, leave, lane, kind, off, hs, high = zip(*layer)
+        enter, leave = np.array(enter), np.array(leave)
+        lens = leave - enter
+        total = int(lens.sum())
+        # ticks de todas as janelas enfileirados: enter + 0..len-1
+        t_idx = np.repeat(enter - (np.cumsum(lens) - lens), lens) + np.arange(total)
+        col = np.repeat(np.array(col), lens)
+        tops = (
+            np.repeat(np.array(off), lens) + D[np.repeat(np.array(dbase), lens) + t_idx]
+        )
+        h_rep = np.repeat(np.array(hs), lens)
+        m = np.empty(total, np.uint64)
+        for h in set(hs):
+            if h not in rows:
+                first, masks = model.contact_row(h)
+                rows[h] = (first, np.array(masks, np.uint64))
+            first, table = rows[h]
+            sel = h_rep == h
+            m[sel] = table[tops[sel] - first]
+        jump = np.repeat(np.array(kind) == "need_jump", lens)
+        high_rep = np.repeat(np.array(high, np.uint64), lens)
+        flat = (t_idx * L + np.repeat(np.array(lane), lens)) * n + col
+        over[flat] |= m
+        hit[flat] |= np.where(jump, m & ~high_rep, m)
+        evade[flat] |= np.where(jump, m & high_rep, np.uint64(0))
+        active[t_idx, col] = True
+    keep = ~(hit | evade)
+    evade &= ~hit
+    return (
+        keep.reshape(shape),
+        evade.reshape(shape),
+        over.reshape(shape),
+        active,
+        ends,
+    )
+
+
+def _analyse_batch(prepared, model, fps):
+    n, L = len(prepared), model.n_lanes
+    P, C = model.phases, model.cooldown
+    keep, em, over, active, ends = _batch_contacts(prepared, model)
+    T = active.shape[0]
+    any_active = active.any(axis=1)
+
+    one = np.uint64(1)
+    back = np.uint64(P - 1)
+    last = np.uint64(1 << (P - 1))
+    adv = np.uint64(((1 << P) - 1) & ~1 & ~(1 << (P - 1)))
+    # estados: (sobre, lane, espera, agenda), fases no uint64
+    S = np.zeros((2, L, C + 1, n), np.uint64)
+    S[0, L // 2, 0] = 1
+    s0, s1 = S[0], S[1]
+    tmp = np.empty_like(S)
+    moved = np.zeros((L, n), np.uint64)
+    bits = np.zeros(n)
+    tightest = np.ones(n)
+    fail = np.full(n, -1)
+    alive = np.ones(n, bool)
+    for t in range(T):
+        # troca de lane (só sem espera): encerra o "sobre" e inicia a espera
+        if L > 1:
+            free = s0[:, 0] | s1[:, 0]
+            moved[:-1] = free[1:]
+            moved[-1] = 0
+            moved[1:] |= free[:-1]
+            s0[:, C] |= moved
+        # pulo (do chão) e física
+        g = S & one
+        np.bitwise_and(S, last, out=tmp)
+        tmp >>= back
+        S &= adv
+        S <<= one
+        S |= tmp
+        S |= g
+        g <<= one
+        S |= g
+        if C:
+            S[:, :, 0] |= S[:, :, 1]
+            S[:, :, 1:C] = S[:, :, 2:]
+            S[:, :, C] = 0
+
+        if not any_active[t]:
+            s0 |= s1
+            s1[...] = 0
+            continue
+        before = np.bitwise_count(S).sum(axis=(0, 1, 2))
+        o = over[t][:, None]
+        e = em[t][:, None]
+        n1 = (s0 & e) | (s1 & o)
+        s0 &= keep[t][:, None]
+        s0 |= s1 & ~o
+        s1[...] = n1
+        after = np.bitwise_count(S).sum(axis=(0, 1, 2))
+        lost = active[t] & alive & (after < before)
+        if lost.any():
+            frac = after[lost] / before[lost]
+            tightest[lost] = np.minimum(tightest[lost], frac)
+            kept = lost & (after > 0)
+            bits[kept] -= np.log2(after[kept] / before[kept])
+            dead = lost & (after == 0)
+            if dead.any():
+                fail[dead] = t
+                alive &= ~dead
+                if not alive.any():
+                    break
+
+    results = []
+    for k, p in enumerate(prepared):
+        if not p:
+            results.append(_empty_result())
+        elif fail[k] >= 0:
+            tick = int(fail[k])
+            results.append(
+                {
+                    "clearable": False,
+                    "fail_tick": tick,
+                    "difficulty": float(bits[k]) / max(tick / fps, 1e-9),
+                    "tightest": 0.0,
+                    "ticks": tick,
+                }
+            )
+        else:
+            results.append(
+                {
+                    "clearable": True,
+                    "fail_tick": None,
+                    "difficulty": float(bits[k]) / max(ends[k] / fps, 1e-9),
+                    "tightest": float(tightest[k]),
+                    "ticks": ends[k],
+                }
+            )
+    return results
+
+
+def record_schedule(tuning=None, seed=0, seconds=60, fps=FPS):
+    """
+    Roda um ObstacleManager sem janela por 'seconds' e devolve
+    (agenda, advance) no formato de analyse() — spawns reais do jogo, com a
+    variação de top do modo clássico e a velocidade tick a tick dos padrões.
+    """
+    from game.obstacles import ObstacleManager
+
+    tuning = tuning if tuning is not None else get_config().gameplay()
+    manager = ObstacleManager(tuning=tuning, rng=random.Random(seed))
+    dt = 1.0 / fps
+    schedule, advance = [], []
+    for tick in range(int(seconds * fps)):
+        manager.update(dt)
+        advance.append(int(manager.speed * dt))
+        for spr in manager.obstacle_sprites:
+            if not getattr(spr, "_scheduled", False):
+                spr._scheduled = True
+                schedule.append(
+                    (tick, spr.lane, spr.ob_type, spr.rect.top, spr.rect.height)
+                )
+    manager.clear()
+    return schedule, advance
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Analisa sequências de spawn")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--mode", choices=("patterns", "classic"), default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--switch-cooldown",
+        type=float,
+        default=0.0,
+        help="segundos entre trocas de lane (0 = teclado)",
+    )
+    args = parser.parse_args()
+
+    tuning = dict(get_config().gameplay())
+    if args.mode:
+        tuning["spawn_mode"] = args.mode
+    model = PlayerModel(tuning, switch_cooldown=args.switch_cooldown)
+
+    schedules = []
+    t0 = time.perf_counter()
+    for r in range(args.rounds):
+        schedules.append(record_schedule(tuning, args.seed + r, args.seconds))
+    t_gen = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    results = analyse_many(schedules, tuning, model=model)
+    t_an = time.perf_counter() - t0
+
+    failed = [args.seed + r for r, res in enumerate(results) if not res["clearable"]]
+    diffs = sorted(res["difficulty"] for res in results)
+    print(
+        f"[solver] modo {tuning.get('spawn_mode', 'classic')}: {args.rounds} rodadas"
+        f" de {args.seconds:.0f}s — geradas em {t_gen:.2f}s, analisadas em"
+        f" {t_an:.2f}s ({args.rounds / max(t_an, 1e-9):.0f}/s)"
+    )
+    print(
+        f"[solver] limpáveis: {args.rounds - len(failed)}/{args.rounds};"
+        f" dificuldade (bits/s) p50={diffs[len(diffs) // 2]:.2f}"
+        f" p90={diffs[int(len(diffs) * 0.9)]:.2f} max={diffs[-1]:.2f}"
+    )
+    if failed:
+        print(f"[solver] seeds não limpáveis: {failed[:20]}")
+    raise SystemExit(1 if failed else 0)
@@ -1,58 +1,108 @@
 import sys
 import os
-import json
 import pygame
 import traceback
 import time
-from game.player import Player
-from game.obstacles import ObstacleManager
-from game.camera_control import CameraController
+import multiprocessing
+from game.camera_pipeline import open_camera
 from game.settings import *
-from start_menu import show_menu
+from start_menu import show_menu, ATTRACT
 from game.assets_loader import (
     find_first_image_in_folder,
     find_first_sound_in_folder,
     load_sound,
     load_image,
     find_image_by_name,
+    set_smooth_scale,
 )
-
+from game.bake import bake, baked_is_fresh
+from game.preloader import AssetPreloader
+from game.score_store import open_score_store
+from game.score_writer import ScoreWriter
+from game.config import get_config
+from game.hot_reload import HotReloader
+from game.round import RoundSim
+from game.replay import save_replay
+from game.attract import run_attract
+from game.quality import (
+    CAMERA_RATE,
+    apply_preset,
+    calibrate,
+    format_report,
+    needs_calibration,
+)
+from game.governor import FrameGovernor, ScaledCanvas
+from game.display import open_display, present
+from game.scroll import load_background
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "data", "config.json")
 SCORE_PATH = os.path.join(os.path.dirname(__file__), "data", "score.json")
 
+# passos de simulação que um frame lento pode recuperar (evita "espiral" de atraso)
+MAX_CATCHUP_STEPS = 5
+
 
 def load_config():
-    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+    # parse/validação uma única vez; recarrega sozinho se o arquivo mudar
+    return get_config().data
+
+
+_score_store = None
+_score_writer = None
+
+
+def get_score_store():
+    """
+    Store de pontuações conforme config "score_backend": "json" (snapshot
+    data/score.json + journal data/score.log, padrão) ou "sqlite" (data/score.db).
+    """
+    global _score_store
+    if _score_store is None:
+        try:
+            backend = load_config().get("score_backend", "json")
+        except Exception:
+            backend = "json"
+        _score_store = open_score_store(backend)
+    return _score_store
+
+
+def get_score_writer():
+    """Writer em segundo plano (fila limitada, fsync em lote, flush no exit)."""
+    global _score_writer
+    if _score_writer is None:
+        _score_writer = ScoreWriter(get_score_store())
+    return _score_writer
+
+
+def score_rank(score, player=None):
+    """Posição que 'score' ocuparia no ranking (geral ou do personagem) ou None."""
+    try:
+        return get_score_store().rank_of(score, player)
+    except Exception:
+        return None
 
 
 def load_scores():
     try:
-        with open(SCORE_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return get_score_store().all()
     except Exception:
         return []
 
 
 def save_score_entry(entry):
-    scores = load_scores()
-    scores.append(entry)
-    # opcional: manter apenas top N ou ordenar
+    # só enfileira: o append no journal (e a compactação) roda no ScoreWriter,
+    # que repete falhas e as registra no log
     try:
-        scores_sorted = sorted(scores, key=lambda e: e.get("score", 0), reverse=True)
+        get_score_writer().submit(entry)
     except Exception:
-        scores_sorted = scores
-    try:
-        with open(SCORE_PATH, "w", encoding="utf-8") as f:
-            json.dump(scores_sorted, f, indent=4, ensure_ascii=False)
-    except Exception:
-        pass
+        print("[ERROR] falha ao enfileirar pontuação:")
+        traceback.print_exc()
 
 
-def show_game_over_popup(screen, clock, score):
+def show_game_over_popup(screen, clock, score, rank=None):
     """
     Exibe popup de fim de jogo usando imagem 'vencedor' como fundo do box (se existir).
+    rank: posição opcional no ranking, exibida abaixo da pontuação.
     Aguarda Enter ou clique para continuar.
     """
     # fontes maiores
@@ -151,11 +201,21 @@ def show_game_over_popup(screen, clock, score):
         box,
         f"Pontuação: {score}",
         font_body,
-        (box_w // 2, 110),
+        (box_w // 2, 100 if rank else 110),
         fg=(0, 0, 0),
         outline=(255, 255, 255),
         outline_width=2,
     )
+    if rank:
+        draw_text_outline(
+            box,
+            f"Posição no ranking: #{rank}",
+            font_body,
+            (box_w // 2, 135),
+            fg=(0, 0, 0),
+            outline=(255, 255, 255),
+            outline_width=2,
+        )
     draw_text_outline(
         box,
         "Pressione Enter para voltar ao menu",
@@ -180,7 +240,7 @@ def show_game_over_popup(screen, clock, score):
 
         screen.blit(overlay, (0, 0))
         screen.blit(box, ((w - box_w) // 2, (h - box_h) // 2))
-        pygame.display.flip()
+        present()
         clock.tick(30)
 
 
@@ -350,6 +410,59 @@ def _find_obstacle_group(obstacles):
     return None
 
 
+def _load_road():
+    """Imagem de fundo "estrada" na tela toda -> (Surface ou None, caminho)."""
+    road_surf = None
+    road_path = None
+    try:
+        assets_root = os.path.join(os.path.dirname(__file__), "assets")
+        road_path = None
+        if os.path.isdir(assets_root):
+            for root, _, files in os.walk(assets_root):
+                for fname in files:
+                    if "estrada" in fname.lower() and fname.lower().endswith(
+                        (".png", ".jpg", ".jpeg", ".bmp", ".gif")
+                    ):
+                        road_path = os.path.join(root, fname)
+                        break
+                if road_path:
+                    break
+        # fallback: usar find_first_image_in_folder em locais prováveis
+        if not road_path:
+            for cand in (
+                os.path.join(os.path.dirname(__file__), "assets", "sprites"),
+                os.path.join(os.path.dirname(__file__), "assets", "sprits"),
+                os.path.join(os.path.dirname(__file__), "assets"),
+            ):
+                try:
+                    p = find_first_image_in_folder(cand)
+                    if p and "estrada" in os.path.basename(p).lower():
+                        road_path = p
+                        break
+                except Exception:
+                    continue
+        if road_path:
+            # carrega e escala para o tamanho da tela
+            road_surf = load_image(road_path, size=(WIDTH, HEIGHT), use_alpha=False)
+    except Exception:
+        road_surf = None
+    return road_surf, road_path
+
+
+def _draw_loading(screen, done, total):
+    """Tela de carregamento simples: barra de progresso centralizada."""
+    pygame.event.pump()
+    w, h = screen.get_size()
+    screen.fill(BG_COLOR)
+    bar = pygame.Rect(0, 0, w // 2, 18)
+    bar.center = (w // 2, h // 2)
+    pygame.draw.rect(screen, (80, 80, 100), bar, border_radius=9)
+    fill = bar.copy()
+    fill.width = int(bar.width * (done / total)) if total else bar.width
+    pygame.draw.rect(screen, (200, 200, 60), fill, border_radius=9)
+    present()
+
+
 def main():
     pygame.init()
     # inicializa mixer (safe)
@@ -361,10 +474,59 @@ def main():
         print("[WARN] falha ao inicializar mixer pygame (áudio pode não funcionar)")
 
     print("[DEBUG] pygame iniciado")
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    pygame.display.set_caption("Kids Runner 🎮")
+    # canvas lógico WIDTHxHEIGHT apresentado escalado na janela/tela cheia,
+    # por blits de Surface ou texturas do SDL2 (config render_backend)
+    display = open_display(caption="Kids Runner 🎮")
+    screen = display.canvas
     clock = pygame.time.Clock()
 
+    # preset de qualidade (game.quality): na primeira execução mede a máquina e
+    # grava resolução/ritmo da câmera, FPS alvo e escala dos assets na config
+    try:
+        if needs_calibration():
+            print("[DEBUG] calibrando o preset de qualidade desta máquina")
+            preset, measured = calibrate(
+                progress=lambda done, total, label: _draw_loading(screen, done, total)
+            )
+            print(format_report(preset, measured))
+            apply_preset(preset)
+    except Exception:
+        print("[WARN] falha na calibração (mantendo a config atual)")
+        traceback.print_exc()
+    set_smooth_scale(get_config().get("smooth_scale", True))
+
+    # variantes pré-renderizadas + atlas: refaz o bake se ausente/desatualizado
+    # (origem com hash diferente) e decodifica o atlas uma única vez
+    try:
+        if not baked_is_fresh():
+            print("[DEBUG] pré-renderizando variantes de assets (bake)")
+            bake(with_sounds=False)
+    except Exception:
+        print(
+            "[WARN] falha ao preparar assets pré-renderizados (usando imagens avulsas)"
+        )
+
+    # atlas, variantes e sons decodificados em paralelo; a primeira execução
+    # também transcodifica os efeitos para PCM cru (data/cache/audio)
+    try:
+        t0 = time.time()
+        loaded = AssetPreloader(
+            progress=lambda done, total, label: _draw_loading(screen, done, total)
+        ).run()
+        print(f"[DEBUG] {loaded} assets pré-carregados em {time.time() - t0:.2f}s")
+    except Exception:
+        print("[WARN] falha no pré-carregamento de assets")
+        traceback.print_exc()
+
+    # edições em assets/ e data/config.json valem sem reiniciar o jogo
+    hot_reload = None
+    try:
+        hot_reload = HotReloader()
+        print(f"[DEBUG] hot-reload ativo ({hot_reload.watcher.backend})")
+    except Exception:
+        print("[WARN] hot-reload indisponível")
+        traceback.print_exc()
+
     cfg = load_config()
     max_collisions = cfg.get("max_collisions", 10)
     points_per_evade = cfg.get("points_per_evade", 10)
@@ -372,33 +534,101 @@ def main():
         f"[DEBUG] config: max_collisions={max_collisions}, points_per_evade={points_per_evade}"
     )
 
+    attract_delay = cfg.get("attract_delay", 30.0)
+    # quadros por segundo da rodada (preset); a simulação segue em passos de 1/FPS
+    target_fps = cfg.get("target_fps", FPS)
+    camera_fps = cfg.get("camera_fps", 0)
+    # governador: tempo de trabalho dos quadros da rodada -> degrada/restaura
+    # a qualidade (game.governor); o nível continua de uma rodada para outra
+    governor = FrameGovernor(target_fps)
+    canvas = None
+
+    # câmera aberta uma vez e mantida entre menu, demo e rodadas: a presença
+    # (game.presence) decide se o MediaPipe roda; captura + pose em processos
+    # próprios conforme camera_mode
+    camera = None
+    try:
+        camera = open_camera()
+    except Exception:
+        print("[WARN] câmera indisponível (só teclado):")
+        traceback.print_exc()
+
+    def apply_quality():
+        """Ritmo da inferência conforme o nível do governador."""
+        if camera is None:
+            return
+        fps = camera_fps
+        if governor.at_least("camera"):
+            fps = (camera_fps or CAMERA_RATE) / 2
+        try:
+            camera.set_infer_fps(fps)
+        except Exception:
+            traceback.print_exc()
+
+    def shutdown():
+        if camera is not None:
+            try:
+                camera.close()
+            except Exception:
+                pass
+        pygame.quit()
+
     # Loop principal que permite voltar ao menu ao fim da partida
     while True:
         try:
             # mostrar menu inicial e obter personagem selecionado
             print("[DEBUG] exibindo menu de seleção")
-            chosen = show_menu(screen, clock)
+            chosen = show_menu(
+                screen, clock, camera=camera, attract_delay=attract_delay
+            )
             print(f"[DEBUG] retorno do menu: {chosen!r}")
             if chosen is None:
                 print("[DEBUG] usuário saiu no menu. Encerrando.")
-                pygame.quit()
+                shutdown()
                 return
+            if chosen == ATTRACT:
+                # ninguém por perto: demo com o Bot até alguém aparecer
+                print("[DEBUG] menu ocioso, entrando no modo demo")
+                demo_char = load_config().get("selected") or ""
+                woke = run_attract(
+                    screen,
+                    clock,
+                    camera,
+                    find_sprite_for(demo_char) if demo_char else None,
+                    load_background(*_load_road()),
+                )
+                if woke is None:
+                    shutdown()
+                    return
+                continue
 
             sprite_path = find_sprite_for(chosen)
             print(f"[DEBUG] sprite selecionado: {sprite_path}")
 
             # criar objetos do jogo com captura de exceção para expor erros silenciosos
             try:
-                player = Player(sprite_path)
-                obstacles = ObstacleManager()
-                camera = CameraController()
+                # rodada determinística: seed próprio + passos fixos (ver game.round)
+                sim = RoundSim(
+                    sprite_path,
+                    max_collisions=max_collisions,
+                    points_per_evade=points_per_evade,
+                )
+                player, obstacles = sim.player, sim.obstacles
+                if camera is not None:
+                    camera.reset()
+                    apply_quality()
             except Exception:
-                print("[ERROR] falha ao criar Player/ObstacleManager/Camera:")
+                print("[ERROR] falha ao criar Player/ObstacleManager:")
                 traceback.print_exc()
                 # se falhar na criação, volta ao menu
                 continue
 
-            print("[DEBUG] Player/ObstacleManager/Camera criados com sucesso")
+            print(
+                f"[DEBUG] Player/ObstacleManager criados com sucesso"
+                f" (seed {sim.seed})"
+            )
+            if hot_reload:
+                hot_reload.attach(obstacles=obstacles, player=player, sim=sim)
 
             # tenta iniciar música de fundo para a rodada
             try:
@@ -456,56 +686,39 @@ def main():
             except Exception:
                 jump_sound = None
 
-            # --- carregar imagem de fundo "estrada" ---
-            road_surf = None
-            try:
-                assets_root = os.path.join(os.path.dirname(__file__), "assets")
-                road_path = None
-                if os.path.isdir(assets_root):
-                    for root, _, files in os.walk(assets_root):
-                        for fname in files:
-                            if "estrada" in fname.lower() and fname.lower().endswith(
-                                (".png", ".jpg", ".jpeg", ".bmp", ".gif")
-                            ):
-                                road_path = os.path.join(root, fname)
-                                break
-                        if road_path:
-                            break
-                # fallback: usar find_first_image_in_folder em locais prováveis
-                if not road_path:
-                    for cand in (
-                        os.path.join(os.path.dirname(__file__), "assets", "sprites"),
-                        os.path.join(os.path.dirname(__file__), "assets", "sprits"),
-                        os.path.join(os.path.dirname(__file__), "assets"),
-                    ):
-                        try:
-                            p = find_first_image_in_folder(cand)
-                            if p and "estrada" in os.path.basename(p).lower():
-                                road_path = p
-                                break
-                        except Exception:
-                            continue
-                if road_path:
-                    # carrega e escala para o tamanho da tela
-                    road_surf = load_image(
-                        road_path, size=(WIDTH, HEIGHT), use_alpha=False
-                    )
-            except Exception:
-                road_surf = None
-            # --- fim carregar estrada ---
+            # estrada rolando com os obstáculos (faixas montadas aqui, fora do loop)
+            road = load_background(*_load_road())
 
             collisions = 0
             score = 0
 
-            # inicializar prev a partir dos contadores do manager (agora sempre presentes)
-            prev_coll_count = getattr(obstacles, "collision_count", 0) or 0
-            prev_evade_count = getattr(obstacles, "evaded_count", 0) or 0
+            # tempo real acumulado ainda não simulado e ações à espera de um passo
+            lag = 0.0
+            pending = []
 
             running = True
+            # rodada abandonada (ninguém na câmera nem no teclado) volta ao menu
+            last_activity = time.monotonic()
+            hud_font = pygame.font.SysFont(None, 26)
+            # textos do HUD refeitos só quando os valores mudam
+            hud_values = None
+            # primeiros quadros ainda pagam a montagem da rodada
+            governor.reset_window(skip=5)
             # criação de player/obstacles/camera e loop da rodada
             try:
                 while running:
-                    dt = clock.tick(FPS) / 1000
+                    dt = clock.tick(target_fps) / 1000
+                    if governor.update(clock.get_rawtime()):
+                        apply_quality()
+
+                    # aplica assets/tuning alterados em disco (entre frames)
+                    if hot_reload:
+                        try:
+                            changed = hot_reload.poll()
+                            if road is not None and road.paths & changed:
+                                road = load_background(*_load_road())
+                        except Exception:
+                            traceback.print_exc()
                     # Eventos (fechar janela ou apertar ESC)
                     for event in pygame.event.get():
                         if event.type == pygame.QUIT:
@@ -517,97 +730,98 @@ def main():
                             running = False
 
                     # Controles por teclado (fallback)
+                    actions = []
                     keys = pygame.key.get_pressed()
                     if keys[pygame.K_LEFT]:
-                        player.switch_lane(-1)
+                        actions.append("LEFT")
                     if keys[pygame.K_RIGHT]:
-                        player.switch_lane(+1)
+                        actions.append("RIGHT")
                     if keys[pygame.K_UP]:
-                        player.jump()
-                        if jump_sound:
-                            try:
-                                jump_sound.play()
-                            except Exception:
-                                pass
+                        actions.append("JUMP")
                     if keys[pygame.K_DOWN]:
-                        player.slide()
+                        actions.append("DUCK")
 
                     # Controles por câmera
-                    action = camera.get_action()
-                    if action == "LEFT":
-                        player.switch_lane(-1)
-                    elif action == "RIGHT":
-                        player.switch_lane(+1)
-                    elif action == "JUMP":
-                        player.jump()
-                        if jump_sound:
-                            try:
-                                jump_sound.play()
-                            except Exception:
-                                pass
-                    elif action == "DUCK":
-                        player.slide()
-
-                    # Atualizações
-                    player.update(dt)
-                    obstacles.update(dt)
-
-                    # checa colisões/evitações via método do manager
-                    try:
-                        res = obstacles.check_collision(player)
-                    except Exception:
-                        res = None
-
-                    # interpretar retorno direto (compatibilidade)
-                    if res == "hit":
-                        # manager já incrementou collision_count; we'll read delta below
-                        pass
-                    elif isinstance(res, int) and res > 0:
-                        # evadidos retornados diretamente; atualizar score
-                        score += points_per_evade * res
-
-                    # ler contadores do ObstacleManager e aplicar deltas
-                    curr_coll = getattr(obstacles, "collision_count", None)
-                    curr_evade = getattr(obstacles, "evaded_count", None)
-
-                    if curr_coll is not None:
-                        delta = curr_coll - prev_coll_count
-                        if delta > 0:
-                            collisions += delta
-                        prev_coll_count = curr_coll
-
-                    if curr_evade is not None:
-                        delta_ev = curr_evade - prev_evade_count
-                        if delta_ev > 0:
-                            score += points_per_evade * delta_ev
-                        prev_evade_count = curr_evade
+                    action = camera.get_action() if camera is not None else None
+                    if action in ("LEFT", "RIGHT", "JUMP", "DUCK"):
+                        actions.append(action)
+
+                    now = time.monotonic()
+                    if actions or camera is None or camera.present:
+                        last_activity = now
+                    elif now - last_activity >= attract_delay:
+                        print("[DEBUG] rodada abandonada, voltando ao menu")
+                        running = False
 
-                    # Renderização e HUD
-                    # desenha fundo estrada se disponível, senão cor sólida
-                    if road_surf:
+                    effects = not governor.at_least("effects")
+                    if "JUMP" in actions and jump_sound and effects:
                         try:
-                            screen.blit(road_surf, (0, 0))
+                            jump_sound.play()
                         except Exception:
-                            screen.fill(BG_COLOR)
+                            pass
+
+                    # Atualizações em passos fixos de 1/FPS; as ações do frame
+                    # entram no primeiro passo (e esperam se nenhum passo couber)
+                    for a in actions:
+                        if a not in pending:
+                            pending.append(a)
+                    lag = min(lag + dt, sim.dt * MAX_CATCHUP_STEPS)
+                    while lag >= sim.dt:
+                        sim.step(pending)
+                        pending = []
+                        lag -= sim.dt
+                        if road is not None:
+                            # o mesmo passo inteiro que os obstáculos andaram
+                            road.advance(int(sim.obstacles.speed * sim.dt))
+                    score, collisions = sim.score, sim.collisions
+
+                    # Renderização e HUD
+                    # desenha fundo estrada se disponível (e com efeitos), senão
+                    # cor sólida; no nível "resolution" do governador o mundo é
+                    # desenhado menor e escalado direto para a janela, com o HUD
+                    # por cima (com texturas o SDL já escala, então o nível não
+                    # muda nada)
+                    background = road if effects else None
+                    obstacle_group = _find_obstacle_group(obstacles) or ()
+                    degraded = governor.at_least("resolution") and not display.textured
+                    if degraded:
+                        if canvas is None:
+                            canvas = ScaledCanvas(screen.get_size(), display.target)
+                        if background:
+                            background.draw(canvas.blit)
+                        else:
+                            canvas.fill(BG_COLOR)
+                        canvas.draw_sprites(obstacle_group)
+                        canvas.draw_sprites((player,))
+                        canvas.present()
                     else:
-                        screen.fill(BG_COLOR)
-                    obstacles.draw(screen)
-                    player.draw(screen)
-
-                    hud_font = pygame.font.SysFont(None, 26)
-                    hud_score = hud_font.render(
-                        f"Pontuação: {score}", True, (255, 255, 255)
-                    )
-                    remaining = max(0, max_collisions - collisions)
-                    hud_lives = hud_font.render(
-                        f"Colisões: {collisions}/{max_collisions} (restam {remaining})",
-                        True,
-                        (255, 200, 60),
-                    )
-                    screen.blit(hud_score, (16, 16))
-                    screen.blit(hud_lives, (16, 46))
-
-                    pygame.display.flip()
+                        if background:
+                            display.begin(color=None)
+                            background.draw(display.draw)
+                        else:
+                            display.begin()
+                        display.draw_sprites(obstacle_group)
+                        display.draw_sprites((player,))
+
+                    if hud_values != (score, collisions):
+                        hud_values = (score, collisions)
+                        hud_score = hud_font.render(
+                            f"Pontuação: {score}", True, (255, 255, 255)
+                        )
+                        remaining = max(0, max_collisions - collisions)
+                        hud_lives = hud_font.render(
+                            f"Colisões: {collisions}/{max_collisions} (restam {remaining})",
+                            True,
+                            (255, 200, 60),
+                        )
+                    if degraded:
+                        canvas.overlay(hud_score, (16, 16))
+                        canvas.overlay(hud_lives, (16, 46))
+                        display.flip()
+                    else:
+                        display.draw(hud_score, (16, 16))
+                        display.draw(hud_lives, (16, 46))
+                        display.present()
 
                     # fim de jogo
                     if collisions >= max_collisions:
@@ -655,7 +869,10 @@ def main():
                             pass
 
                         # exibir popup (som será reproduzido durante o popup)
-                        show_game_over_popup(screen, clock, score)
+                        # com a posição consultada no índice do placar
+                        show_game_over_popup(
+                            screen, clock, score, rank=score_rank(score)
+                        )
 
                         # parar som de game over após o popup
                         try:
@@ -675,10 +892,14 @@ def main():
 
             finally:
                 # Finalização segura da rodada (sempre executa)
+                if hot_reload:
+                    hot_reload.detach()
+                # replay (seed + entradas) para reproduzir a rodada: game.replay
                 try:
-                    camera.close()
+                    if sim.tick:
+                        print(f"[DEBUG] replay salvo em {save_replay(sim, chosen)}")
                 except Exception:
-                    pass
+                    print("[WARN] falha ao salvar replay da rodada")
                 try:
                     player.kill()
                 except Exception:
@@ -705,4 +926,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # executável congelado (PyInstaller) + processos "spawn" da câmera
+    multiprocessing.freeze_support()
     main()
@@ -1,26 +1,31 @@
 import os
-import json
+import time
 import pygame
 from game.assets_loader import (
     find_first_image_in_folder,
     load_image,
     find_wallpaper_in_player_folder,
     find_image_by_name,
+    make_circular_preview,
+    crop_to_cover,
+    load_variant,
 )
+from game.config import get_config
+from game.display import present, to_logical
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "data", "config.json")
 
+# retorno de show_menu quando o menu ficou ocioso sem ninguém na câmera
+ATTRACT = "__attract__"
+
 
 def _load_config():
-    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return get_config().data
 
 
 def _save_selected(name):
-    cfg = _load_config()
-    cfg["selected"] = name
-    with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-        json.dump(cfg, f, indent=4, ensure_ascii=False)
+    # gravação atômica e com debounce feita pelo serviço de config
+    get_config().set("selected", name)
 
 
 def _make_circular_preview_from_surface(img_surf, size, pad=8):
@@ -28,31 +33,7 @@ def _make_circular_preview_from_surface(img_surf, size, pad=8):
     Retorna Surface size x size com img_surf centralizada e recortada em círculo.
     pad: espaço interno para borda
     """
-    if img_surf is None:
-        return None
-    w, h = size
-    target_w = max(1, w - pad * 2)
-    target_h = max(1, h - pad * 2)
-    # escalar preservando proporção para caber no target
-    sw, sh = img_surf.get_size()
-    scale = min(target_w / sw, target_h / sh)
-    nw = max(1, int(sw * scale))
-    nh = max(1, int(sh * scale))
-    try:
-        scaled = pygame.transform.smoothscale(img_surf, (nw, nh))
-    except Exception:
-        scaled = pygame.transform.scale(img_surf, (nw, nh))
-    surf = pygame.Surface((w, h), pygame.SRCALPHA)
-    x = (w - nw) // 2
-    y = (h - nh) // 2
-    surf.blit(scaled, (x, y))
-    # máscara circular
-    mask = pygame.Surface((w, h), pygame.SRCALPHA)
-    radius = min(w, h) // 2
-    pygame.draw.circle(mask, (255, 255, 255, 255), (w // 2, h // 2), radius)
-    # aplica máscara (preserva apenas dentro do círculo)
-    surf.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-    return surf
+    return make_circular_preview(img_surf, size, pad=pad)
 
 
 def _search_image_for_name(name, folder=None):
@@ -100,9 +81,11 @@ def _search_image_for_name(name, folder=None):
     return None
 
 
-def show_menu(screen, clock, font=None):
+def show_menu(screen, clock, font=None, camera=None, attract_delay=None):
     """
     Exibe menu inicial; retorna o nome do personagem escolhido (string) ou None se sair.
+    Com attract_delay (segundos), retorna ATTRACT se ninguém mexer no menu nem
+    aparecer na câmera (camera.check_presence()) por esse tempo.
     """
     cfg = _load_config()
     chars = cfg.get("characters", {})
@@ -127,7 +110,10 @@ def show_menu(screen, clock, font=None):
 
         img_surf_small = None
         img_surf_large = None
-        if img_path:
+        # prévias circulares já prontas (atlas/bake) dispensam decode/escala/máscara
+        p_small = load_variant("preview", img_path, small_sz)
+        p_large = load_variant("preview", img_path, large_sz)
+        if img_path and (p_small is None or p_large is None):
             # tenta carregar imagens (tamanhos internos menores para padding)
             try:
                 img_surf_small = load_image(
@@ -142,16 +128,10 @@ def show_menu(screen, clock, font=None):
             except Exception:
                 img_surf_large = None
 
-        p_small = (
-            _make_circular_preview_from_surface(img_surf_small, small_sz)
-            if img_surf_small
-            else None
-        )
-        p_large = (
-            _make_circular_preview_from_surface(img_surf_large, large_sz)
-            if img_surf_large
-            else None
-        )
+        if p_small is None and img_surf_small:
+            p_small = _make_circular_preview_from_surface(img_surf_small, small_sz)
+        if p_large is None and img_surf_large:
+            p_large = _make_circular_preview_from_surface(img_surf_large, large_sz)
 
         # fallback para placeholder circular com letra
         if p_small is None:
@@ -189,19 +169,11 @@ def show_menu(screen, clock, font=None):
     try:
         wp_path = find_wallpaper_in_player_folder()
         if wp_path:
-            wp_img = load_image(wp_path, size=None, use_alpha=False)
-            if wp_img:
-                w, h = screen.get_size()
-                sw, sh = wp_img.get_size()
-                scale = max(w / sw, h / sh)
-                nw, nh = int(sw * scale), int(sh * scale)
-                wp_scaled = pygame.transform.smoothscale(wp_img, (nw, nh))
-                x = (nw - w) // 2
-                y = (nh - h) // 2
-                try:
-                    wallpaper_surf = wp_scaled.subsurface((x, y, w, h)).copy()
-                except Exception:
-                    wallpaper_surf = pygame.transform.smoothscale(wp_img, (w, h))
+            wallpaper_surf = load_variant("cover", wp_path, screen.get_size())
+            if wallpaper_surf is None:
+                wp_img = load_image(wp_path, size=None, use_alpha=False)
+                if wp_img:
+                    wallpaper_surf = crop_to_cover(wp_img, screen.get_size())
     except Exception:
         wallpaper_surf = None
 
@@ -210,8 +182,16 @@ def show_menu(screen, clock, font=None):
 
     selected = 0
     running = True
+    last_activity = time.monotonic()
     while running:
+        now = time.monotonic()
+        if camera is not None and camera.check_presence():
+            last_activity = now
+        if attract_delay and now - last_activity >= attract_delay:
+            return ATTRACT
         for ev in pygame.event.get():
+            if ev.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                last_activity = now
             if ev.type == pygame.QUIT:
                 return None
             elif ev.type == pygame.KEYDOWN:
@@ -226,7 +206,7 @@ def show_menu(screen, clock, font=None):
                 elif ev.key == pygame.K_ESCAPE:
                     return None
             elif ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
-                mx, my = ev.pos
+                mx, my = to_logical(ev.pos)
                 w = screen.get_width()
                 slot_w = w // len(options)
                 idx = mx // slot_w
@@ -286,5 +266,5 @@ def show_menu(screen, clock, font=None):
         )
         screen.blit(hint, (20, h - 40))
 
-        pygame.display.flip()
+        present()
         clock.tick(30)
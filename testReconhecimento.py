@@ -1,6 +1,42 @@
-import cv2, time, numpy as np
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
 import mediapipe as mp
 
+from game.camera_control import N_LANDMARKS, landmarks_array
+from game.gestures import ACTIONS, GestureClassifier, classify_session, config_options
+
+parser = argparse.ArgumentParser(description="Diagnóstico do controle por pose")
+parser.add_argument(
+    "--record", metavar="ARQUIVO.npz", help="grava os landmarks da sessão"
+)
+parser.add_argument(
+    "--session",
+    metavar="ARQUIVO.npz",
+    help="classifica uma sessão gravada (sem câmera) e sai",
+)
+args = parser.parse_args()
+
+WINDOW_NAME = "Pose Control"
+
+if args.session:
+    # sessão inteira numa chamada: mesmos filtro e regras do modo ao vivo
+    data = np.load(args.session)
+    w, h = (int(v) for v in data["size"])
+    times = data["times"]
+    actions = classify_session(
+        data["landmarks"], w, h, times, hand_cross=True, **config_options()
+    )
+    for t, action in zip(times, actions):
+        if action:
+            print(f"{t - times[0]:8.2f}s  {action}")
+    counts = {a: actions.count(a) for a in ACTIONS if a}
+    print(f"{len(actions)} quadros, ações: {counts}")
+    sys.exit(0)
+
 mp_pose = mp.solutions.pose
 pose = mp_pose.Pose(
     model_complexity=0,
@@ -10,62 +46,10 @@ pose = mp_pose.Pose(
 )
 
 cap = cv2.VideoCapture(0)
-W_SMOOTH = 5
-left_right_hist = []
-last_action_time = 0
-DEBOUNCE = 0.35  # segundos
-WINDOW_NAME = "Pose Control"
-
-
-def decide_action(lm, img_w, img_h):
-    # Pega pontos principais (normalizados)
-    def P(i):
-        return np.array([lm[i].x * img_w, lm[i].y * img_h])
-
-    nose = P(mp_pose.PoseLandmark.NOSE.value)
-    lw = P(mp_pose.PoseLandmark.LEFT_WRIST.value)
-    rw = P(mp_pose.PoseLandmark.RIGHT_WRIST.value)
-    ls = P(mp_pose.PoseLandmark.LEFT_SHOULDER.value)
-    rs = P(mp_pose.PoseLandmark.RIGHT_SHOULDER.value)
-    lh = P(mp_pose.PoseLandmark.LEFT_HIP.value)
-    rh = P(mp_pose.PoseLandmark.RIGHT_HIP.value)
-
-    mid_shoulder_x = (ls[0] + rs[0]) / 2
-    mid_hip_y = (lh[1] + rh[1]) / 2
-    head_y = nose[1]
-
-    # Heurísticas simples
-    jump = (lw[1] < head_y) and (rw[1] < head_y)
-    duck = (mid_hip_y - head_y) < img_h * 0.22
-
-    # Esquerda/Direita por inclinação
-    center_x = img_w / 2
-    tilt = (mid_shoulder_x - center_x) / (img_w * 0.5)  # ~ -1 a 1
-    left_right_hist.append(tilt)
-    if len(left_right_hist) > W_SMOOTH:
-        left_right_hist.pop(0)
-    tilt_avg = np.mean(left_right_hist)
-
-    left = tilt_avg < -0.25
-    right = tilt_avg > 0.25
-
-    # Gesto com mão direita cruzando a linha média
-    mid_body_x = (lh[0] + rh[0]) / 2
-    if rw[0] < mid_body_x - img_w * 0.05:
-        left = True
-    if rw[0] > mid_body_x + img_w * 0.15:
-        right = True
-
-    # Priorização
-    if jump:
-        return "JUMP"
-    if duck:
-        return "DUCK"
-    if left:
-        return "LEFT"
-    if right:
-        return "RIGHT"
-    return None
+# filtro e regras do jogo + pulso cruzando o corpo
+classifier = GestureClassifier(hand_cross=True, **config_options())
+recorded = []  # (instante, landmarks (33, 4) ou NaN)
+frame_size = None
 
 
 def safe_release():
@@ -99,14 +83,19 @@ try:
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         res = pose.process(rgb)
 
-        action = None
-        if res.pose_landmarks:
-            action = decide_action(res.pose_landmarks.landmark, w, h)
-
         now = time.time()
-        if action and (now - last_action_time) > DEBOUNCE:
-            print(action)
-            last_action_time = now
+        action = fired = None
+        lm = landmarks_array(res)
+        if lm is not None:
+            fired = classifier.decide(lm, w, h, now)
+            action = classifier.current
+        if args.record:
+            frame_size = (w, h)
+            if lm is None:
+                lm = np.full((N_LANDMARKS, 4), np.nan, np.float32)
+            recorded.append((now, lm))
+        if fired:
+            print(fired)
 
         # Desenho opcional dos landmarks
         mp.solutions.drawing_utils.draw_landmarks(
@@ -143,3 +132,11 @@ except KeyboardInterrupt:
     pass
 finally:
     safe_release()
+    if args.record and recorded:
+        np.savez_compressed(
+            args.record,
+            times=np.array([t for t, _ in recorded]),
+            landmarks=np.stack([lm for _, lm in recorded]),
+            size=np.array(frame_size),
+        )
+        print(f"{len(recorded)} quadros gravados em {args.record}")